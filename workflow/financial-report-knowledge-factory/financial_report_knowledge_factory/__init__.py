@@ -1,22 +1,25 @@
+import asyncio
 import glob
-import json
+import hashlib
 import logging
 import os
-import uuid
+import time
 from abc import ABC
-from concurrent.futures import Executor, ThreadPoolExecutor
-from typing import Dict, List, Optional, Tuple
+from collections import deque
+from concurrent.futures import Executor
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 
 import pandas as pd
 from dbgpt._private.config import Config
 from dbgpt._private.pydantic import BaseModel, Field
-from dbgpt.core import Chunk, Document
+from dbgpt.core import Chunk
 from dbgpt.core.awel import (
     DAG,
     BaseOperator,
     BranchFunc,
     BranchOperator,
     BranchTaskType,
+    DAGVar,
     JoinOperator,
     MapOperator,
 )
@@ -32,10 +35,37 @@ from dbgpt.rag.knowledge.base import Knowledge, KnowledgeType
 from dbgpt.storage.vector_store.base import VectorStoreConfig
 from dbgpt.util.executor_utils import blocking_func_to_async
 from pandas import DataFrame
-from tqdm import tqdm
 
-from .extract import FinTableExtractor, FinTableProcessor
-from .fin_knowledge import FinReportKnowledge
+from .cache import ExtractionCache
+from .embedding_cache import CachedEmbeddings, EmbeddingCache
+from .embedding_pipeline import (
+    DEFAULT_BATCH_SIZE,
+    DEFAULT_MAX_PENDING_BATCHES,
+    PrecomputedEmbeddings,
+    load_chunks,
+)
+from .executors import (
+    EXECUTOR_CPU,
+    EXECUTOR_INFERENCE,
+    EXECUTOR_IO,
+    executor_stats,
+    get_executor,
+)
+from .extract import (
+    FIN_DATA_ITEMS,
+    FinTableExtractor,
+    FinTableProcessor,
+    extract_table_columns,
+)
+from .fact import save_facts
+from .fin_knowledge import FinReportKnowledge, parse_report_rows
+from .full_text import full_text_db_path, save_full_text
+from .indicator import save_indicators
+from .numeric import COUNT_COLUMNS, normalize_numeric_columns
+from .report_db import DEFAULT_CHUNK_SIZE, save_reports
+from .row_file import ROW_FILE_SUFFIX, write_row_file
+from .table_store import create_table_store
+from .workspace import Workspace
 
 logger = logging.getLogger(__name__)
 
@@ -43,6 +73,7 @@ logger = logging.getLogger(__name__)
 class RAGMixin(BaseOperator, ABC):
     _EMBEDDINGS_CACHE_KEY = "__embeddings__"
     _VECTOR_STORE_CACHE_KEY = "__vector_store__"
+    _embedding_cache: Optional[EmbeddingCache] = None
 
     async def get_embeddings(
         self,
@@ -62,12 +93,18 @@ class RAGMixin(BaseOperator, ABC):
             embeddings = embedding_factory.create(
                 model_name=EMBEDDING_MODEL_CONFIG[cfg.EMBEDDING_MODEL]
             )
+            model = cfg.EMBEDDING_MODEL
         else:
             from dbgpt.rag.embedding import DefaultEmbeddingFactory
 
             embeddings = DefaultEmbeddingFactory.default(
                 embedding_model, device=get_device()
             )
+            model = embedding_model
+        if self._embedding_cache and model:
+            embeddings = CachedEmbeddings(embeddings, self._embedding_cache, model)
+        # the vector stores get the vectors computed ahead by the embedding pipeline
+        embeddings = PrecomputedEmbeddings(embeddings)
         await self.current_dag_context.save_to_share_data(
             RAGMixin._EMBEDDINGS_CACHE_KEY, embeddings
         )
@@ -140,6 +177,17 @@ class RAGMixin(BaseOperator, ABC):
             logger.info("No chunks found in DBSchemaAssembler")
 
 
+def _operator_executor(executor: Optional[Executor]) -> Executor:
+    """Return the executor given to an operator, default the shared io executor.
+
+    The operator metaclass passes the default executor of the DAGs when none is
+    given, it is replaced by the shared one too.
+    """
+    if executor is None or executor is DAGVar.get_executor():
+        return get_executor(EXECUTOR_IO)
+    return executor
+
+
 class KnowledgeLoaderOperator(MapOperator[Dict, Dict]):
     """Knowledge Factory Operator."""
 
@@ -148,26 +196,83 @@ class KnowledgeLoaderOperator(MapOperator[Dict, Dict]):
         datasource: Optional[str] = None,
         knowledge_type: Optional[str] = KnowledgeType.DOCUMENT.name,
         executor: Optional[Executor] = None,
+        parallel: Optional[bool] = None,
+        max_workers: Optional[int] = None,
+        max_in_flight_pages: Optional[int] = None,
+        cache: Optional[ExtractionCache] = None,
+        min_table_edges: Optional[int] = None,
         **kwargs,
     ):
         """Init the query rewrite operator.
 
         Args:
             knowledge_type: (Optional[KnowledgeType]) The knowledge type.
+            executor: (Optional[Executor]) The executor of the blocking tasks,
+                default the shared io executor.
+            parallel: (Optional[bool]) Extract pdf pages in the shared cpu
+                process pool.
+            max_workers: (Optional[int]) The number of workers the pages are
+                split for, default the cpu pool size.
+            max_in_flight_pages: (Optional[int]) Max pages extracted ahead of the
+                merge in parallel mode.
+            cache: (Optional[ExtractionCache]) The extraction cache, a pdf parsed
+                before is loaded from it.
+            min_table_edges: (Optional[int]) Min horizontal and vertical edges of
+                a page to run the table detection on it, 0 to always run it.
         """
         super().__init__(**kwargs)
         self._datasource = datasource
         self._knowledge_type = knowledge_type
-        self._executor = executor or ThreadPoolExecutor()
+        self._executor = _operator_executor(executor)
+        if parallel is None:
+            parallel = os.getenv("FIN_REPORT_PARALLEL_PAGES", "false").lower() == "true"
+        self._parallel = parallel
+        self._max_workers = max_workers
+        self._max_in_flight_pages = max_in_flight_pages or int(
+            os.getenv("FIN_REPORT_MAX_IN_FLIGHT_PAGES", 0)
+        )
+        self._cache = cache
+        if min_table_edges is None:
+            min_table_edges = int(os.getenv("FIN_REPORT_MIN_TABLE_EDGES", 2))
+        self._min_table_edges = min_table_edges
 
     async def map(self, knowledge_request: Dict) -> Dict:
         """Create knowledge from datasource."""
         datasource = self._datasource or knowledge_request.get("datasource")
-        knowledge = FinReportKnowledge(file_path=datasource)
-        await blocking_func_to_async(self._executor, knowledge.load)
+        knowledge = self.create_knowledge(datasource)
+        # the downstream stages read the rows of all_text, not the row Documents
+        await blocking_func_to_async(self._executor, knowledge.parse)
         knowledge_request["knowledge"] = knowledge
         return knowledge_request
 
+    def create_knowledge(self, datasource: str) -> FinReportKnowledge:
+        """Create the knowledge of a pdf, not loaded yet."""
+        return FinReportKnowledge(
+            file_path=datasource,
+            parallel=self._parallel,
+            max_workers=self._max_workers or get_executor(EXECUTOR_CPU).max_workers,
+            max_in_flight_pages=self._max_in_flight_pages,
+            executor=get_executor(EXECUTOR_CPU) if self._parallel else None,
+            cache=self._cache,
+            min_table_edges=self._min_table_edges,
+        )
+
+    async def load_in_process(
+        self, datasource: str, process_executor: Executor
+    ) -> FinReportKnowledge:
+        """Load the knowledge of a pdf, parsed by ``process_executor`` unless cached.
+
+        The whole pdf is parsed by a single worker process, so several pdfs are
+        parsed at the same time.
+        """
+        knowledge = self.create_knowledge(datasource)
+        if not await blocking_func_to_async(self._executor, knowledge.load_cached_rows):
+            rows = await asyncio.get_running_loop().run_in_executor(
+                process_executor, parse_report_rows, datasource, self._min_table_edges
+            )
+            await blocking_func_to_async(self._executor, knowledge.load_rows, rows)
+        return knowledge
+
 
 class FinTextExtractOperator(MapOperator[Dict, Dict]):
     """Financial Text Extract Operator."""
@@ -183,28 +288,17 @@ class FinTextExtractOperator(MapOperator[Dict, Dict]):
 
     async def map(self, knowledge_request: Dict) -> Dict:
         knowledge = knowledge_request.get("knowledge")
-        merged_data = {}
+        # the pages are split as the vector storage embeds them
+        knowledge_request["page_chunks"] = self.iter_page_chunks(knowledge)
+        return knowledge_request
+
+    def iter_page_chunks(self, knowledge: Knowledge) -> Iterator[List[Chunk]]:
+        """Split the knowledge page by page, yield the chunks of each page."""
         chunk_manager = ChunkManager(
             knowledge=knowledge, chunk_parameter=self._chunk_parameters
         )
-        file_title = knowledge.file_path.rsplit("/", 1)[-1].replace(".pdf", "")
-        for i, item in list(knowledge.all_text.items()):
-            page = item.get("page")
-            inside = item.get("inside")
-            if page in merged_data:
-                merged_data[page] += " " + inside
-            else:
-                merged_data[page] = inside
-        page_documents = []
-        for item in list(merged_data.items()):
-            page_documents.append(
-                Document(
-                    content=item[1], metadata={"page": item[0], "title": file_title}
-                )
-            )
-        chunks: List[Chunk] = chunk_manager.split(page_documents)
-        knowledge_request["chunks"] = chunks
-        return knowledge_request
+        for page_document in knowledge.iter_page_documents():
+            yield chunk_manager.split([page_document])
 
 
 class FinTableExtractorOperator(MapOperator[str, DataFrame]):
@@ -215,453 +309,242 @@ class FinTableExtractorOperator(MapOperator[str, DataFrame]):
         task_name="extract_table_task",
         tmp_dir_path: Optional[str] = None,
         executor: Optional[Executor] = None,
+        cache: Optional[ExtractionCache] = None,
+        parallel_tables: Optional[bool] = None,
+        table_store: Optional[str] = None,
+        excel_output: Optional[bool] = None,
+        workspace_retention: Optional[int] = None,
         **kwargs,
     ):
+        """Init the table extract operator.
+
+        Args:
+            tmp_dir_path: (Optional[str]) The output directory.
+            executor: (Optional[Executor]) The executor of the blocking tasks,
+                default the shared io executor.
+            cache: (Optional[ExtractionCache]) The extraction cache, the table
+                rows of a pdf extracted before are loaded from it.
+            parallel_tables: (Optional[bool]) Run the base, financial and other
+                column extractors concurrently in the shared cpu process pool,
+                instead of one after another in the io executor.
+            table_store: (Optional[str]) The output backend of the report tables,
+                ``sqlite`` to store the tables of an ingest in a single SQLite
+                database, ``excel`` to write an excel file per table.
+            excel_output: (Optional[bool]) Also write the extracted base, financial
+                and other columns, and their merge, to excel files in the
+                background.
+            workspace_retention: (Optional[int]) Seconds to keep the workspace of a
+                request for debugging, 0 to remove it at the end of the request, a
+                negative number to keep it. Default FIN_REPORT_WORKSPACE_RETENTION
+                or 0.
+        """
         self._tmp_dir_path = tmp_dir_path or "./tmp"
-        self._tmp_excel_path = tmp_dir_path
-        self._executor = executor or ThreadPoolExecutor()
+        self._cache = cache
+        if parallel_tables is None:
+            parallel_tables = (
+                os.getenv("FIN_REPORT_PARALLEL_TABLES", "false").lower() == "true"
+            )
+        self._parallel_tables = parallel_tables
+        self._table_store = table_store or os.getenv("FIN_REPORT_TABLE_STORE", "sqlite")
+        if excel_output is None:
+            excel_output = (
+                os.getenv("FIN_REPORT_EXCEL_OUTPUT", "false").lower() == "true"
+            )
+        self._excel_output = excel_output
+        if workspace_retention is None:
+            workspace_retention = int(os.getenv("FIN_REPORT_WORKSPACE_RETENTION", 0))
+        self._workspace_retention = workspace_retention
         super().__init__(task_name=task_name, **kwargs)
+        self._executor = _operator_executor(executor)
+        # The excel files being written in the background.
+        self._excel_writes: Set[asyncio.Future] = set()
+
+    async def wait_excel_writes(self):
+        """Wait for the excel files being written in the background."""
+        if self._excel_writes:
+            logger.info(f"wait for {len(self._excel_writes)} excel file writes")
+            await asyncio.gather(*self._excel_writes)
 
     async def map(self, knowledge_request: Dict) -> Dict:
         """Extract knowledge from text."""
-        # read txt file
+        space = knowledge_request.get("space")
+        # the files of the request live in its own workspace, the operator keeps
+        # no request state so the ingests can run concurrently
+        with Workspace(
+            self._tmp_dir_path, space, self._workspace_retention
+        ) as workspace:
+            return await self._extract(knowledge_request, workspace)
+
+    async def _extract(self, knowledge_request: Dict, workspace: Workspace) -> Dict:
         space = knowledge_request.get("space")
         fin_knowledge = knowledge_request.get("knowledge")
-        self._tmp_dir_path = self._tmp_dir_path + f"/{space}/{uuid.uuid4()}"
-        self._tmp_excel_path = os.path.expanduser(self._tmp_dir_path + "/output/excel/")
-        print("tmp_dir_path: " + self._tmp_dir_path)
-        print("tmp_excel_path: " + self._tmp_excel_path)
-        # read txt file
-        _tmp_txt_path = os.path.join(
-            self._tmp_dir_path + "/txt",
-            os.path.basename(fin_knowledge.file_path).replace(".pdf", ".txt"),
+        # the tables and excel files of the reports are kept in the space
+        output_path = os.path.expanduser(
+            os.path.join(self._tmp_dir_path, space, "output")
+        )
+        # save the rows file
+        rows_path = os.path.join(
+            workspace.rows_path,
+            os.path.basename(fin_knowledge.file_path).replace(".pdf", ROW_FILE_SUFFIX),
         )
         await blocking_func_to_async(
             self._executor,
             self._save_all_text,
             fin_knowledge.all_text,
-            _tmp_txt_path,
+            rows_path,
         )
-        # self._save_all_text(
-        # all_text=fin_knowledge.all_text, tmp_txt_path=_tmp_txt_path
-        # )
-        file_names = glob.glob(self._tmp_dir_path + "/txt/*")
-        file_names = sorted(file_names, reverse=True)
-        print("now process files: " + str(file_names))
-        # process base col
-        results = []
-        df1 = pd.DataFrame(
-            columns=[
-                "文件名",
-                "日期",
-                "公司名称",
-                "股票代码",
-                "股票简称",
-                "年份",
-                "类型",
-                "代码",
-                "简称",
-                "电子信箱",
-                "注册地址",
-                "办公地址",
-                "中文名称",
-                "中文简称",
-                "外文名称",
-                "外文名称缩写",
-                "公司网址",
-                "法定代表人",
-                "职工总数",
-                "生产人员",
-                "销售人员",
-                "技术人员",
-                "财务人员",
-                "行政人员",
-                "本科及以上人员",
-                "本科人员",
-                "硕士及以上人员",
-                "硕士人员",
-                "博士及以上人员",
-                "博士人员",
-                "研发人数",
-                "全文",
-            ]
-        )
-        for file_name in file_names:
-            txt_extractor = FinTableExtractor(file_name)
-            results.append(
-                await blocking_func_to_async(
-                    self._executor,
-                    txt_extractor.extract_base_col,
-                )
+        table_rows = [
+            await self._extract_table_rows(
+                rows_path, fin_knowledge.cache_key, fin_knowledge.all_text
             )
-        df1 = pd.DataFrame(results)
-        # excel_directory = os.path.dirname(self._tmp_excel_path)
-        if not os.path.exists(self._tmp_excel_path):
-            os.makedirs(self._tmp_excel_path)
-        df1.to_excel(self._tmp_excel_path + "table_data_base_info.xlsx", index=False)
-        results = []
-        list1 = [
-            "文件名",
-            "日期",
-            "公司名称",
-            "股票代码",
-            "股票简称",
-            "年份",
-            "类型",
-            "合并资产负债表",
-            "合并利润表",
-            "合并利润表",
-            "全文",
         ]
-        list2 = [
-            "货币资金",
-            "结算备付金",
-            "拆出资金",
-            "交易性金融资产",
-            "以公允价值计量且其变动计入当期损益的金融资产",
-            "衍生金融资产",
-            "应收票据",
-            "应收账款",
-            "应收款项融资",
-            "预付款项",
-            "应收保费",
-            "应收分保账款",
-            "应收分保合同准备金",
-            "其他应收款",
-            "应收利息",
-            "应收股利",
-            "买入返售金融资产",
-            "存货",
-            "合同资产",
-            "持有待售资产",
-            "一年内到期的非流动资产",
-            "其他流动资产",
-            "流动资产合计",
-            "发放贷款和垫款",
-            "债权投资",
-            "可供出售金融资产",
-            "其他债权投资",
-            "持有至到期投资",
-            "长期应收款",
-            "长期股权投资",
-            "其他权益工具投资",
-            "其他非流动金融资产",
-            "投资性房地产",
-            "固定资产",
-            "在建工程",
-            "生产性生物资产",
-            "油气资产",
-            "使用权资产",
-            "无形资产",
-            "开发支出",
-            "商誉",
-            "长期待摊费用",
-            "递延所得税资产",
-            "其他非流动资产",
-            "非流动资产合计",
-            "资产总计",
-            "短期借款",
-            "向中央银行借款",
-            "拆入资金",
-            "交易性金融负债",
-            "以公允价值计量且其变动计入当期损益的金融负债",
-            "衍生金融负债",
-            "应付票据",
-            "应付账款",
-            "预收款项",
-            "合同负债",
-            "卖出回购金融资产款",
-            "吸收存款及同业存放",
-            "代理买卖证券款",
-            "代理承销证券款",
-            "应付职工薪酬",
-            "应交税费",
-            "其他应付款",
-            "应付利息",
-            "应付股利",
-            "应付手续费及佣金",
-            "应付分保账款",
-            "持有待售负债",
-            "一年内到期的非流动负债",
-            "其他流动负债",
-            "流动负债合计",
-            "保险合同准备金",
-            "长期借款",
-            "应付债券",
-            "租赁负债",
-            "长期应付款",
-            "长期应付职工薪酬",
-            "预计负债",
-            "递延收益",
-            "递延所得税负债",
-            "其他非流动负债",
-            "非流动负债合计",
-            "负债合计",
-            "股本",
-            "实收资本",
-            "其他权益工具",
-            "资本公积",
-            "库存股",
-            "其他综合收益",
-            "专项储备",
-            "盈余公积",
-            "一般风险准备",
-            "未分配利润",
-            "归属于母公司所有者权益合计",
-            "少数股东权益",
-            "所有者权益合计",
-            "负债和所有者权益总计",
-            "营业总收入",
-            "营业收入",
-            "利息收入",
-            "已赚保费",
-            "手续费及佣金收入",
-            "营业总成本",
-            "营业成本",
-            "利息支出",
-            "手续费及佣金支出",
-            "退保金",
-            "赔付支出净额",
-            "提取保险责任合同准备金净额",
-            "保单红利支出",
-            "分保费用",
-            "税金及附加",
-            "销售费用",
-            "管理费用",
-            "研发费用",
-            "财务费用",
-            "利息费用",
-            "其他收益",
-            "投资收益",
-            "其中：对联营企业和合营企业的投资收益",
-            "以摊余成本计量的金融资产终止确认收益",
-            "汇兑收益",
-            "净敞口套期收益",
-            "公允价值变动收益",
-            "信用减值损失",
-            "资产减值损失",
-            "资产处置收益",
-            "营业利润",
-            "营业外收入",
-            "营业外支出",
-            "利润总额",
-            "所得税费用",
-            "净利润",
-            "按经营持续性分类",
-            "持续经营净利润",
-            "终止经营净利润",
-            "按所有权归属分类",
-            "归属于母公司所有者的净利润",
-            "少数股东损益",
-            "其他综合收益的税后净额",
-            "归属母公司所有者的其他综合收益的税后净额",
-            "不能重分类进损益的其他综合收益",
-            "重新计量设定受益计划变动额",
-            "权益法下不能转损益的其他综合收益",
-            "其他权益工具投资公允价值变动",
-            "企业自身信用风险公允价值变动",
-            "其他",
-            "将重分类进损益的其他综合收益",
-            "权益法下可转损益的其他综合收益",
-            "其他债权投资公允价值变动",
-            "可供出售金融资产公允价值变动损益",
-            "金融资产重分类计入其他综合收益的金额",
-            "持有至到期投资重分类为可供出售金融资产损益",
-            "其他债权投资信用减值准备",
-            "现金流量套期储备",
-            "外币财务报表折算差额",
-            "其他",
-            "归属于少数股东的其他综合收益的税后净额",
-            "综合收益总额",
-            "归属于母公司所有者的综合收益总额",
-            "归属于少数股东的综合收益总额",
-            "基本每股收益",
-            "稀释每股收益",
-            "销售商品、提供劳务收到的现金",
-            "客户存款和同业存放款项净增加额",
-            "向中央银行借款净增加额",
-            "向其他金融机构拆入资金净增加额",
-            "收到原保险合同保费取得的现金",
-            "收到再保业务现金净额",
-            "保户储金及投资款净增加额",
-            "收取利息、手续费及佣金的现金",
-            "拆入资金净增加额",
-            "回购业务资金净增加额",
-            "代理买卖证券收到的现金净额",
-            "收到的税费返还",
-            "收到其他与经营活动有关的现金",
-            "经营活动现金流入小计",
-            "购买商品、接受劳务支付的现金",
-            "客户贷款及垫款净增加额",
-            "存放中央银行和同业款项净增加额",
-            "支付原保险合同赔付款项的现金",
-            "拆出资金净增加额",
-            "支付利息、手续费及佣金的现金",
-            "支付保单红利的现金",
-            "支付给职工以及为职工支付的现金",
-            "支付的各项税费",
-            "支付其他与经营活动有关的现金",
-            "经营活动现金流出小计",
-            "经营活动产生的现金流量净额",
-            "收回投资收到的现金",
-            "取得投资收益收到的现金",
-            "处置固定资产、无形资产和其他长期资产收回的现金净额",
-            "处置子公司及其他营业单位收到的现金净额",
-            "收到其他与投资活动有关的现金",
-            "投资活动现金流入小计",
-            "购建固定资产、无形资产和其他长期资产支付的现金",
-            "投资支付的现金",
-            "质押贷款净增加额",
-            "取得子公司及其他营业单位支付的现金净额",
-            "支付其他与投资活动有关的现金",
-            "投资活动现金流出小计",
-            "投资活动产生的现金流量净额",
-            "吸收投资收到的现金",
-            "子公司吸收少数股东投资收到的现金",
-            "取得借款收到的现金",
-            "收到其他与筹资活动有关的现金",
-            "筹资活动现金流入小计",
-            "偿还债务支付的现金",
-            "分配股利、利润或偿付利息支付的现金",
-            "子公司支付给少数股东的股利、利润",
-            "支付其他与筹资活动有关的现金",
-            "筹资活动现金流出小计",
-            "筹资活动产生的现金流量净额",
-            "汇率变动对现金及现金等价物的影响",
-            "现金及现金等价物净增加额",
-            "期初现金及现金等价物余额",
-            "期末现金及现金等价物余额",
+        # the full text of the report is indexed apart from its table data
+        knowledge_request["full_text"] = [
+            {
+                "文件名": table_rows[-1]["base_col"]["文件名"],
+                "标题": document.metadata["title"],
+                "页码": document.metadata["page"],
+                "全文": document.content,
+            }
+            for document in fin_knowledge.iter_page_documents()
         ]
-        all_list = list1 + list2
-        df2 = pd.DataFrame(columns=all_list)
-        for file_name in file_names:
-            txt_extracter = FinTableExtractor(file_name)
-            # results.append(txt_extracter.extract_fin_data())
-            results.append(
-                await blocking_func_to_async(
-                    self._executor,
-                    txt_extracter.extract_fin_data,
-                )
-            )
-        df2 = pd.DataFrame(results)
-        df2.to_excel(self._tmp_excel_path + "/table_data_fin_info.xlsx", index=False)
-        # process other col
-        results = []
-        df3 = pd.DataFrame(
-            columns=[
-                "文件名",
-                "日期",
-                "公司名称",
-                "股票代码",
-                "股票简称",
-                "年份",
-                "类型",
-                "审计意见",
-                "关键审计事项",
-                "主要会计数据和财务指标",
-                "主要销售客户",
-                "主要供应商",
-                "研发投入",
-                "现金流",
-                "资产及负债状况",
-                "重大资产和股权出售",
-                "主要控股参股公司分析",
-                "公司未来发展的展望",
-                "合并报表范围发生变化的情况说明",
-                "聘任、解聘会计师事务所情况",
-                "面临退市情况",
-                "破产重整相关事项",
-                "重大诉讼、仲裁事项",
-                "处罚及整改情况",
-                "公司及其控股股东、实际控制人的诚信状况",
-                "重大关联交易",
-                "重大合同及其履行情况",
-                "重大环保问题",
-                "社会责任情况",
-                "公司董事、监事、高级管理人员变动情况",
-                "公司员工情况",
-                "非标准审计报告的说明",
-                "公司控股股东情况",
-                "审计报告",
-                "全文",
-            ]
-        )
-        for file_name in file_names:
-            txt_extracter = FinTableExtractor(file_name)
-            # results.append(txt_extracter.extract_other_col())
-            results.append(
-                await blocking_func_to_async(
-                    self._executor,
-                    txt_extracter.extract_other_col,
-                )
-            )
-        df3 = pd.DataFrame(results)
-        df3.to_excel(self._tmp_excel_path + "/table_data_other_info.xlsx", index=False)
+        df1 = pd.DataFrame([rows["base_col"] for rows in table_rows])
+        df2 = pd.DataFrame([rows["fin_data"] for rows in table_rows])
+        df3 = pd.DataFrame([rows["other_col"] for rows in table_rows])
         # check if the three files have the same "文件名" column
         if (
             "文件名" not in df1.columns
             or "文件名" not in df2.columns
             or "文件名" not in df3.columns
         ):
-            raise ValueError("One of the Excel files does not have the '文件名' column.")
+            raise ValueError("One of the table data does not have the '文件名' column.")
         # merge to DataFrame
         df = df1.merge(df2, on="文件名", how="inner").merge(df3, on="文件名", how="inner")
-        # to excel
-        df.to_excel(
-            self._tmp_excel_path + "/big_data_old.xlsx", engine="openpyxl", index=False
-        )
-        df.to_excel(
-            self._tmp_excel_path + "/table_data_final.xlsx",
-            engine="openpyxl",
-            index=False,
-        )
-        # set txt path
-        txt_folder = self._tmp_dir_path + "/txt"
-        # txt_folder = _tmp_txt_path
-        # get all the txt name
-        txt_files = [file for file in os.listdir(txt_folder) if file.endswith(".txt")]
+        if self._excel_output:
+            # write the excel files in the background, off the request path
+            loop = asyncio.get_running_loop()
+            excel_write = loop.run_in_executor(
+                self._executor,
+                self._write_excel_files,
+                os.path.join(output_path, "excel", _report_name(rows_path)),
+                {
+                    "table_data_base_info.xlsx": df1,
+                    "table_data_fin_info.xlsx": df2,
+                    "table_data_other_info.xlsx": df3,
+                    "table_data_final.xlsx": df,
+                },
+            )
+            self._excel_writes.add(excel_write)
+            excel_write.add_done_callback(self._excel_writes.discard)
         # process txt
-        final_report_df = await blocking_func_to_async(
+        await blocking_func_to_async(
             self._executor,
             self._process_financial_txt,
-            txt_files,
-            txt_folder,
+            rows_path,
+            output_path,
+            workspace.output_path,
         )
 
-        knowledge_request["dataframe"] = final_report_df
+        knowledge_request["dataframe"] = df
         return knowledge_request
 
-    def _process_financial_txt(self, txt_files, txt_folder):
-        final_report_df = None
-        for txt_file in tqdm(txt_files, desc="Processing financial report"):
-            # txt path
-            txt_path = os.path.join(txt_folder, txt_file)
-            # create txt dir
-            folder_name = txt_file.split(".")[0]
-            output_folder = os.path.join(self._tmp_excel_path, folder_name)
-            os.makedirs(output_folder, exist_ok=True)
-            print(txt_path)
+    async def _extract_table_rows(
+        self, file_name: str, cache_key: Optional[str] = None, all_text=None
+    ) -> Dict[str, Dict]:
+        """Extract the base, financial and other columns of a report.
+
+        The rows are parsed once for the three extractors. In a process pool each
+        worker maps the rows file, otherwise the extractors share the rows of
+        ``all_text`` and run one after another.
+
+        The columns 文件名, 公司名称, 股票代码, 年份... come from the report name, so
+        the cached rows are keyed by the name too, a pdf ingested under another
+        name only reuses its parsed rows.
+        """
+        namespace = _table_rows_namespace(file_name)
+        if self._cache and cache_key:
+            table_rows = self._cache.get(cache_key, namespace)
+            if table_rows is not None:
+                logger.info(f"{file_name} hit table extraction cache {cache_key}")
+                return table_rows
+        methods = (
+            ("base_col", "extract_base_col"),
+            ("fin_data", "extract_fin_data"),
+            ("other_col", "extract_other_col"),
+        )
+        if self._parallel_tables:
+            loop = asyncio.get_running_loop()
+            results = await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        get_executor(EXECUTOR_CPU),
+                        extract_table_columns,
+                        file_name,
+                        method,
+                    )
+                    for _, method in methods
+                )
+            )
+            table_rows = {name: result for (name, _), result in zip(methods, results)}
+        else:
+            # the extractors only read the rows, they share the views of all_text
+            rows = all_text.rows() if all_text is not None else None
+            txt_extractor = FinTableExtractor(file_name, rows=rows)
+            table_rows = {}
+            for name, method in methods:
+                table_rows[name] = await blocking_func_to_async(
+                    self._executor, getattr(txt_extractor, method)
+                )
+        if self._cache and cache_key:
+            self._cache.put(cache_key, namespace, table_rows)
+        return table_rows
+
+    def _process_financial_txt(
+        self, rows_path: str, output_path: str, titles_path: str
+    ):
+        # the tables of the reports of a space go to a single store
+        table_store = create_table_store(
+            self._table_store,
+            os.path.join(output_path, "fin_report_tables.db"),
+            os.path.join(output_path, "excel"),
+        )
+        report = _report_name(rows_path)
+        with table_store:
             # create TableExtractor process txt file
-            processor = FinTableProcessor(txt_path)
+            processor = FinTableProcessor(rows_path)
             processor.read_file()
             processor.process_text_data()
             processor.process_excel_data()
             processor.process_tables()
-            processor.create_excel_files(output_folder)
-            final_report_df = pd.read_excel(
-                self._tmp_excel_path + "/table_data_final.xlsx"
-            )
-            print(f"{txt_path} table -> dataframe process finished!")
-        return final_report_df
+            processor.save_tables(table_store, report)
+            processor.save_titles(os.path.join(titles_path, report))
+        logger.info(f"{rows_path} table -> dataframe process finished!")
+
+    def _write_excel_files(self, excel_path: str, dataframes: Dict[str, DataFrame]):
+        try:
+            os.makedirs(excel_path, exist_ok=True)
+            for file_name, dataframe in dataframes.items():
+                dataframe.to_excel(
+                    os.path.join(excel_path, file_name), engine="openpyxl", index=False
+                )
+            logger.info(f"save the table data excel files to {excel_path}")
+        except Exception as e:
+            logger.error(f"save the table data excel files failed: {e}")
+
+    def _save_all_text(self, all_text, tmp_rows_path):
+        write_row_file(tmp_rows_path, all_text.values())
+        logger.info(f"save all text to rows file {tmp_rows_path} finished.")
+
+
+def _report_name(rows_path: str) -> str:
+    """Return the report name of a rows file, the pdf name without extension."""
+    return os.path.basename(rows_path).split(".")[0]
+
 
-    def _save_all_text(self, all_text, tmp_txt_path):
-        directory = os.path.dirname(tmp_txt_path)
-        if not os.path.exists(directory):
-            os.makedirs(directory)
-        for key in all_text.keys():
-            with open(tmp_txt_path, "a+", encoding="utf-8") as file:
-                file.write(json.dumps(all_text[key], ensure_ascii=False) + "\n")
-        logger.info(f"save all text to txt {directory} file finished.")
+def _table_rows_namespace(rows_path: str) -> str:
+    """Return the cache namespace of the table rows of a report, by its name."""
+    name_hash = hashlib.sha256(_report_name(rows_path).encode("utf-8")).hexdigest()
+    return f"table_rows-{name_hash[:16]}"
 
 
 class DatabaseStorageOperator(RAGMixin, MapOperator[Dict, str]):
@@ -673,14 +556,29 @@ class DatabaseStorageOperator(RAGMixin, MapOperator[Dict, str]):
         conn_database: Optional[RDBMSConnector] = None,
         tmp_dir_path: Optional[str] = None,
         executor: Optional[Executor] = None,
+        chunk_size: Optional[int] = None,
+        embedding_cache: Optional[EmbeddingCache] = None,
         **kwargs,
     ):
-        """Init the datasource operator."""
+        """Init the datasource operator.
+
+        Args:
+            executor: (Optional[Executor]) The executor of the blocking tasks,
+                default the shared io executor.
+            chunk_size: (Optional[int]) The number of report rows inserted per
+                transaction, default FIN_REPORT_DB_CHUNK_SIZE or 500.
+            embedding_cache: (Optional[EmbeddingCache]) The embedding cache of the
+                database profile.
+        """
         MapOperator.__init__(self, **kwargs)
         self._db_config = db_config
         self._conn_database = conn_database
         self._tmp_dir_path = tmp_dir_path
-        self._executor = executor or ThreadPoolExecutor()
+        self._executor = _operator_executor(executor)
+        self._chunk_size = chunk_size or int(
+            os.getenv("FIN_REPORT_DB_CHUNK_SIZE", DEFAULT_CHUNK_SIZE)
+        )
+        self._embedding_cache = embedding_cache
 
     async def map(self, knowledge_request: Dict) -> str:
         """Create datasource."""
@@ -691,30 +589,62 @@ class DatabaseStorageOperator(RAGMixin, MapOperator[Dict, str]):
         tmp_dir_path = self._tmp_dir_path or "./tmp"
         sqlite_path = os.path.join(tmp_dir_path, space, f"{db_name}.db")
 
-        self._conn_database = self._conn_database or SQLiteConnector.from_file_path(
+        # The operator is shared by the spaces, the connector and config of the
+        # space are built per call unless given to the operator.
+        conn_database = self._conn_database or SQLiteConnector.from_file_path(
             sqlite_path
         )
-        self._db_config = DBConfig(
+        db_config = self._db_config or DBConfig(
             db_name=db_name,
-            db_type=self._conn_database.db_type,
+            db_type=conn_database.db_type,
             file_path=sqlite_path,
         )
-        if self._conn_database:
-            dataframe.to_sql(
-                "fin_report",
-                self._conn_database._engine,
-                if_exists="append",
-                index=False,
+        if conn_database:
+            # The statement items and staff counts are stored as REAL in 元.
+            numeric_columns = FIN_DATA_ITEMS + COUNT_COLUMNS
+            dataframe = normalize_numeric_columns(dataframe, numeric_columns)
+            if conn_database.db_type == "sqlite":
+                await blocking_func_to_async(
+                    self._executor,
+                    save_reports,
+                    sqlite_path,
+                    dataframe,
+                    self._chunk_size,
+                )
+                await blocking_func_to_async(
+                    self._executor,
+                    save_indicators,
+                    sqlite_path,
+                    dataframe["文件名"].tolist(),
+                )
+                await blocking_func_to_async(
+                    self._executor, save_facts, sqlite_path, dataframe, numeric_columns
+                )
+            else:
+                dataframe.to_sql(
+                    "fin_report",
+                    conn_database._engine,
+                    if_exists="append",
+                    index=False,
+                    chunksize=self._chunk_size,
+                )
+        full_text = knowledge_request.get("full_text")
+        if full_text:
+            await blocking_func_to_async(
+                self._executor,
+                save_full_text,
+                full_text_db_path(tmp_dir_path, space, db_name),
+                full_text,
             )
         if not self.dev_mode:
             from dbgpt.datasource.manages import ConnectorManager
 
             connector_manager = ConnectorManager.get_instance(self.system_app)
             db_list = [item["db_name"] for item in connector_manager.get_db_list()]
-            if self._db_config.db_name not in db_list:
-                connector_manager.add_db(self._db_config)
+            if db_config.db_name not in db_list:
+                connector_manager.add_db(db_config)
         else:
-            await self.save_database_profile(db_name, self._conn_database, tmp_dir_path)
+            await self.save_database_profile(db_name, conn_database, tmp_dir_path)
         return sqlite_path
 
 
@@ -727,27 +657,67 @@ class VectorStorageOperator(RAGMixin, MapOperator[Dict, List[Chunk]]):
         index_store: Optional[IndexStoreBase] = None,
         embeddings: Optional[Embeddings] = None,
         max_chunks_once_load: Optional[int] = None,
+        embedding_batch_size: Optional[int] = None,
+        max_pending_batches: Optional[int] = None,
+        embedding_cache: Optional[EmbeddingCache] = None,
         **kwargs,
     ):
-        """Init the datasource operator."""
+        """Init the datasource operator.
+
+        Args:
+            max_chunks_once_load: (Optional[int]) The default of
+                ``embedding_batch_size``.
+            embedding_batch_size: (Optional[int]) The number of chunks embedded and
+                written at once, default ``max_chunks_once_load``,
+                FIN_REPORT_EMBEDDING_BATCH_SIZE, KNOWLEDGE_MAX_CHUNKS_ONCE_LOAD or
+                32.
+            max_pending_batches: (Optional[int]) Max batches waiting for the
+                embedding or the writing, default
+                FIN_REPORT_EMBEDDING_MAX_PENDING_BATCHES or 4.
+            embedding_cache: (Optional[EmbeddingCache]) The embedding cache, the
+                chunks embedded before are not embedded again.
+        """
         MapOperator.__init__(self, **kwargs)
         self._tmp_dir_path = tmp_dir_path
         self._index_store = index_store
         self._embeddings = embeddings
-        self._max_chunks_once_load = max_chunks_once_load
+        self._embedding_batch_size = (
+            embedding_batch_size
+            or max_chunks_once_load
+            or int(os.getenv("FIN_REPORT_EMBEDDING_BATCH_SIZE", 0))
+            or int(os.getenv("KNOWLEDGE_MAX_CHUNKS_ONCE_LOAD", DEFAULT_BATCH_SIZE))
+        )
+        self._max_pending_batches = max_pending_batches or int(
+            os.getenv(
+                "FIN_REPORT_EMBEDDING_MAX_PENDING_BATCHES", DEFAULT_MAX_PENDING_BATCHES
+            )
+        )
+        self._embedding_cache = embedding_cache
 
     async def map(self, storage_request: Dict) -> List[Chunk]:
-        """Persist chunks in vector db."""
-        chunks = storage_request.get("chunks")
+        """Persist chunks in vector db.
+
+        The chunks are embedded by batches while the next pages are split, and
+        each batch is written while the next one is embedded. The throughput of
+        each stage is in the ``embedding_stats`` of the request.
+        """
+        page_chunks = storage_request.get("page_chunks")
+        if page_chunks is None:
+            page_chunks = iter([storage_request.get("chunks") or []])
         vector_store = await self.get_vector_store(
             storage_request["space"],
             self._tmp_dir_path,
             storage_request["embedding_model"],
         )
-        max_chunks_once_load = self._max_chunks_once_load or int(
-            os.getenv("KNOWLEDGE_MAX_CHUNKS_ONCE_LOAD", 10)
+        chunks, storage_request["embedding_stats"] = await load_chunks(
+            page_chunks,
+            vector_store,
+            await self.get_embeddings(storage_request["embedding_model"]),
+            get_executor(EXECUTOR_IO),
+            get_executor(EXECUTOR_INFERENCE),
+            batch_size=self._embedding_batch_size,
+            max_pending_batches=self._max_pending_batches,
         )
-        await vector_store.aload_document_with_limit(chunks, max_chunks_once_load)
         return chunks
 
 
@@ -812,6 +782,39 @@ class FinKnowledgeJoinOperator(JoinOperator[List[str]]):
         return chunks, db_name
 
 
+class ExtractionCacheStatsOperator(MapOperator[None, Dict]):
+    """Report the extraction cache statistics."""
+
+    def __init__(self, cache: Optional[ExtractionCache] = None, **kwargs):
+        super().__init__(**kwargs)
+        self._cache = cache
+
+    async def map(self, _: None) -> Dict:
+        if not self._cache:
+            return {"enabled": False}
+        return {"enabled": True, **self._cache.stats()}
+
+
+class EmbeddingCacheStatsOperator(MapOperator[None, Dict]):
+    """Report the embedding cache statistics."""
+
+    def __init__(self, cache: Optional[EmbeddingCache] = None, **kwargs):
+        super().__init__(**kwargs)
+        self._cache = cache
+
+    async def map(self, _: None) -> Dict:
+        if not self._cache:
+            return {"enabled": False}
+        return {"enabled": True, **self._cache.stats()}
+
+
+class ExecutorStatsOperator(MapOperator[None, Dict]):
+    """Report the queue depth and utilization of the shared executors."""
+
+    async def map(self, _: None) -> Dict:
+        return executor_stats()
+
+
 class TriggerReqBody(BaseModel):
     space: str | None = Field(None, description="space")
     file_path: str | None = Field(None, description="file path")
@@ -833,6 +836,199 @@ class RequestHandleOperator(MapOperator[TriggerReqBody, Dict]):
         }
 
 
+class BatchTriggerReqBody(BaseModel):
+    space: str | None = Field(None, description="space")
+    directory: str | None = Field(None, description="directory of the pdf files")
+    manifest: str | None = Field(None, description="manifest file, a pdf per line")
+    file_paths: List[str] | None = Field(None, description="pdf file paths")
+    embedding_model: str | None = Field(None, description="embedding model path")
+
+
+class BatchKnowledgeProcessOperator(MapOperator[BatchTriggerReqBody, Dict]):
+    """Ingest a batch of financial reports into a single space.
+
+    The pdfs are parsed in the shared cpu process pool, a pdf per worker, ahead of the
+    extraction and storage of the reports, which run one report at a time in the
+    order of the batch. So the parsing of the next reports overlaps the embedding
+    and the database writes of the current one.
+
+    The stages are the operators of the single report DAG, created for each batch
+    and called directly, they are not nodes of the batch DAG.
+    """
+
+    def __init__(
+        self,
+        tmp_dir_path: Optional[str] = None,
+        extraction_cache: Optional[ExtractionCache] = None,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        chunk_parameters: Optional[ChunkParameters] = None,
+        max_pending_reports: Optional[int] = None,
+        **kwargs,
+    ):
+        """Init the batch operator.
+
+        Args:
+            tmp_dir_path: (Optional[str]) The output directory of the stages.
+            extraction_cache: (Optional[ExtractionCache]) The extraction cache.
+            embedding_cache: (Optional[EmbeddingCache]) The embedding cache.
+            chunk_parameters: (Optional[ChunkParameters]) The chunk parameters.
+            max_pending_reports: (Optional[int]) Max reports parsed or being parsed
+                ahead of the storage, default FIN_REPORT_BATCH_MAX_PENDING_REPORTS
+                or twice the cpu pool size.
+        """
+        super().__init__(**kwargs)
+        self._tmp_dir_path = tmp_dir_path
+        self._extraction_cache = extraction_cache
+        self._embedding_cache = embedding_cache
+        self._chunk_parameters = chunk_parameters or ChunkParameters(
+            chunk_strategy="Automatic"
+        )
+        self._max_pending_reports = max(
+            max_pending_reports
+            or int(os.getenv("FIN_REPORT_BATCH_MAX_PENDING_REPORTS", 0))
+            or get_executor(EXECUTOR_CPU).max_workers * 2,
+            1,
+        )
+
+    async def map(self, input_value: BatchTriggerReqBody) -> Dict:
+        """Ingest the reports, return the status of each report and the throughput."""
+        if isinstance(input_value, dict):
+            input_value = BatchTriggerReqBody(**input_value)
+        file_paths = await blocking_func_to_async(
+            get_executor(EXECUTOR_IO), _batch_file_paths, input_value
+        )
+        logger.info(f"batch ingest {len(file_paths)} reports into {input_value.space}")
+        start = time.perf_counter()
+        stages = self._create_stages()
+        knowledge_loader, _, _, table_extractor, _ = stages
+        results = []
+        next_file_paths = iter(file_paths)
+        pending: deque = deque()
+        parse_executor = get_executor(EXECUTOR_CPU)
+
+        def parse_next():
+            file_path = next(next_file_paths, None)
+            if file_path is not None:
+                parsing = asyncio.ensure_future(
+                    knowledge_loader.load_in_process(file_path, parse_executor)
+                )
+                pending.append((file_path, parsing))
+
+        for _ in range(self._max_pending_reports):
+            parse_next()
+        while pending:
+            file_path, parsing = pending.popleft()
+            parse_next()
+            results.append(await self._ingest(stages, file_path, parsing, input_value))
+        # the batch ends once the excel files of its reports are written
+        await table_extractor.wait_excel_writes()
+        elapsed = time.perf_counter() - start
+        succeeded = [result for result in results if result["status"] == "success"]
+        pages = sum(result["pages"] for result in succeeded)
+        logger.info(
+            f"batch ingest {len(succeeded)}/{len(results)} reports, {pages} pages "
+            f"in {elapsed:.1f}s"
+        )
+        return {
+            "space": input_value.space,
+            "total": len(results),
+            "succeeded": len(succeeded),
+            "failed": len(results) - len(succeeded),
+            "pages": pages,
+            "elapsed": round(elapsed, 3),
+            "reports_per_minute": round(len(succeeded) * 60 / elapsed, 2),
+            "pages_per_second": round(pages / elapsed, 2),
+            "reports": results,
+        }
+
+    def _create_stages(
+        self,
+    ) -> Tuple[
+        KnowledgeLoaderOperator,
+        FinTextExtractOperator,
+        VectorStorageOperator,
+        FinTableExtractorOperator,
+        DatabaseStorageOperator,
+    ]:
+        """Create the stage operators of a batch, out of any DAG context."""
+        return (
+            KnowledgeLoaderOperator(cache=self._extraction_cache),
+            FinTextExtractOperator(chunk_parameters=self._chunk_parameters),
+            VectorStorageOperator(
+                tmp_dir_path=self._tmp_dir_path, embedding_cache=self._embedding_cache
+            ),
+            FinTableExtractorOperator(
+                tmp_dir_path=self._tmp_dir_path, cache=self._extraction_cache
+            ),
+            DatabaseStorageOperator(
+                tmp_dir_path=self._tmp_dir_path, embedding_cache=self._embedding_cache
+            ),
+        )
+
+    async def _ingest(
+        self,
+        stages: Tuple,
+        file_path: str,
+        parsing: "asyncio.Future[FinReportKnowledge]",
+        input_value: BatchTriggerReqBody,
+    ) -> Dict:
+        """Extract and store a report, a failure only fails this report."""
+        start = time.perf_counter()
+        result: Dict = {"file_path": file_path}
+        _, text_extractor, vector_storage, table_extractor, database_storage = stages
+        try:
+            knowledge_request = {
+                "space": input_value.space,
+                "datasource": file_path,
+                "embedding_model": input_value.embedding_model,
+                "knowledge": await parsing,
+            }
+            text_request, table_request = await asyncio.gather(
+                text_extractor.map(dict(knowledge_request)),
+                table_extractor.map(dict(knowledge_request)),
+            )
+            chunks, _ = await asyncio.gather(
+                vector_storage.map(text_request),
+                database_storage.map(table_request),
+            )
+            result.update(
+                status="success",
+                pages=len(table_request.get("full_text") or []),
+                chunks=len(chunks),
+                embedding=text_request.get("embedding_stats"),
+            )
+        except Exception as e:
+            logger.exception(f"batch ingest {file_path} failed")
+            result.update(status="failed", error=str(e))
+        result["elapsed"] = round(time.perf_counter() - start, 3)
+        return result
+
+
+def _batch_file_paths(input_value: BatchTriggerReqBody) -> List[str]:
+    """Return the pdf files of a batch, without duplicates.
+
+    The files are the ``file_paths``, then the lines of the ``manifest`` (relative
+    to the manifest, ``#`` comments skipped), then the pdfs under ``directory``.
+    """
+    file_paths = list(input_value.file_paths or [])
+    if input_value.manifest:
+        manifest_dir = os.path.dirname(input_value.manifest)
+        with open(input_value.manifest, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line and not line.startswith("#"):
+                    file_paths.append(os.path.join(manifest_dir, line))
+    if input_value.directory:
+        file_paths.extend(
+            sorted(
+                glob.glob(
+                    os.path.join(input_value.directory, "**", "*.pdf"), recursive=True
+                )
+            )
+        )
+    return list(dict.fromkeys(file_paths))
+
+
 with DAG(
     "fin_report_knowledge_processing_task",
     tags={"knowledge_factory_domain_type": "FinancialReport"},
@@ -851,21 +1047,79 @@ with DAG(
         from dbgpt.configs.model_config import PILOT_PATH
 
         tmp_dir_path = f"{PILOT_PATH}/data/"
-    knowledge_factory = KnowledgeLoaderOperator()
+    extraction_cache = None
+    if os.getenv("FIN_REPORT_CACHE_ENABLED", "true").lower() == "true":
+        extraction_cache = ExtractionCache(
+            os.getenv(
+                "FIN_REPORT_CACHE_DIR", os.path.join(tmp_dir_path, "fin_report_cache")
+            ),
+            max_size=int(os.getenv("FIN_REPORT_CACHE_MAX_SIZE", 1024 * 1024 * 1024)),
+        )
+    embedding_cache = None
+    if os.getenv("FIN_REPORT_EMBEDDING_CACHE_ENABLED", "true").lower() == "true":
+        embedding_cache = EmbeddingCache(
+            os.getenv(
+                "FIN_REPORT_EMBEDDING_CACHE_PATH",
+                os.path.join(tmp_dir_path, "fin_report_embedding_cache.db"),
+            ),
+            max_size=int(
+                os.getenv("FIN_REPORT_EMBEDDING_CACHE_MAX_SIZE", 1024 * 1024 * 1024)
+            ),
+        )
+    knowledge_factory = KnowledgeLoaderOperator(cache=extraction_cache)
     extract_branch = KnowledgeExtractBranchOperator(
         text_task_name="extract_text_task", table_task_name="extract_table_task"
     )
     chunk_parameters = ChunkParameters(chunk_strategy="Automatic")
     extract_text_task = FinTextExtractOperator(chunk_parameters=chunk_parameters)
-    vector_storage = VectorStorageOperator(tmp_dir_path=tmp_dir_path)
-    extractor_table_task = FinTableExtractorOperator(tmp_dir_path=tmp_dir_path)
+    vector_storage = VectorStorageOperator(
+        tmp_dir_path=tmp_dir_path, embedding_cache=embedding_cache
+    )
+    extractor_table_task = FinTableExtractorOperator(
+        tmp_dir_path=tmp_dir_path, cache=extraction_cache
+    )
     database_storage = DatabaseStorageOperator(
-        tmp_dir_path=tmp_dir_path,
+        tmp_dir_path=tmp_dir_path, embedding_cache=embedding_cache
     )
     result_join_task = FinKnowledgeJoinOperator()
     trigger >> request_task >> knowledge_factory >> extract_branch
     extract_branch >> extract_text_task >> vector_storage >> result_join_task
     extract_branch >> extractor_table_task >> database_storage >> result_join_task
 
+with DAG("fin_report_batch_knowledge_processing_task") as batch_dag:
+    batch_trigger = HttpTrigger(
+        "/dbgpts/fin_knowledge_batch_process",
+        methods="POST",
+        request_body=BatchTriggerReqBody,
+    )
+    batch_task = BatchKnowledgeProcessOperator(
+        tmp_dir_path=tmp_dir_path,
+        extraction_cache=extraction_cache,
+        embedding_cache=embedding_cache,
+        chunk_parameters=chunk_parameters,
+    )
+    batch_trigger >> batch_task
+
+with DAG("fin_report_extraction_cache_stats") as cache_stats_dag:
+    cache_stats_trigger = HttpTrigger(
+        "/dbgpts/fin_knowledge_cache_stats", methods="GET"
+    )
+    cache_stats_task = ExtractionCacheStatsOperator(cache=extraction_cache)
+    cache_stats_trigger >> cache_stats_task
+
+with DAG("fin_report_embedding_cache_stats") as embedding_cache_stats_dag:
+    embedding_cache_stats_trigger = HttpTrigger(
+        "/dbgpts/fin_knowledge_embedding_cache_stats", methods="GET"
+    )
+    embedding_cache_stats_task = EmbeddingCacheStatsOperator(cache=embedding_cache)
+    embedding_cache_stats_trigger >> embedding_cache_stats_task
+
+with DAG("fin_report_executor_stats") as executor_stats_dag:
+    executor_stats_trigger = HttpTrigger(
+        "/dbgpts/fin_report_executor_stats", methods="GET"
+    )
+    executor_stats_task = ExecutorStatsOperator()
+    executor_stats_trigger >> executor_stats_task
+
 if __name__ == "__main__":
     pass
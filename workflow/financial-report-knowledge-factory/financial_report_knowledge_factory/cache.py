@@ -0,0 +1,153 @@
+"""Content addressed cache of the financial report extraction results."""
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+# Bump it whenever the extraction output changes, old entries are then never hit
+# again and are evicted by the LRU.
+EXTRACTOR_VERSION = "6"
+
+_DEFAULT_MAX_SIZE = 1024 * 1024 * 1024
+# The eviction goes below the max size by this ratio, so the next puts do not
+# evict again right away.
+_EVICTION_RATIO = 0.9
+_CACHE_FILE_SUFFIX = ".json"
+
+
+class ExtractionCache:
+    """Local on-disk cache of the financial report extraction results.
+
+    The entries are keyed by the sha256 of the pdf content plus the extractor
+    version, so the same report ingested into another space, or under another
+    file name, is not parsed again. Each key can hold several namespaces, e.g. the
+    parsed ``all_text`` rows and the table extraction results, which depend on the
+    file name too and are namespaced by it.
+
+    The cache is evicted by least recently used entries once its size exceeds
+    ``max_size``. The size is read from the directory on the first put, then
+    estimated from the puts, the directory is only walked again to evict.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        max_size: int = _DEFAULT_MAX_SIZE,
+        version: str = EXTRACTOR_VERSION,
+    ):
+        """Create an extraction cache.
+
+        Args:
+            cache_dir(str): the cache directory
+            max_size(int): the max size of the cache in bytes
+            version(str): the extractor version, part of the cache key
+        """
+        self._cache_dir = cache_dir
+        self._max_size = max_size
+        self._version = version
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._size: Optional[int] = None
+
+    def content_key(self, file_path: str) -> str:
+        """Return the cache key of a file, its content hash plus the version."""
+        sha256 = hashlib.sha256()
+        with open(file_path, "rb") as f:
+            for block in iter(lambda: f.read(1024 * 1024), b""):
+                sha256.update(block)
+        return f"{sha256.hexdigest()}-v{self._version}"
+
+    def get(self, key: str, namespace: str) -> Optional[Any]:
+        """Get a cached value, return None if it is not cached."""
+        path = self._entry_path(key, namespace)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                value = json.load(f)
+            # Touch the entry, the mtime is the LRU clock.
+            os.utime(path)
+        except (OSError, ValueError):
+            with self._lock:
+                self._misses += 1
+            return None
+        with self._lock:
+            self._hits += 1
+        return value
+
+    def put(self, key: str, namespace: str, value: Any):
+        """Cache a JSON serializable value."""
+        path = self._entry_path(key, namespace)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(value, f, ensure_ascii=False, default=str)
+        size = os.path.getsize(tmp_path)
+        os.replace(tmp_path, path)
+        with self._lock:
+            if self._size is None:
+                self._size = sum(entry[1] for entry in self._list_entries())
+            else:
+                # the replaced entries and the other processes are ignored
+                self._size += size
+            if self._size > self._max_size:
+                self._evict()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the cache statistics."""
+        entries = self._list_entries()
+        with self._lock:
+            hits, misses, evictions = self._hits, self._misses, self._evictions
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "evictions": evictions,
+            "entries": len(entries),
+            "size": sum(size for _, size, _ in entries),
+            "max_size": self._max_size,
+            "version": self._version,
+        }
+
+    def _entry_path(self, key: str, namespace: str) -> str:
+        return os.path.join(
+            self._cache_dir, key[:2], f"{key}.{namespace}{_CACHE_FILE_SUFFIX}"
+        )
+
+    def _list_entries(self):
+        entries = []
+        if not os.path.isdir(self._cache_dir):
+            return entries
+        for root, _, files in os.walk(self._cache_dir):
+            for file in files:
+                if not file.endswith(_CACHE_FILE_SUFFIX):
+                    continue
+                path = os.path.join(root, file)
+                try:
+                    stat = os.stat(path)
+                except OSError:
+                    continue
+                entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _evict(self):
+        entries = self._list_entries()
+        total_size = sum(size for _, size, _ in entries)
+        target = int(self._max_size * _EVICTION_RATIO)
+        if total_size > self._max_size:
+            for path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+                if total_size <= target:
+                    break
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total_size -= size
+                self._evictions += 1
+                logger.info(f"Evict extraction cache entry {path}")
+        self._size = total_size
@@ -0,0 +1,231 @@
+"""Local cache of the chunk embeddings, shared by the knowledge spaces."""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from array import array
+from typing import Any, Dict, List, Optional
+
+from dbgpt.rag.embedding import Embeddings
+
+logger = logging.getLogger(__name__)
+
+EMBEDDING_CACHE_TABLE = "embedding_cache"
+
+_DEFAULT_MAX_SIZE = 1024 * 1024 * 1024
+# The eviction goes below the max size by this ratio, so the next puts do not
+# evict again right away.
+_EVICTION_RATIO = 0.9
+# The max number of variables of a SQLite statement is 999 in older versions.
+_MAX_SQL_VARIABLES = 900
+
+
+class EmbeddingCache:
+    """SQLite cache of the chunk embeddings.
+
+    The vectors are keyed by the embedding model and the sha256 of the chunk text,
+    so the same report ingested into another space gets the vectors of its chunks
+    from the cache instead of the model. The vectors are stored as float32 blobs.
+
+    The cache is evicted by least recently used entries once the size of its
+    vectors exceeds ``max_size``.
+    """
+
+    def __init__(self, path: str, max_size: int = _DEFAULT_MAX_SIZE):
+        """Create an embedding cache.
+
+        Args:
+            path(str): the SQLite database file, created if it does not exist
+            max_size(int): the max size of the vectors in bytes
+        """
+        self._path = path
+        self._max_size = max_size
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        # The size is read from the database on the first put, then estimated.
+        self._size: Optional[int] = None
+        self._created = False
+
+    def get_many(self, model: str, texts: List[str]) -> List[Optional[List[float]]]:
+        """Return the cached vector of each text, None for the texts not cached."""
+        hashes = [_text_hash(text) for text in texts]
+        vectors: Dict[str, List[float]] = {}
+        unique_hashes = list(dict.fromkeys(hashes))
+        conn = self._connect()
+        try:
+            with conn:
+                for start in range(0, len(unique_hashes), _MAX_SQL_VARIABLES):
+                    batch = unique_hashes[start : start + _MAX_SQL_VARIABLES]
+                    placeholders = ", ".join("?" for _ in batch)
+                    for text_hash, vector in conn.execute(
+                        f"SELECT text_hash, vector FROM {EMBEDDING_CACHE_TABLE} "
+                        f"WHERE model = ? AND text_hash IN ({placeholders})",
+                        [model, *batch],
+                    ):
+                        vectors[text_hash] = array("f", vector).tolist()
+                # Touch the hit entries, last_used is the LRU clock.
+                now = time.time()
+                conn.executemany(
+                    f"UPDATE {EMBEDDING_CACHE_TABLE} SET last_used = ? "
+                    "WHERE model = ? AND text_hash = ?",
+                    [(now, model, text_hash) for text_hash in vectors],
+                )
+        finally:
+            conn.close()
+        result = [vectors.get(text_hash) for text_hash in hashes]
+        hits = sum(vector is not None for vector in result)
+        with self._lock:
+            self._hits += hits
+            self._misses += len(result) - hits
+        return result
+
+    def put_many(self, model: str, texts: List[str], vectors: List[List[float]]):
+        """Cache the vectors of the texts."""
+        now = time.time()
+        records = {
+            _text_hash(text): array("f", vector).tobytes()
+            for text, vector in zip(texts, vectors)
+        }
+        conn = self._connect()
+        try:
+            with conn:
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO {EMBEDDING_CACHE_TABLE} "
+                    "VALUES (?, ?, ?, ?)",
+                    [(model, key, blob, now) for key, blob in records.items()],
+                )
+            with self._lock:
+                if self._size is None:
+                    self._size = self._read_size(conn)
+                else:
+                    self._size += sum(len(blob) for blob in records.values())
+                if self._size > self._max_size:
+                    self._evict(conn)
+        finally:
+            conn.close()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the cache statistics."""
+        conn = self._connect()
+        try:
+            entries, size = conn.execute(
+                f"SELECT COUNT(*), COALESCE(SUM(LENGTH(vector)), 0) "
+                f"FROM {EMBEDDING_CACHE_TABLE}"
+            ).fetchone()
+            models = [
+                row[0]
+                for row in conn.execute(
+                    f"SELECT DISTINCT model FROM {EMBEDDING_CACHE_TABLE}"
+                )
+            ]
+        finally:
+            conn.close()
+        with self._lock:
+            hits, misses, evictions = self._hits, self._misses, self._evictions
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / (hits + misses) if hits + misses else 0.0,
+            "evictions": evictions,
+            "entries": entries,
+            "size": size,
+            "max_size": self._max_size,
+            "models": models,
+        }
+
+    def _connect(self) -> sqlite3.Connection:
+        """Connect to the database, created on first use."""
+        with self._lock:
+            if not self._created:
+                directory = os.path.dirname(self._path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                conn = sqlite3.connect(self._path, timeout=30)
+                try:
+                    conn.execute("PRAGMA journal_mode=WAL")
+                    with conn:
+                        conn.execute(
+                            f"CREATE TABLE IF NOT EXISTS {EMBEDDING_CACHE_TABLE} ("
+                            "model TEXT NOT NULL, text_hash TEXT NOT NULL, "
+                            "vector BLOB NOT NULL, last_used REAL NOT NULL, "
+                            "PRIMARY KEY (model, text_hash)) WITHOUT ROWID"
+                        )
+                        conn.execute(
+                            "CREATE INDEX IF NOT EXISTS "
+                            f"idx_{EMBEDDING_CACHE_TABLE}_last_used "
+                            f"ON {EMBEDDING_CACHE_TABLE} (last_used)"
+                        )
+                finally:
+                    conn.close()
+                self._created = True
+        return sqlite3.connect(self._path, timeout=30)
+
+    def _read_size(self, conn: sqlite3.Connection) -> int:
+        return conn.execute(
+            f"SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM {EMBEDDING_CACHE_TABLE}"
+        ).fetchone()[0]
+
+    def _evict(self, conn: sqlite3.Connection):
+        # the estimated size ignores the replaced entries and the other processes
+        size = self._read_size(conn)
+        target = int(self._max_size * _EVICTION_RATIO)
+        evicted = []
+        for model, text_hash, length in conn.execute(
+            f"SELECT model, text_hash, LENGTH(vector) FROM {EMBEDDING_CACHE_TABLE} "
+            "ORDER BY last_used"
+        ):
+            if size <= target:
+                break
+            evicted.append((model, text_hash))
+            size -= length
+        with conn:
+            conn.executemany(
+                f"DELETE FROM {EMBEDDING_CACHE_TABLE} "
+                "WHERE model = ? AND text_hash = ?",
+                evicted,
+            )
+        self._size = size
+        if evicted:
+            self._evictions += len(evicted)
+            logger.info(f"Evict {len(evicted)} embedding cache entries")
+
+
+class CachedEmbeddings(Embeddings):
+    """Embeddings computing only the vectors of the texts not cached yet."""
+
+    def __init__(self, embeddings: Embeddings, cache: EmbeddingCache, model: str):
+        """Create the cached embeddings.
+
+        Args:
+            embeddings(Embeddings): the embeddings of the texts not cached
+            cache(EmbeddingCache): the embedding cache
+            model(str): the embedding model, part of the cache key
+        """
+        self.embeddings = embeddings
+        self._cache = cache
+        self._model = model
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Return the cached vectors, embed and cache the other texts."""
+        vectors = self._cache.get_many(self._model, texts)
+        missing = list(
+            dict.fromkeys(text for text, v in zip(texts, vectors) if v is None)
+        )
+        if missing:
+            computed = dict(zip(missing, self.embeddings.embed_documents(missing)))
+            self._cache.put_many(self._model, missing, list(computed.values()))
+            vectors = [computed[t] if v is None else v for t, v in zip(texts, vectors)]
+        return vectors  # type: ignore
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query text, the queries are not cached."""
+        return self.embeddings.embed_query(text)
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
@@ -0,0 +1,195 @@
+"""Pipelined embedding of the chunks of a report into the vector store.
+
+The chunks flow through three stages connected by bounded queues:
+
+- chunking: the page documents are split page by page in the io executor
+- embedding: the chunks are embedded by batches of ``batch_size`` in the inference
+  executor
+- writing: each embedded batch is written to the vector store in the io executor
+
+A full queue blocks the stage feeding it, so at most ``max_pending_batches``
+batches wait for the embedding or the writing, whatever the speed of each stage.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import Executor
+from typing import Any, Dict, Iterator, List, Tuple
+
+from dbgpt.core import Chunk
+from dbgpt.rag.embedding import Embeddings
+from dbgpt.rag.index.base import IndexStoreBase
+from dbgpt.util.executor_utils import blocking_func_to_async
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BATCH_SIZE = 32
+DEFAULT_MAX_PENDING_BATCHES = 4
+
+_DONE = object()
+
+
+class PrecomputedEmbeddings(Embeddings):
+    """Embeddings returning the vectors computed ahead by the embedding stage.
+
+    The vector store embeds the chunks it writes, with this as its embedding
+    function it gets the vectors of the embedding stage instead of computing them
+    again. The texts which were not computed ahead, e.g. the queries, are embedded
+    by the wrapped embeddings.
+    """
+
+    def __init__(self, embeddings: Embeddings):
+        """Create the precomputed embeddings of ``embeddings``."""
+        self.embeddings = embeddings
+        self._vectors: Dict[str, List[float]] = {}
+        self._lock = threading.Lock()
+
+    def precompute(self, texts: List[str]):
+        """Embed the texts, kept until they are released."""
+        vectors = self.embeddings.embed_documents(texts)
+        with self._lock:
+            self._vectors.update(zip(texts, vectors))
+
+    def release(self, texts: List[str]):
+        """Forget the vectors of the texts, once they are written."""
+        with self._lock:
+            for text in texts:
+                self._vectors.pop(text, None)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Return the precomputed vectors, the other texts are embedded now."""
+        with self._lock:
+            vectors = [self._vectors.get(text) for text in texts]
+        missing = [text for text, vector in zip(texts, vectors) if vector is None]
+        if missing:
+            computed = iter(self.embeddings.embed_documents(missing))
+            vectors = [next(computed) if v is None else v for v in vectors]
+        return vectors  # type: ignore
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a query text."""
+        return self.embeddings.embed_query(text)
+
+
+class _StageStats:
+    def __init__(self):
+        self.chunks = 0
+        self.seconds = 0.0
+
+    def add(self, chunks: int, start: float):
+        self.chunks += chunks
+        self.seconds += time.perf_counter() - start
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "chunks": self.chunks,
+            "seconds": round(self.seconds, 3),
+            "chunks_per_second": round(self.chunks / self.seconds, 2)
+            if self.seconds
+            else 0.0,
+        }
+
+
+async def load_chunks(
+    page_chunks: Iterator[List[Chunk]],
+    vector_store: IndexStoreBase,
+    embeddings: PrecomputedEmbeddings,
+    io_executor: Executor,
+    inference_executor: Executor,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+    max_pending_batches: int = DEFAULT_MAX_PENDING_BATCHES,
+) -> Tuple[List[Chunk], Dict[str, Any]]:
+    """Embed and write the chunks of a report, as they are split.
+
+    Args:
+        page_chunks(Iterator[List[Chunk]]): the chunks of each page, split lazily
+        vector_store(IndexStoreBase): the vector store, embedding with
+            ``embeddings``
+        embeddings(PrecomputedEmbeddings): the embedding function of the vector
+            store
+        io_executor(Executor): the executor of the chunking and the writing
+        inference_executor(Executor): the executor of the embedding
+        batch_size(int): the number of chunks embedded and written at once
+        max_pending_batches(int): the max number of batches waiting for the
+            embedding or the writing
+
+    Returns:
+        Tuple[List[Chunk], Dict[str, Any]]: the written chunks, and the chunks, the
+            busy seconds and the chunks per second of each stage
+    """
+    batch_size = max(batch_size, 1)
+    max_pending_batches = max(max_pending_batches, 1)
+    chunk_queue: asyncio.Queue = asyncio.Queue(max_pending_batches * batch_size)
+    write_queue: asyncio.Queue = asyncio.Queue(max_pending_batches)
+    stats = {name: _StageStats() for name in ("chunking", "embedding", "writing")}
+    written: List[Chunk] = []
+
+    async def chunking():
+        while True:
+            start = time.perf_counter()
+            chunks = await blocking_func_to_async(io_executor, next, page_chunks, None)
+            if chunks is None:
+                break
+            stats["chunking"].add(len(chunks), start)
+            for chunk in chunks:
+                await chunk_queue.put(chunk)
+        await chunk_queue.put(_DONE)
+
+    async def embedding():
+        done = False
+        while not done:
+            batch = []
+            while len(batch) < batch_size:
+                chunk = await chunk_queue.get()
+                if chunk is _DONE:
+                    done = True
+                    break
+                batch.append(chunk)
+            if batch:
+                start = time.perf_counter()
+                await blocking_func_to_async(
+                    inference_executor,
+                    embeddings.precompute,
+                    [chunk.content for chunk in batch],
+                )
+                stats["embedding"].add(len(batch), start)
+                await write_queue.put(batch)
+        await write_queue.put(_DONE)
+
+    async def writing():
+        while True:
+            batch = await write_queue.get()
+            if batch is _DONE:
+                return
+            start = time.perf_counter()
+            try:
+                await blocking_func_to_async(
+                    io_executor, vector_store.load_document, batch
+                )
+            finally:
+                embeddings.release([chunk.content for chunk in batch])
+            stats["writing"].add(len(batch), start)
+            written.extend(batch)
+
+    start = time.perf_counter()
+    stages = [
+        asyncio.ensure_future(stage()) for stage in (chunking, embedding, writing)
+    ]
+    try:
+        await asyncio.gather(*stages)
+    except BaseException:
+        # a failed stage would leave the others waiting on their queues
+        for stage in stages:
+            stage.cancel()
+        raise
+    elapsed = time.perf_counter() - start
+    result = {
+        "chunks": len(written),
+        "elapsed": round(elapsed, 3),
+        "chunks_per_second": round(len(written) / elapsed, 2) if elapsed else 0.0,
+        **{name: stage_stats.to_dict() for name, stage_stats in stats.items()},
+    }
+    logger.info(f"embedding pipeline: {result}")
+    return written, result
@@ -0,0 +1,166 @@
+"""Shared executors of the financial report knowledge factory.
+
+The operators share named pools instead of creating their own:
+
+- ``io``: threads for the file and database work, ``FIN_REPORT_IO_WORKERS``
+- ``cpu``: processes for the pdf parsing and the table extraction, which hold the
+  GIL in threads, ``FIN_REPORT_CPU_WORKERS``
+- ``inference``: a few threads for the model inference,
+  ``FIN_REPORT_INFERENCE_WORKERS``
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import (
+    BrokenExecutor,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+)
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+EXECUTOR_IO = "io"
+EXECUTOR_CPU = "cpu"
+EXECUTOR_INFERENCE = "inference"
+EXECUTOR_NAMES = (EXECUTOR_IO, EXECUTOR_CPU, EXECUTOR_INFERENCE)
+
+
+class MeteredExecutor(Executor):
+    """An executor counting its tasks, for its queue depth and utilization.
+
+    A broken process pool, e.g. after a worker was killed, is replaced on the next
+    submit instead of failing all the next tasks.
+    """
+
+    def __init__(
+        self, name: str, create_executor: Callable[[], Executor], max_workers: int
+    ):
+        """Create a metered executor.
+
+        Args:
+            name(str): the executor name
+            create_executor(Callable[[], Executor]): create the underlying executor
+            max_workers(int): the number of workers of the underlying executor
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self._create_executor = create_executor
+        self._executor = create_executor()
+        self._lock = threading.Lock()
+        self._submitted = 0
+        self._completed = 0
+        self._failed = 0
+        self._task_seconds = 0.0
+
+    def submit(self, fn: Callable, *args: Any, **kwargs: Any) -> Future:
+        """Submit a task to the underlying executor."""
+        start = time.perf_counter()
+        executor = self._executor
+        try:
+            future = executor.submit(fn, *args, **kwargs)
+        except BrokenExecutor:
+            with self._lock:
+                # another submit may have replaced it already
+                if self._executor is executor:
+                    logger.warning(f"executor {self.name} is broken, create a new one")
+                    self._executor = self._create_executor()
+                executor = self._executor
+            future = executor.submit(fn, *args, **kwargs)
+        with self._lock:
+            self._submitted += 1
+        future.add_done_callback(lambda f: self._task_done(f, start))
+        return future
+
+    def _task_done(self, future: Future, start: float):
+        with self._lock:
+            self._completed += 1
+            if future.cancelled() or future.exception() is not None:
+                self._failed += 1
+            self._task_seconds += time.perf_counter() - start
+
+    def shutdown(self, wait: bool = True, **kwargs: Any):
+        """Shutdown the underlying executor."""
+        self._executor.shutdown(wait=wait, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the task counters, the queue depth and the utilization.
+
+        The running tasks are the pending tasks up to the number of workers, the
+        others are queued. The task time is from submit to done, queue included.
+        """
+        with self._lock:
+            pending = self._submitted - self._completed
+            running = min(pending, self.max_workers)
+            return {
+                "max_workers": self.max_workers,
+                "submitted": self._submitted,
+                "completed": self._completed,
+                "failed": self._failed,
+                "running": running,
+                "queued": pending - running,
+                "utilization": round(running / self.max_workers, 3),
+                "avg_task_seconds": round(
+                    self._task_seconds / self._completed if self._completed else 0.0,
+                    3,
+                ),
+            }
+
+
+_executors: Dict[str, MeteredExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(name: str) -> MeteredExecutor:
+    """Return the shared executor of a name, created on first use."""
+    with _executors_lock:
+        if name not in _executors:
+            _executors[name] = _new_executor(name)
+        return _executors[name]
+
+
+def register_executor(
+    name: str, create_executor: Callable[[], Executor], max_workers: int
+):
+    """Replace the shared executor of a name, e.g. to size it from a config."""
+    with _executors_lock:
+        _executors[name] = MeteredExecutor(name, create_executor, max_workers)
+
+
+def executor_stats() -> Dict[str, Dict[str, Any]]:
+    """Return the stats of the executors created so far."""
+    with _executors_lock:
+        executors = dict(_executors)
+    return {name: executor.stats() for name, executor in executors.items()}
+
+
+def _new_executor(name: str) -> MeteredExecutor:
+    cpu_count = os.cpu_count() or 1
+    if name == EXECUTOR_IO:
+        max_workers = int(os.getenv("FIN_REPORT_IO_WORKERS", 0)) or min(
+            32, cpu_count + 4
+        )
+        return MeteredExecutor(
+            name,
+            lambda: ThreadPoolExecutor(max_workers, thread_name_prefix="fin_report_io"),
+            max_workers,
+        )
+    if name == EXECUTOR_CPU:
+        max_workers = int(os.getenv("FIN_REPORT_CPU_WORKERS", 0)) or cpu_count
+        return MeteredExecutor(
+            name, lambda: ProcessPoolExecutor(max_workers), max_workers
+        )
+    if name == EXECUTOR_INFERENCE:
+        max_workers = int(os.getenv("FIN_REPORT_INFERENCE_WORKERS", 0)) or 1
+        return MeteredExecutor(
+            name,
+            lambda: ThreadPoolExecutor(
+                max_workers, thread_name_prefix="fin_report_inference"
+            ),
+            max_workers,
+        )
+    raise ValueError(f"Unknown executor {name}, expected one of {EXECUTOR_NAMES}")
@@ -1,15 +1,556 @@
 """FinTableExtractor."""
 
+import ast
+import contextlib
 import json
 import logging
 import os
 import re
 
-import pandas as pd
+from .numeric import PER_SHARE_COLUMNS, PER_SHARE_UNIT
+from .row_file import RowFile
+from .table_store import ExcelTableStore
 
 logger = logging.getLogger(__name__)
 
 
+def _report_file_name(file_name):
+    """Return the 文件名 of a report, the name of its former txt intermediate file."""
+    return os.path.splitext(os.path.basename(file_name))[0] + ".txt"
+
+
+def _table_row(text, table_cells):
+    """Return a new list of the cells of a table row from its text.
+
+    The cells are taken from the row of the text, a text not found, e.g. a row
+    cut in the middle, is parsed as a python literal.
+    """
+    cells = table_cells.get(text)
+    if cells is None:
+        return ast.literal_eval(text)
+    return list(cells)
+
+
+# The text sections of extract_other_col: the column, the pattern of the line
+# starting the section, the pattern of the line stopping it, and whether the
+# section also stops at the second "是.否"/"适用.不适用" question.
+_OTHER_COL_SECTIONS = [
+    (
+        "审计意见",
+        r"(?:\.|、|\)|）)(?:审计意见|保留意见)$",
+        r"(?:形成审计意见的基础|形成保留意见的基础)$",
+        True,
+    ),
+    ("关键审计事项", r"(?:关键审计事项)$", r"(?:其他信息)$", True),
+    ("主要会计数据和财务指标", r"主要会计数据和财务指标", r"分季度主要财务指标", True),
+    ("主要销售客户", r"公司主要销售客户情况", r"公司主要供应商情况", True),
+    ("主要供应商", r"公司主要供应商情况", r"研发投入|费用", True),
+    (
+        "研发投入",
+        r"(?:研发投入|近三年公司研发投入金额及占营业收入的比例)$",
+        r"现金流",
+        False,
+    ),
+    ("现金流", r"(?:现金流)$", r"非主营业务情况", True),
+    ("资产及负债状况", r"(?:资产及负债状况)$", r"投资状况分析", True),
+    ("重大资产和股权出售", r"重大资产和股权出售", r"主要控股参股公司分析", True),
+    ("主要控股参股公司分析", r"主要控股参股公司分析", r"公司未来发展的展望", True),
+    (
+        "公司未来发展的展望",
+        r"公司未来发展的展望",
+        r"接待调研、沟通、采访等活动登记表",
+        True,
+    ),
+    (
+        "合并报表范围发生变化的情况说明",
+        r"与上年度财务报告相比，合并报表范围发生变化的情况说明",
+        r"聘任、解聘会计师事务所情况",
+        True,
+    ),
+    (
+        "聘任、解聘会计师事务所情况",
+        r"聘任、解聘会计师事务所情况",
+        r"面临(?:暂停上市|终止上市|退市).{0,10}情况",
+        False,
+    ),
+    (
+        "面临退市情况",
+        r"面临(?:暂停上市|终止上市|退市).{0,10}情况",
+        r"破产重整相关事项",
+        True,
+    ),
+    ("破产重整相关事项", r"破产重整相关事项", r"重大诉讼、仲裁事项", True),
+    ("重大诉讼、仲裁事项", r"重大诉讼、仲裁事项", r"处罚及整改情况", True),
+    (
+        "处罚及整改情况",
+        r"处罚及整改情况",
+        r"公司及其控股股东、实际控制人的诚信状况",
+        True,
+    ),
+    (
+        "公司及其控股股东、实际控制人的诚信状况",
+        r"公司及其控股股东、实际控制人的诚信状况",
+        r"公司股权激励计划、员工持股计划或其他员工激励措施的实施情况",
+        True,
+    ),
+    ("重大关联交易", r"重大关联交易", r"重大合同及其履行情况", False),
+    ("重大合同及其履行情况", r"重大合同及其履行情况", r"其他重大事项的说明", False),
+    (
+        "重大环保问题",
+        r"重大环保问题|环境保护相关的情况",
+        r"社会责任情况|重要事项|股份变动情况|其他重大事项的说明",
+        True,
+    ),
+    (
+        "社会责任情况",
+        r"社会责任情况",
+        r"重要事项|股份变动情况|其他重大事项的说明",
+        True,
+    ),
+    (
+        "公司董事、监事、高级管理人员变动情况",
+        r"公司董事、监事、高级管理人员变动情况",
+        r"任职情况",
+        True,
+    ),
+    ("公司员工情况", r"公司员工情况", r"培训计划", False),
+    (
+        "非标准审计报告的说明",
+        r"对会计师事务所本报告期“非标准审计报告”的说明",
+        r"董事会对该事项的意见|独立董事意见|监事会意见|消除有关事项及其影响的具体措施",
+        True,
+    ),
+    ("公司控股股东情况", r"公司控股股东情况", r"同业竞争情况|重大事项", True),
+    (
+        "审计报告",
+        r"(?:\.|、|\)|）)(?:审计报告)$",
+        r"审计报告正文|(?:\.|、|\)|）)(?:审计意见|保留意见)$",
+        True,
+    ),
+]
+_MAX_SECTION_LENGTH = 2000
+_YES_NO_RE = re.compile("是.否")
+_APPLICABLE_RE = re.compile("适用.不适用")
+_CHAPTER_RE = re.compile("第(?:一|二|三|四|五|六|七|八|九|十)节")
+
+
+class _SectionScanner:
+    """Extract several text sections of a report in a single pass over its lines.
+
+    A section starts at the first line matching its start pattern and takes the
+    following lines until a line matches its stop pattern, it reaches 2000
+    characters, or it holds two chapter headings (or two "是.否"/"适用.不适用"
+    questions). A section is taken only once, it is dropped from the scan as
+    soon as it stops.
+
+    The patterns can't match across lines, so the counters of a section are
+    summed line by line instead of searched again over the whole section.
+    """
+
+    def __init__(self, sections):
+        self._columns = [column for column, _, _, _ in sections]
+        self._starts = [re.compile(start) for _, start, _, _ in sections]
+        self._stops = [re.compile(stop) for _, _, stop, _ in sections]
+        self._check_questions = [check for _, _, _, check in sections]
+        # Any start pattern matches, to skip the lines starting no section.
+        self._any_start = re.compile(
+            "|".join(f"(?:{start})" for _, start, _, _ in sections)
+        )
+        self._pending = list(range(len(sections)))
+        # index -> [lines, length, yes/no count, applicable count, chapter count]
+        self._active = {}
+        self._texts = [""] * len(sections)
+
+    def feed(self, line):
+        """Scan the next line."""
+        if self._active:
+            self._feed_active(line)
+        if self._pending and self._any_start.search(line):
+            for index in list(self._pending):
+                if self._starts[index].search(line):
+                    self._pending.remove(index)
+                    self._active[index] = [[line], len(line), 0, 0, 0]
+                    self._count_line(self._active[index], line)
+
+    def _feed_active(self, line):
+        counts = None
+        for index, state in list(self._active.items()):
+            lines, length, yes_no, applicable, chapter = state
+            if (
+                self._stops[index].search(line)
+                or length >= _MAX_SECTION_LENGTH
+                or (self._check_questions[index] and (yes_no >= 2 or applicable >= 2))
+                or chapter >= 2
+            ):
+                self._texts[index] = "\n".join(lines)
+                del self._active[index]
+                continue
+            if counts is None:
+                counts = _line_counts(line)
+            lines.append(line)
+            state[1] = length + 1 + len(line)
+            state[2] += counts[0]
+            state[3] += counts[1]
+            state[4] += counts[2]
+
+    def _count_line(self, state, line):
+        yes_no, applicable, chapter = _line_counts(line)
+        state[2] += yes_no
+        state[3] += applicable
+        state[4] += chapter
+
+    def sections(self):
+        """Return the text of each section column, empty if not found."""
+        for index, state in self._active.items():
+            self._texts[index] = "\n".join(state[0])
+        return dict(zip(self._columns, self._texts))
+
+
+def _line_counts(line):
+    return (
+        len(_YES_NO_RE.findall(line)),
+        len(_APPLICABLE_RE.findall(line)),
+        len(_CHAPTER_RE.findall(line)),
+    )
+
+
+# The statement items of extract_fin_data.
+FIN_DATA_ITEMS = [
+    "货币资金",
+    "结算备付金",
+    "拆出资金",
+    "交易性金融资产",
+    "以公允价值计量且其变动计入当期损益的金融资产",
+    "衍生金融资产",
+    "应收票据",
+    "应收账款",
+    "应收款项融资",
+    "预付款项",
+    "应收保费",
+    "应收分保账款",
+    "应收分保合同准备金",
+    "其他应收款",
+    "应收利息",
+    "应收股利",
+    "买入返售金融资产",
+    "存货",
+    "合同资产",
+    "持有待售资产",
+    "一年内到期的非流动资产",
+    "其他流动资产",
+    "流动资产合计",
+    "发放贷款和垫款",
+    "债权投资",
+    "可供出售金融资产",
+    "其他债权投资",
+    "持有至到期投资",
+    "长期应收款",
+    "长期股权投资",
+    "其他权益工具投资",
+    "其他非流动金融资产",
+    "投资性房地产",
+    "固定资产",
+    "在建工程",
+    "生产性生物资产",
+    "油气资产",
+    "使用权资产",
+    "无形资产",
+    "开发支出",
+    "商誉",
+    "长期待摊费用",
+    "递延所得税资产",
+    "其他非流动资产",
+    "非流动资产合计",
+    "资产总计",
+    "短期借款",
+    "向中央银行借款",
+    "拆入资金",
+    "交易性金融负债",
+    "以公允价值计量且其变动计入当期损益的金融负债",
+    "衍生金融负债",
+    "应付票据",
+    "应付账款",
+    "预收款项",
+    "合同负债",
+    "卖出回购金融资产款",
+    "吸收存款及同业存放",
+    "代理买卖证券款",
+    "代理承销证券款",
+    "应付职工薪酬",
+    "应交税费",
+    "其他应付款",
+    "应付利息",
+    "应付股利",
+    "应付手续费及佣金",
+    "应付分保账款",
+    "持有待售负债",
+    "一年内到期的非流动负债",
+    "其他流动负债",
+    "流动负债合计",
+    "保险合同准备金",
+    "长期借款",
+    "应付债券",
+    "租赁负债",
+    "长期应付款",
+    "长期应付职工薪酬",
+    "预计负债",
+    "递延收益",
+    "递延所得税负债",
+    "其他非流动负债",
+    "非流动负债合计",
+    "负债合计",
+    "股本",
+    "实收资本",
+    "其他权益工具",
+    "资本公积",
+    "库存股",
+    "其他综合收益",
+    "专项储备",
+    "盈余公积",
+    "一般风险准备",
+    "未分配利润",
+    "归属于母公司所有者权益合计",
+    "少数股东权益",
+    "所有者权益合计",
+    "负债和所有者权益总计",
+    "营业总收入",
+    "营业收入",
+    "利息收入",
+    "已赚保费",
+    "手续费及佣金收入",
+    "营业总成本",
+    "营业成本",
+    "利息支出",
+    "手续费及佣金支出",
+    "退保金",
+    "赔付支出净额",
+    "提取保险责任合同准备金净额",
+    "保单红利支出",
+    "分保费用",
+    "税金及附加",
+    "销售费用",
+    "管理费用",
+    "研发费用",
+    "财务费用",
+    "利息费用",
+    "其他收益",
+    "投资收益",
+    "其中：对联营企业和合营企业的投资收益",
+    "以摊余成本计量的金融资产终止确认收益",
+    "汇兑收益",
+    "净敞口套期收益",
+    "公允价值变动收益",
+    "信用减值损失",
+    "资产减值损失",
+    "资产处置收益",
+    "营业利润",
+    "营业外收入",
+    "营业外支出",
+    "利润总额",
+    "所得税费用",
+    "净利润",
+    "按经营持续性分类",
+    "持续经营净利润",
+    "终止经营净利润",
+    "按所有权归属分类",
+    "归属于母公司所有者的净利润",
+    "少数股东损益",
+    "其他综合收益的税后净额",
+    "归属母公司所有者的其他综合收益的税后净额",
+    "不能重分类进损益的其他综合收益",
+    "重新计量设定受益计划变动额",
+    "权益法下不能转损益的其他综合收益",
+    "其他权益工具投资公允价值变动",
+    "企业自身信用风险公允价值变动",
+    "其他",
+    "将重分类进损益的其他综合收益",
+    "权益法下可转损益的其他综合收益",
+    "其他债权投资公允价值变动",
+    "可供出售金融资产公允价值变动损益",
+    "金融资产重分类计入其他综合收益的金额",
+    "持有至到期投资重分类为可供出售金融资产损益",
+    "其他债权投资信用减值准备",
+    "现金流量套期储备",
+    "外币财务报表折算差额",
+    "其他",
+    "归属于少数股东的其他综合收益的税后净额",
+    "综合收益总额",
+    "归属于母公司所有者的综合收益总额",
+    "归属于少数股东的综合收益总额",
+    "基本每股收益",
+    "稀释每股收益",
+    "销售商品、提供劳务收到的现金",
+    "客户存款和同业存放款项净增加额",
+    "向中央银行借款净增加额",
+    "向其他金融机构拆入资金净增加额",
+    "收到原保险合同保费取得的现金",
+    "收到再保业务现金净额",
+    "保户储金及投资款净增加额",
+    "收取利息、手续费及佣金的现金",
+    "拆入资金净增加额",
+    "回购业务资金净增加额",
+    "代理买卖证券收到的现金净额",
+    "收到的税费返还",
+    "收到其他与经营活动有关的现金",
+    "经营活动现金流入小计",
+    "购买商品、接受劳务支付的现金",
+    "客户贷款及垫款净增加额",
+    "存放中央银行和同业款项净增加额",
+    "支付原保险合同赔付款项的现金",
+    "拆出资金净增加额",
+    "支付利息、手续费及佣金的现金",
+    "支付保单红利的现金",
+    "支付给职工以及为职工支付的现金",
+    "支付的各项税费",
+    "支付其他与经营活动有关的现金",
+    "经营活动现金流出小计",
+    "经营活动产生的现金流量净额",
+    "收回投资收到的现金",
+    "取得投资收益收到的现金",
+    "处置固定资产、无形资产和其他长期资产收回的现金净额",
+    "处置子公司及其他营业单位收到的现金净额",
+    "收到其他与投资活动有关的现金",
+    "投资活动现金流入小计",
+    "购建固定资产、无形资产和其他长期资产支付的现金",
+    "投资支付的现金",
+    "质押贷款净增加额",
+    "取得子公司及其他营业单位支付的现金净额",
+    "支付其他与投资活动有关的现金",
+    "投资活动现金流出小计",
+    "投资活动产生的现金流量净额",
+    "吸收投资收到的现金",
+    "子公司吸收少数股东投资收到的现金",
+    "取得借款收到的现金",
+    "收到其他与筹资活动有关的现金",
+    "筹资活动现金流入小计",
+    "偿还债务支付的现金",
+    "分配股利、利润或偿付利息支付的现金",
+    "子公司支付给少数股东的股利、利润",
+    "支付其他与筹资活动有关的现金",
+    "筹资活动现金流出小计",
+    "筹资活动产生的现金流量净额",
+    "汇率变动对现金及现金等价物的影响",
+    "现金及现金等价物净增加额",
+    "期初现金及现金等价物余额",
+    "期末现金及现金等价物余额",
+]
+
+# The financial statements of extract_fin_data: the statement, the pattern of the
+# text read so far ending with its heading, and the pattern of the text ending
+# with the heading of the next statement.
+_FIN_STATEMENT_SECTIONS = [
+    (
+        "合并资产负债表",
+        re.compile("(?:财务报表.{0,15}|1、)(?:合并资产负债表)$"),
+        re.compile("(?:母公司资产负债表)$"),
+    ),
+    (
+        "合并利润表",
+        re.compile("(?:负责人.{0,15}|3、)(?:合并利润表)$"),
+        re.compile("(?:母公司利润表)$"),
+    ),
+    (
+        "合并现金流量表",
+        re.compile("(?:负责人.{0,15}|5、)(?:合并现金流量表)$"),
+        re.compile("(?:母公司现金流量表)$"),
+    ),
+]
+_FIN_STATEMENTS_END_RE = re.compile("(?:负责人.{0,15}|6、)(?:母公司现金流量表)$")
+# The heading patterns are anchored at the end of the text and match a few dozen
+# characters at most, so only the tail of the text read so far is searched.
+_SECTION_TAIL_LENGTH = 64
+
+
+def _section_index(rows, sections, end_re):
+    """Return the row ranges of each section of a report, in a single pass.
+
+    A section starts at the row where the text read so far, the headers and
+    footers excluded, ends with its heading, and stops before the row where the
+    text ends with its stop heading. A section found again gets another range,
+    and the scan stops at the row where the text ends with ``end_re``.
+
+    Returns:
+        Dict[str, List[range]]: the row ranges of each section
+    """
+    ranges = {name: [] for name, _, _ in sections}
+    starts = [None] * len(sections)
+    tail = ""
+    end = len(rows)
+    for index, line_dict in enumerate(rows):
+        try:
+            body = line_dict["type"] not in ["页眉", "页脚"]
+        except Exception:
+            logger.error(line_dict)
+            continue
+        if body:
+            tail = (tail + line_dict["inside"])[-_SECTION_TAIL_LENGTH:]
+        for i, (name, start_re, stop_re) in enumerate(sections):
+            if starts[i] is None and start_re.search(tail):
+                starts[i] = index
+            if starts[i] is not None and body and stop_re.search(tail):
+                ranges[name].append(range(starts[i], index))
+                starts[i] = None
+        if end_re.search(tail):
+            end = index + 1
+            break
+    for (name, _, _), start in zip(sections, starts):
+        if start is not None:
+            ranges[name].append(range(start, end))
+    return ranges
+
+
+# The 项目 of a statement row is normalized once: the half width punctuation and
+# the spaces are translated, then the leading numbering or "加：", "其中："... is
+# stripped, all the prefixes are matched by a single compiled pattern.
+_ITEM_TRANSLATION = str.maketrans({" ": None, "(": "（", ")": "）", ":": "：", "／": "/"})
+_ITEM_PREFIX_RE = re.compile("(?:[一二三四五六七八九十]、|（[一二三四五六七八九十]）|\\d\\.|加：|减：|其中：|（元/股）)")
+_CHINESE_RE = re.compile("[\u4e00-\u9fa5]")
+# The unit caption of a statement, e.g. "单位：元" or "金额单位：人民币万元".
+_STATEMENT_UNIT_RE = re.compile("单位[:：]\\s*(?:人民币)?\\s*(千元|万元|百万元|亿元|元)")
+
+
+def _statement_item(name):
+    """Return the normalized 项目 of a statement row."""
+    name = name.translate(_ITEM_TRANSLATION)
+    prefix = _ITEM_PREFIX_RE.match(name)
+    if prefix:
+        name = name.replace(prefix.group(), "")
+    return name.split("（")[0]
+
+
+def _statement_unit(text):
+    """Return the unit of the values of a statement, 元 if it has no caption."""
+    unit = _STATEMENT_UNIT_RE.search(text)
+    return unit.group(1) if unit else "元"
+
+
+def _fill_statement_answers(answer_dict, data, column):
+    """Fill the empty answers with the ``column`` value of their statement item.
+
+    ``data`` is the header then the rows of the statement, the first row of an
+    item wins and an empty value is "无". The rows are indexed by item once,
+    instead of filtering the statement for each answer key.
+
+    Returns:
+        List[str]: the filled answer keys
+    """
+    header = data[0]
+    if column not in header or "项目" not in header:
+        return []
+    item_index = header.index("项目")
+    value_index = header.index(column)
+    values = {}
+    for row in data[1:]:
+        item, value = row[item_index], row[value_index]
+        values.setdefault("无" if item == "" else item, "无" if value == "" else value)
+    filled = []
+    for key, answer in answer_dict.items():
+        if answer == "" and key in values:
+            answer_dict[key] = values[key]
+            filled.append(key)
+    return filled
+
+
 class FinTableProcessor:
     """FinTableProcessor."""
 
@@ -19,13 +560,21 @@ class FinTableProcessor:
         self.all_data = []
         self.all_table = []
         self.all_title = []
+        # The cells of the table rows by their text.
+        self._table_cells = {}
+        # The indexes of all_title, kept up to date as the titles are added: the
+        # level 1 titles, the entries by id and the level 2 titles of each entry.
+        self._first_titles = set()
+        self._titles_by_id = {}
+        self._second_titles = []
 
     def read_file(self):
         """Read file and store data in self.all_data."""
-        with open(self.txt_path, "r", encoding='utf-8') as file:
-            for line in file:
-                data = eval(line)
-                print(data)
+        with RowFile(self.txt_path) as rows:
+            for data in rows:
+                logger.debug("%s", data)
+                if "cells" in data:
+                    self._table_cells[data["inside"]] = data["cells"]
                 # ignore页眉 and 页脚
                 if data and data["type"] not in ["页眉", "页脚"] and data["inside"] != "":
                     self.all_data.append(data)
@@ -45,12 +594,8 @@ class FinTableProcessor:
                     r"(\d+\.\d+)([\u4e00-\u9fa5]+)", inside_content.strip()
                 )
                 first_num_match = re.match(r"^§(\d+)$", inside_content.strip())
-                # get all level 1 titles
-                title_name = [
-                    dictionary["first_title"]
-                    for dictionary in self.all_title
-                    if "first_title" in dictionary
-                ]
+                # all level 1 titles
+                title_name = self._first_titles
                 if first_level_match:
                     first_title_text = first_level_match.group(2)
                     first_title_num = first_level_match.group(1)
@@ -61,13 +606,7 @@ class FinTableProcessor:
                         int(first_title_num) == 1
                         or int(first_title_num) - int(self.all_title[-1]["id"]) == 1
                     ):
-                        current_entry = {
-                            "id": first_title_num,
-                            "first_title": first_title,
-                            "second_title": [],
-                            "table": [],
-                        }
-                        self.all_title.append(current_entry)
+                        self._add_first_title(first_title_num, first_title)
 
                 elif second_level_match:
                     second_title_name = second_level_match.group(0)
@@ -78,13 +617,9 @@ class FinTableProcessor:
                     ) - 1 < 0:
                         continue
                     else:
-                        titles = [
-                            sub_item["title"]
-                            for sub_item in self.all_title[int(first_title) - 1][
-                                "second_title"
-                            ]
-                        ]
+                        titles = self._second_titles[int(first_title) - 1]
                         if second_title_name not in titles:
+                            titles.add(second_title_name)
                             self.all_title[int(first_title) - 1]["second_title"].append(
                                 {"title": second_title_name, "table": []}
                             )
@@ -101,18 +636,27 @@ class FinTableProcessor:
                             or int(first_num) - int(self.all_title[-1]["id"]) == 1
                         )
                     ):
-                        current_entry = {
-                            "id": first_num,
-                            "first_title": first_title,
-                            "second_title": [],
-                            "table": [],
-                        }
-                        self.all_title.append(current_entry)
+                        self._add_first_title(first_num, first_title)
+
+    def _add_first_title(self, first_title_num, first_title):
+        current_entry = {
+            "id": first_title_num,
+            "first_title": first_title,
+            "second_title": [],
+            "table": [],
+        }
+        self.all_title.append(current_entry)
+        self._first_titles.add(first_title)
+        self._titles_by_id.setdefault(first_title_num, []).append(current_entry)
+        self._second_titles.append(set())
 
     def process_excel_data(self):
         """Process excel data."""
         temp_table = []
         temp_title = None
+        # The last title line since the last table line, the caption of the next
+        # table.
+        caption = None
 
         for i in range(len(self.all_data)):
             data = self.all_data[i]
@@ -121,20 +665,18 @@ class FinTableProcessor:
             if content_type == "excel":
                 temp_table.append(inside_content)
                 if temp_title is None:
-                    for j in range(i - 1, -1, -1):
-                        if self.all_data[j]["type"] == "excel":
-                            break
-                        if self.all_data[j]["type"] == "text":
-                            content = self.all_data[j]["inside"]
-                            if re.match(r"^\d+\.\d+", content) or content.startswith(
-                                "§"
-                            ):
-                                temp_title = content.strip()
-                                break
-            elif content_type == "text" and temp_title is not None:
-                self.all_table.append({"title": temp_title, "table": temp_table})
-                temp_title = None
-                temp_table = []
+                    temp_title = caption
+                caption = None
+            else:
+                if content_type == "text" and (
+                    re.match(r"^\d+\.\d+", inside_content)
+                    or inside_content.startswith("§")
+                ):
+                    caption = inside_content.strip()
+                if content_type == "text" and temp_title is not None:
+                    self.all_table.append({"title": temp_title, "table": temp_table})
+                    temp_title = None
+                    temp_table = []
 
     def process_tables(self):
         """Process table data."""
@@ -151,12 +693,10 @@ class FinTableProcessor:
                         "table_name": text_part,
                         "table_content": table_content,
                     }
-                    # self.all_title
-                    for item in self.all_title:
-                        # if the title is in the title list, add the table to the title
-                        if item["id"] == first_title:
-                            item["table"].append(table_pair)
-                            break
+                    # if the title is in the title list, add the table to the title
+                    items = self._titles_by_id.get(first_title)
+                    if items:
+                        items[0]["table"].append(table_pair)
 
                 elif second_match:
                     for index, char in enumerate(title):
@@ -171,11 +711,8 @@ class FinTableProcessor:
                         "table_name": table_name,
                         "table_content": table_content,
                     }
-                    for item in self.all_title:
-                        if item["id"] == first_title:
-                            item["second_title"][second_title]["table"].append(
-                                table_pair
-                            )
+                    for item in self._titles_by_id.get(first_title, []):
+                        item["second_title"][second_title]["table"].append(table_pair)
             except Exception:
                 # if the title is not in the title list, print an error message
                 print(
@@ -187,94 +724,48 @@ class FinTableProcessor:
 
     def create_excel_files(self, output_folder):
         """Create excel files."""
+        self.save_tables(ExcelTableStore(output_folder), "")
+        self.save_titles(output_folder)
+
+    def save_tables(self, store, report):
+        """Save the tables to a table store, under their level 1 or 2 title.
+
+        A table which can not be stored is logged and skipped.
+
+        Args:
+            store(TableStore): the table store
+            report(str): the report of the tables, e.g. the rows file name
+        """
         for item in self.all_title:
             first_title = item["first_title"]
-            second_title = item["second_title"]
-            folder_path = os.path.join(output_folder, first_title)
-            os.makedirs(folder_path, exist_ok=True)
-            first_title_table_data = item["table"]
-            try:
-                if first_title_table_data != []:
-                    for table_item in first_title_table_data:
-                        table_name = table_item["table_name"]
-                        excel_name = f"{table_name}.xlsx"
-                        excel_path = os.path.join(folder_path, excel_name)
-                        table_content = table_item["table_content"]
-                        table_content = [eval(item) for item in table_content]
-                        # Use the first sublist as column names and
-                        # the remaining sublists as data rows
-
-                        # The number of columns in the first row is
-                        # the maximum number of columns
-                        max_cols = len(table_content[0])
-                        for row in table_content:
-                            # If the number of columns in the current row exceeds
-                            # the maximum number of columns
-                            if len(row) > max_cols:
-                                for i in range(max_cols, len(row)):
-                                    # Merge excess values ​​into the maximum
-                                    # number of columns of the current row
-                                    row[max_cols - 1] += "," + row[i]
-                                del row[max_cols:]
-
-                        # 创建 DataFrame
-                        df = pd.DataFrame(table_content[1:], columns=table_content[0])
-                        df.to_excel(excel_path, index=False)
-                else:
-                    for table_item in second_title:
-                        second_folder_path = os.path.join(
-                            folder_path, table_item["title"]
-                        )
-                        os.makedirs(second_folder_path, exist_ok=True)
-                        for table in table_item["table"]:
-                            table_name = table["table_name"].replace("/", "或")
-                            table_content = table["table_content"]
-                            table_content = [eval(item) for item in table_content]
-                            excel_name = f"{table_name}.xlsx"
-                            excel_path = os.path.join(second_folder_path, excel_name)
-                            # The number of columns in the first row is the maximum
-                            # number of columns
-                            max_cols = len(table_content[0])
-                            for row in table_content:
-                                # If the number of columns in the current row exceeds
-                                # the maximum number of columns
-                                if len(row) > max_cols:
-                                    # Merge excess values ​​into the maximum
-                                    # number of columns of the current row
-                                    for i in range(max_cols, len(row)):
-                                        row[max_cols - 1] += "," + row[i]
-                                    del row[max_cols:]
-                            # create DataFrame
-                            df = pd.DataFrame(
-                                table_content[1:], columns=table_content[0]
-                            )
-                            df.to_excel(excel_path, index=False)
-            except Exception:
-                # match column contains year, month, date.
-                logger.error(
-                    "Error: 文件<{}>中的表格<{}>有误，拆分处理".format(self.txt_path, table_name)
-                )
-                pattern = r"\d{4}年\d{1,2}月\d{1,2}日"
-                # Iterate through the column names of the first row
-                for i, column_name in enumerate(table_content[0]):
-                    # If the column name matches the format containing year,
-                    # month and day
-                    if re.search(pattern, column_name):
-                        # Merge the current column name and the adjacent column
-                        # names on the left and right
-                        table_content[0][i - 1] = " ".join(
-                            [column_name, table_content[0][i - 1]]
-                        )
-                        table_content[0][i + 1] = " ".join(
-                            [column_name, table_content[0][i + 1]]
-                        )
-                        # Delete the current column and adjacent columns to the
-                        # left and right
-                        del table_content[0][i]
-                print(table_content)
-                df = pd.DataFrame(table_content[1:], columns=table_content[0])
-                df.to_excel(excel_path, index=False)
+            if item["table"] != []:
+                tables = [
+                    ((first_title,), table["table_name"], table["table_content"])
+                    for table in item["table"]
+                ]
+            else:
+                tables = [
+                    (
+                        (first_title, table_item["title"]),
+                        table["table_name"].replace("/", "或"),
+                        table["table_content"],
+                    )
+                    for table_item in item["second_title"]
+                    for table in table_item["table"]
+                ]
+            for section, table_name, table_content in tables:
+                try:
+                    store.add_table(
+                        report, section, table_name, self._table_content(table_content)
+                    )
+                except Exception:
+                    logger.exception(
+                        "Error: 文件<{}>中的表格<{}>有误".format(self.txt_path, table_name)
+                    )
 
+    def save_titles(self, output_folder):
+        """Save all_title and all_table to all_data.json and all_table.json."""
+        os.makedirs(output_folder, exist_ok=True)
         all_title_path = os.path.join(output_folder, "all_data.json")
         all_table_path = os.path.join(output_folder, "all_table.json")
         with open(all_table_path, "w", encoding="utf-8") as f:
@@ -282,31 +773,46 @@ class FinTableProcessor:
         with open(all_title_path, "w", encoding="utf-8") as f:
             json.dump(self.all_title, f, ensure_ascii=False, indent=4)
 
+    def _table_content(self, table_content):
+        table_content = [_table_row(item, self._table_cells) for item in table_content]
+        # Use the first sublist as column names and the remaining sublists as
+        # data rows, the number of columns in the first row is the maximum number
+        # of columns
+        max_cols = len(table_content[0])
+        for row in table_content:
+            # If the number of columns in the current row exceeds the maximum
+            # number of columns
+            if len(row) > max_cols:
+                # Merge excess values into the maximum number of columns of the
+                # current row
+                for i in range(max_cols, len(row)):
+                    row[max_cols - 1] += "," + row[i]
+                del row[max_cols:]
+        return table_content
+
 
 class FinTableExtractor:
     """Fin Report Table Extractor."""
 
-    def __init__(self, file_name):
-        """Fin Report Table Extractor."""
+    def __init__(self, file_name, rows=None):
+        """Fin Report Table Extractor.
+
+        Args:
+            file_name(str): the rows file of the report, see RowFile
+            rows(Sequence[Dict], optional): the rows of the report parsed before,
+                shared by the extract methods instead of reading the rows file
+        """
         self.file_name = file_name
+        self._rows = rows
 
-    # extract text between check_re_1-check_re_2
-
-    def cut_all_text(self, check, check_re_1, check_re_2, all_text, line_dict, text):
-        """Cut all text."""
-        if check is False and re.search(check_re_1, all_text):
-            check = True
-        if check and line_dict["type"] not in ["页眉", "页脚"]:
-            if not re.search(check_re_2, all_text):
-                if line_dict["inside"] != "":
-                    text = text + line_dict["inside"] + "\n"
-            else:
-                check = False
-        return text, check
+    def _open_rows(self):
+        if self._rows is not None:
+            return contextlib.nullcontext(self._rows)
+        return RowFile(self.file_name)
 
     def extract_base_col(self):
         """Extract base info col."""
-        allname = self.file_name.split("\\")[-1]
+        allname = _report_file_name(self.file_name)
         date, name, stock, short_name, year, else1 = allname.split("__")
         stock2, short_name2, mail, address1, address2 = "", "", "", "", ""
         chinese_name, chinese_name2, english_name, english_name2, web, boss = (
@@ -334,28 +840,19 @@ class FinTableExtractor:
             "",
             "",
         )
-        with open(self.file_name, "r", encoding="utf-8") as file:
-            lines = file.readlines()
-            for i in range(len(lines)):
-                line = lines[i]
-                line = line.replace("\n", "")
-                line_dict = json.loads(line)
+        with self._open_rows() as rows:
+            for i in range(len(rows)):
+                line_dict = rows[i]
                 try:
                     if line_dict["type"] not in ["页眉", "页脚", "text"]:
                         if stock2 == "" and re.search(
                             "股票代码'|证券代码'", line_dict["inside"]
                         ):
-                            middle = (
-                                line_dict["inside"]
-                                + "\n"
-                                + json.loads(lines[i + 1].replace("\n", ""))["inside"]
-                            )
+                            middle = line_dict["inside"] + "\n" + rows[i + 1]["inside"]
                             stock2_re = re.search("(?:0|6|3)\d{5}", middle)
                             if stock2_re:
                                 stock2 = stock2_re.group()
-                            answer_list = eval(line_dict["inside"]) + eval(
-                                json.loads(lines[i + 1].replace("\n", ""))["inside"]
-                            )
+                            answer_list = line_dict["cells"] + rows[i + 1]["cells"]
                             for _answer in answer_list:
                                 if not re.search(
                                     "代码|股票|简称|交易所|A股|A 股|公司|上交所|科创版|名称",
@@ -375,7 +872,7 @@ class FinTableExtractor:
                             if answer == "" and re.search(
                                 keywords_re, line_dict["inside"]
                             ):
-                                answer_list = eval(line_dict["inside"])
+                                answer_list = line_dict["cells"]
                                 for _answer in answer_list:
                                     keywords_re = keywords_re.replace("'", "")
                                     if check_chinese:
@@ -410,7 +907,7 @@ class FinTableExtractor:
                                 and all_answer != ""
                                 and re.search(keywords_re, line_dict["inside"])
                             ):
-                                answer_list = eval(line_dict["inside"])
+                                answer_list = line_dict["cells"]
                                 for _answer in answer_list:
                                     keywords_re = keywords_re.replace("'", "")
                                     if check_chinese:
@@ -560,7 +1057,6 @@ class FinTableExtractor:
             "博士及以上人员": person25,
             "博士人员": person26,
             "研发人数": person27,
-            "全文": str(lines),
         }
         print("finish " + self.file_name)
         return new_row
@@ -568,319 +1064,39 @@ class FinTableExtractor:
     # 提取指定文本
     def extract_fin_data(self):
         """Extract financial data."""
-        allname = self.file_name.split("\\")[-1]
+        allname = _report_file_name(self.file_name)
         date, name, stock, short_name, year, else1 = allname.split("__")
-        all_text = ""
-        text1, text2, text3, text4, text5 = (
-            "",
-            "",
-            "",
-            "",
-            "",
-        )
-
-        check1, check2, check3, check4, check5 = (
-            False,
-            False,
-            False,
-            False,
-            False,
-        )
+        answer_dict = dict.fromkeys(FIN_DATA_ITEMS, "")
+        answer_units = {}
 
-        answer_dict = {}
-        list2 = [
-            "货币资金",
-            "结算备付金",
-            "拆出资金",
-            "交易性金融资产",
-            "以公允价值计量且其变动计入当期损益的金融资产",
-            "衍生金融资产",
-            "应收票据",
-            "应收账款",
-            "应收款项融资",
-            "预付款项",
-            "应收保费",
-            "应收分保账款",
-            "应收分保合同准备金",
-            "其他应收款",
-            "应收利息",
-            "应收股利",
-            "买入返售金融资产",
-            "存货",
-            "合同资产",
-            "持有待售资产",
-            "一年内到期的非流动资产",
-            "其他流动资产",
-            "流动资产合计",
-            "发放贷款和垫款",
-            "债权投资",
-            "可供出售金融资产",
-            "其他债权投资",
-            "持有至到期投资",
-            "长期应收款",
-            "长期股权投资",
-            "其他权益工具投资",
-            "其他非流动金融资产",
-            "投资性房地产",
-            "固定资产",
-            "在建工程",
-            "生产性生物资产",
-            "油气资产",
-            "使用权资产",
-            "无形资产",
-            "开发支出",
-            "商誉",
-            "长期待摊费用",
-            "递延所得税资产",
-            "其他非流动资产",
-            "非流动资产合计",
-            "资产总计",
-            "短期借款",
-            "向中央银行借款",
-            "拆入资金",
-            "交易性金融负债",
-            "以公允价值计量且其变动计入当期损益的金融负债",
-            "衍生金融负债",
-            "应付票据",
-            "应付账款",
-            "预收款项",
-            "合同负债",
-            "卖出回购金融资产款",
-            "吸收存款及同业存放",
-            "代理买卖证券款",
-            "代理承销证券款",
-            "应付职工薪酬",
-            "应交税费",
-            "其他应付款",
-            "应付利息",
-            "应付股利",
-            "应付手续费及佣金",
-            "应付分保账款",
-            "持有待售负债",
-            "一年内到期的非流动负债",
-            "其他流动负债",
-            "流动负债合计",
-            "保险合同准备金",
-            "长期借款",
-            "应付债券",
-            "租赁负债",
-            "长期应付款",
-            "长期应付职工薪酬",
-            "预计负债",
-            "递延收益",
-            "递延所得税负债",
-            "其他非流动负债",
-            "非流动负债合计",
-            "负债合计",
-            "股本",
-            "实收资本",
-            "其他权益工具",
-            "资本公积",
-            "库存股",
-            "其他综合收益",
-            "专项储备",
-            "盈余公积",
-            "一般风险准备",
-            "未分配利润",
-            "归属于母公司所有者权益合计",
-            "少数股东权益",
-            "所有者权益合计",
-            "负债和所有者权益总计",
-            "营业总收入",
-            "营业收入",
-            "利息收入",
-            "已赚保费",
-            "手续费及佣金收入",
-            "营业总成本",
-            "营业成本",
-            "利息支出",
-            "手续费及佣金支出",
-            "退保金",
-            "赔付支出净额",
-            "提取保险责任合同准备金净额",
-            "保单红利支出",
-            "分保费用",
-            "税金及附加",
-            "销售费用",
-            "管理费用",
-            "研发费用",
-            "财务费用",
-            "利息费用",
-            "其他收益",
-            "投资收益",
-            "其中：对联营企业和合营企业的投资收益",
-            "以摊余成本计量的金融资产终止确认收益",
-            "汇兑收益",
-            "净敞口套期收益",
-            "公允价值变动收益",
-            "信用减值损失",
-            "资产减值损失",
-            "资产处置收益",
-            "营业利润",
-            "营业外收入",
-            "营业外支出",
-            "利润总额",
-            "所得税费用",
-            "净利润",
-            "按经营持续性分类",
-            "持续经营净利润",
-            "终止经营净利润",
-            "按所有权归属分类",
-            "归属于母公司所有者的净利润",
-            "少数股东损益",
-            "其他综合收益的税后净额",
-            "归属母公司所有者的其他综合收益的税后净额",
-            "不能重分类进损益的其他综合收益",
-            "重新计量设定受益计划变动额",
-            "权益法下不能转损益的其他综合收益",
-            "其他权益工具投资公允价值变动",
-            "企业自身信用风险公允价值变动",
-            "其他",
-            "将重分类进损益的其他综合收益",
-            "权益法下可转损益的其他综合收益",
-            "其他债权投资公允价值变动",
-            "可供出售金融资产公允价值变动损益",
-            "金融资产重分类计入其他综合收益的金额",
-            "持有至到期投资重分类为可供出售金融资产损益",
-            "其他债权投资信用减值准备",
-            "现金流量套期储备",
-            "外币财务报表折算差额",
-            "其他",
-            "归属于少数股东的其他综合收益的税后净额",
-            "综合收益总额",
-            "归属于母公司所有者的综合收益总额",
-            "归属于少数股东的综合收益总额",
-            "基本每股收益",
-            "稀释每股收益",
-            "销售商品、提供劳务收到的现金",
-            "客户存款和同业存放款项净增加额",
-            "向中央银行借款净增加额",
-            "向其他金融机构拆入资金净增加额",
-            "收到原保险合同保费取得的现金",
-            "收到再保业务现金净额",
-            "保户储金及投资款净增加额",
-            "收取利息、手续费及佣金的现金",
-            "拆入资金净增加额",
-            "回购业务资金净增加额",
-            "代理买卖证券收到的现金净额",
-            "收到的税费返还",
-            "收到其他与经营活动有关的现金",
-            "经营活动现金流入小计",
-            "购买商品、接受劳务支付的现金",
-            "客户贷款及垫款净增加额",
-            "存放中央银行和同业款项净增加额",
-            "支付原保险合同赔付款项的现金",
-            "拆出资金净增加额",
-            "支付利息、手续费及佣金的现金",
-            "支付保单红利的现金",
-            "支付给职工以及为职工支付的现金",
-            "支付的各项税费",
-            "支付其他与经营活动有关的现金",
-            "经营活动现金流出小计",
-            "经营活动产生的现金流量净额",
-            "收回投资收到的现金",
-            "取得投资收益收到的现金",
-            "处置固定资产、无形资产和其他长期资产收回的现金净额",
-            "处置子公司及其他营业单位收到的现金净额",
-            "收到其他与投资活动有关的现金",
-            "投资活动现金流入小计",
-            "购建固定资产、无形资产和其他长期资产支付的现金",
-            "投资支付的现金",
-            "质押贷款净增加额",
-            "取得子公司及其他营业单位支付的现金净额",
-            "支付其他与投资活动有关的现金",
-            "投资活动现金流出小计",
-            "投资活动产生的现金流量净额",
-            "吸收投资收到的现金",
-            "子公司吸收少数股东投资收到的现金",
-            "取得借款收到的现金",
-            "收到其他与筹资活动有关的现金",
-            "筹资活动现金流入小计",
-            "偿还债务支付的现金",
-            "分配股利、利润或偿付利息支付的现金",
-            "子公司支付给少数股东的股利、利润",
-            "支付其他与筹资活动有关的现金",
-            "筹资活动现金流出小计",
-            "筹资活动产生的现金流量净额",
-            "汇率变动对现金及现金等价物的影响",
-            "现金及现金等价物净增加额",
-            "期初现金及现金等价物余额",
-            "期末现金及现金等价物余额",
-        ]
-        for _l in list2:
-            answer_dict[_l] = ""
-
-        with open(self.file_name, "r", encoding="utf-8") as file:
-            lines = file.readlines()
-            for line in lines:
-                line = line.replace("\n", "")
-                line_dict = json.loads(line)
-                try:
-                    if line_dict["type"] not in ["页眉", "页脚"]:
-                        all_text = all_text + line_dict["inside"]
-
-                    # 合并资产负债表
-                    text1, check1 = self.cut_all_text(
-                        check1,
-                        "(?:财务报表.{0,15}|1、)(?:合并资产负债表)$",
-                        "(?:母公司资产负债表)$",
-                        all_text,
-                        line_dict,
-                        text1,
-                    )
-                    # 母公司资产负债表
-                    text2, check2 = self.cut_all_text(
-                        check2,
-                        "(?:负责人.{0,15}|2、)(?:母公司资产负债表)$",
-                        "(?:合并利润表)$",
-                        all_text,
-                        line_dict,
-                        text2,
-                    )
-                    # 合并利润表
-                    text3, check3 = self.cut_all_text(
-                        check3,
-                        "(?:负责人.{0,15}|3、)(?:合并利润表)$",
-                        "(?:母公司利润表)$",
-                        all_text,
-                        line_dict,
-                        text3,
-                    )
-                    # 母公司利润表
-                    text4, check4 = self.cut_all_text(
-                        check4,
-                        "(?:负责人.{0,15}|4、)(?:母公司利润表)$",
-                        "(?:合并现金流量表)$",
-                        all_text,
-                        line_dict,
-                        text4,
-                    )
-                    # 合并现金流量表
-                    text5, check5 = self.cut_all_text(
-                        check5,
-                        "(?:负责人.{0,15}|5、)(?:合并现金流量表)$",
-                        "(?:母公司现金流量表)$",
-                        all_text,
-                        line_dict,
-                        text5,
-                    )
-                    if re.search("(?:负责人.{0,15}|6、)(?:母公司现金流量表)$", all_text):
-                        break
-
-                except Exception:
-                    print(line_dict)
-                    pass
+        table_cells = {}
+        texts = {}
+        with self._open_rows() as rows:
+            section_index = _section_index(
+                rows, _FIN_STATEMENT_SECTIONS, _FIN_STATEMENTS_END_RE
+            )
+            for section, section_ranges in section_index.items():
+                lines = []
+                for section_range in section_ranges:
+                    for i in section_range:
+                        line_dict = rows[i]
+                        if "cells" in line_dict:
+                            table_cells[line_dict["inside"]] = line_dict["cells"]
+                        if (
+                            line_dict
+                            and line_dict["type"] not in ["页眉", "页脚"]
+                            and line_dict["inside"] != ""
+                        ):
+                            lines.append(line_dict["inside"] + "\n")
+                texts[section] = "".join(lines)
+            text1 = texts["合并资产负债表"]
+            text3 = texts["合并利润表"]
+            text5 = texts["合并现金流量表"]
 
             cut1_len = len(text1.split("合并资产负债表")[0])
-            # cut2_len = len(text2.split("母公司资产负债表")[0])
             cut3_len = len(text3.split("合并利润表")[0])
-            # cut4_len = len(text4.split("母公司利润表")[0])
             cut5_len = len(text5.split("合并现金流量表")[0])
 
-            # cut6_len = len(text6.split('母公司现金流量表')[0])
-            # cut7_len = len(text7.split('合并所有者权益变动表')[0])
-            # cut8_len = len(text8.split('母公司所有者权益变动表')[0])
-
             def check_data(answer_dict, text_check, addwords, stop_re):
                 text_list = text_check.split("\n")
                 data = []
@@ -891,30 +1107,15 @@ class FinTableExtractor:
                         and not re.search("调整数", _t)
                         and check_len == 0
                     ):
-                        check_len = len(eval(_t))
+                        check_len = len(_table_row(_t, table_cells))
                     if re.search("^[\[]", _t):
                         try:
-                            text_l = eval(_t)
-                            text_l[0] = (
-                                text_l[0]
-                                .replace(" ", "")
-                                .replace("(", "（")
-                                .replace(")", "）")
-                                .replace(":", "：")
-                                .replace("／", "/")
-                            )
-                            cut_re = re.match(
-                                "(?:[一二三四五六七八九十]、|（[一二三四五六七八九十]）|\d\.|"
-                                "加：|减：|其中：|（元/股）)",
-                                text_l[0],
-                            )
-                            if cut_re:
-                                text_l[0] = text_l[0].replace(cut_re.group(), "")
-                            text_l[0] = text_l[0].split("（")[0]
+                            text_l = _table_row(_t, table_cells)
+                            text_l[0] = _statement_item(text_l[0])
                             if (
                                 check_len != 0
                                 and check_len == len(text_l)
-                                and re.search("[\u4e00-\u9fa5]", text_l[0])
+                                and _CHINESE_RE.search(text_l[0])
                             ):
                                 data.append(text_l)
                         except Exception:
@@ -924,19 +1125,12 @@ class FinTableExtractor:
 
                 # print(data)
                 if data != []:
-                    df = pd.DataFrame(data[1:], columns=data[0])
-                    df.replace("", "无", inplace=True)
-                    if year + addwords in df.columns and "项目" in df.columns:
-                        df = df.drop_duplicates(subset="项目", keep="first")
-                        for key in answer_dict:
-                            try:
-                                match_answer = df[df["项目"] == key]
-                                if not match_answer.empty and answer_dict[key] == "":
-                                    answer_dict[key] = match_answer[
-                                        year + addwords
-                                    ].values[0]
-                            except Exception:
-                                print(key)
+                    filled = _fill_statement_answers(answer_dict, data, year + addwords)
+                    unit = _statement_unit(text_check)
+                    answer_units.update(
+                        (key, PER_SHARE_UNIT if key in PER_SHARE_COLUMNS else unit)
+                        for key in filled
+                    )
                 return answer_dict
 
             answer_dict = check_data(answer_dict, text1[cut1_len:], "12月31日", "合并资产负债表")
@@ -953,293 +1147,24 @@ class FinTableExtractor:
                 "合并资产负债表": text1[cut1_len:],
                 "合并利润表": text3[cut3_len:],
                 "合并现金流量表": text5[cut5_len:],
-                "全文": str(lines),
             }
             for key in answer_dict:
                 new_row[key] = answer_dict[key]
+            new_row["数值单位"] = json.dumps(answer_units, ensure_ascii=False)
             print("finish " + self.file_name)
             return new_row
 
     # 提取其他列
     def extract_other_col(self):
         """Extract other col."""
-        allname = self.file_name.split("\\")[-1]
+        allname = _report_file_name(self.file_name)
         date, name, stock, short_name, year, else1 = allname.split("__")
-        cut1, cut2, cut3, cut4, cut5, cut6, cut7, cut8, cut9, cut10 = (
-            "",
-            "",
-            "",
-            "",
-            "",
-            "",
-            "",
-            "",
-            "",
-            "",
-        )
-        (
-            check_cut1,
-            check_cut2,
-            check_cut3,
-            check_cut4,
-            check_cut5,
-            check_cut6,
-            check_cut7,
-            check_cut8,
-            check_cut9,
-            check_cut10,
-        ) = (False, False, False, False, False, False, False, False, False, False)
-        cut11, cut12, cut13, cut14, cut15, cut16, cut17, cut18, cut19, cut20 = (
-            "",
-            "",
-            "",
-            "",
-            "",
-            "",
-            "",
-            "",
-            "",
-            "",
-        )
-        (
-            check_cut11,
-            check_cut12,
-            check_cut13,
-            check_cut14,
-            check_cut15,
-            check_cut16,
-            check_cut17,
-            check_cut18,
-            check_cut19,
-            check_cut20,
-        ) = (False, False, False, False, False, False, False, False, False, False)
-        cut21, cut22, cut23, cut24, cut25, cut26, cut27 = (
-            "",
-            "",
-            "",
-            "",
-            "",
-            "",
-            "",
-        )
-        (
-            check_cut21,
-            check_cut22,
-            check_cut23,
-            check_cut24,
-            check_cut25,
-            check_cut26,
-            check_cut27,
-        ) = (False, False, False, False, False, False, False)
-        with open(self.file_name, "r", encoding="utf-8") as file:
-            lines = file.readlines()
-            for i in range(len(lines)):
-                line = lines[i]
-                line = line.replace("\n", "")
-                line_dict = json.loads(line)
-                # print(line_dict)
+        scanner = _SectionScanner(_OTHER_COL_SECTIONS)
+        with self._open_rows() as rows:
+            for line_dict in rows:
                 try:
                     if line_dict["type"] not in ["页眉", "页脚"]:
-
-                        def check_answers(
-                            answer,
-                            keywords_re,
-                            keywords_stop_re,
-                            check_cut,
-                            line_dict=line_dict,
-                        ):
-                            if (
-                                check_cut is False
-                                and answer == ""
-                                and re.search(keywords_re, line_dict["inside"])
-                            ):
-                                check_cut = True
-                                answer = str(line_dict["inside"]).replace("", "")
-                            elif (
-                                re.search(keywords_stop_re, line_dict["inside"])
-                                or len(answer) >= 2000
-                                or len(re.findall("是.否", answer)) >= 2
-                                or len(re.findall("适用.不适用", answer)) >= 2
-                                or len(re.findall("第(?:一|二|三|四|五|六|七|八|九|十)节", answer))
-                                >= 2
-                            ):
-                                check_cut = False
-                            elif check_cut:
-                                answer = (
-                                    answer
-                                    + "\n"
-                                    + str(line_dict["inside"]).replace("", "")
-                                )
-                            return answer, check_cut
-
-                        def check_answers2(
-                            answer,
-                            keywords_re,
-                            keywords_stop_re,
-                            check_cut,
-                            line_dict=line_dict,
-                        ):
-                            if (
-                                check_cut is False
-                                and answer == ""
-                                and re.search(keywords_re, line_dict["inside"])
-                            ):
-                                check_cut = True
-                                answer = str(line_dict["inside"]).replace("", "")
-                            elif (
-                                re.search(keywords_stop_re, line_dict["inside"])
-                                or len(answer) >= 2000
-                                or len(re.findall("第(?:一|二|三|四|五|六|七|八|九|十)节", answer))
-                                >= 2
-                            ):
-                                check_cut = False
-                            elif check_cut:
-                                answer = (
-                                    answer
-                                    + "\n"
-                                    + str(line_dict["inside"]).replace("", "")
-                                )
-                            return answer, check_cut
-
-                        cut1, check_cut1 = check_answers(
-                            cut1,
-                            "(?:\.|、|\)|）)(?:审计意见|保留意见)$",
-                            "(?:形成审计意见的基础|形成保留意见的基础)$",
-                            check_cut1,
-                        )
-                        cut2, check_cut2 = check_answers(
-                            cut2, "(?:关键审计事项)$", "(?:其他信息)$", check_cut2
-                        )
-                        cut3, check_cut3 = check_answers(
-                            cut3,
-                            "主要会计数据和财务指标",
-                            "分季度主要财务指标",
-                            check_cut3,
-                        )
-                        cut4, check_cut4 = check_answers(
-                            cut4,
-                            "公司主要销售客户情况",
-                            "公司主要供应商情况",
-                            check_cut4,
-                        )
-                        cut5, check_cut5 = check_answers(
-                            cut5, "公司主要供应商情况", "研发投入|费用", check_cut5
-                        )
-                        cut6, check_cut6 = check_answers2(
-                            cut6,
-                            "(?:研发投入|近三年公司研发投入金额及占营业收入的比例)$",
-                            "现金流",
-                            check_cut6,
-                        )
-                        cut7, check_cut7 = check_answers(
-                            cut7, "(?:现金流)$", "非主营业务情况", check_cut7
-                        )
-                        cut8, check_cut8 = check_answers(
-                            cut8, "(?:资产及负债状况)$", "投资状况分析", check_cut8
-                        )
-                        cut9, check_cut9 = check_answers(
-                            cut9,
-                            "重大资产和股权出售",
-                            "主要控股参股公司分析",
-                            check_cut9,
-                        )
-                        cut10, check_cut10 = check_answers(
-                            cut10,
-                            "主要控股参股公司分析",
-                            "公司未来发展的展望",
-                            check_cut10,
-                        )
-                        cut11, check_cut11 = check_answers(
-                            cut11,
-                            "公司未来发展的展望",
-                            "接待调研、沟通、采访等活动登记表",
-                            check_cut11,
-                        )
-                        cut12, check_cut12 = check_answers(
-                            cut12,
-                            "与上年度财务报告相比，合并报表范围发生变化的情况说明",
-                            "聘任、解聘会计师事务所情况",
-                            check_cut12,
-                        )
-                        cut13, check_cut13 = check_answers2(
-                            cut13,
-                            "聘任、解聘会计师事务所情况",
-                            "面临(?:暂停上市|终止上市|退市).{0,10}情况",
-                            check_cut13,
-                        )
-                        cut14, check_cut14 = check_answers(
-                            cut14,
-                            "面临(?:暂停上市|终止上市|退市).{0,10}情况",
-                            "破产重整相关事项",
-                            check_cut14,
-                        )
-                        cut15, check_cut15 = check_answers(
-                            cut15, "破产重整相关事项", "重大诉讼、仲裁事项", check_cut15
-                        )
-                        cut16, check_cut16 = check_answers(
-                            cut16, "重大诉讼、仲裁事项", "处罚及整改情况", check_cut16
-                        )
-                        cut17, check_cut17 = check_answers(
-                            cut17,
-                            "处罚及整改情况",
-                            "公司及其控股股东、实际控制人的诚信状况",
-                            check_cut17,
-                        )
-                        cut18, check_cut18 = check_answers(
-                            cut18,
-                            "公司及其控股股东、实际控制人的诚信状况",
-                            "公司股权激励计划、员工持股计划或其他员工激励措施的实施情况",
-                            check_cut18,
-                        )
-                        cut19, check_cut19 = check_answers2(
-                            cut19, "重大关联交易", "重大合同及其履行情况", check_cut19
-                        )
-                        cut20, check_cut20 = check_answers2(
-                            cut20,
-                            "重大合同及其履行情况",
-                            "其他重大事项的说明",
-                            check_cut20,
-                        )
-                        cut21, check_cut21 = check_answers(
-                            cut21,
-                            "重大环保问题|环境保护相关的情况",
-                            "社会责任情况|重要事项|股份变动情况|其他重大事项的说明",
-                            check_cut21,
-                        )
-                        cut22, check_cut22 = check_answers(
-                            cut22,
-                            "社会责任情况",
-                            "重要事项|股份变动情况|其他重大事项的说明",
-                            check_cut22,
-                        )
-                        cut23, check_cut23 = check_answers(
-                            cut23,
-                            "公司董事、监事、高级管理人员变动情况",
-                            "任职情况",
-                            check_cut23,
-                        )
-                        cut24, check_cut24 = check_answers2(
-                            cut24, "公司员工情况", "培训计划", check_cut24
-                        )
-                        cut25, check_cut25 = check_answers(
-                            cut25,
-                            "对会计师事务所本报告期“非标准审计报告”的说明",
-                            "董事会对该事项的意见|独立董事意见|监事会意见|消除有关事项及其影响的" "具体措施",
-                            check_cut25,
-                        )
-                        cut26, check_cut26 = check_answers(
-                            cut26,
-                            "公司控股股东情况",
-                            "同业竞争情况|重大事项",
-                            check_cut26,
-                        )
-                        cut27, check_cut27 = check_answers(
-                            cut27,
-                            "(?:\.|、|\)|）)(?:审计报告)$",
-                            "审计报告正文|(?:\.|、|\)|）)(?:审计意见|保留意见)$",
-                            check_cut27,
-                        )
-
+                        scanner.feed(line_dict["inside"])
                 except Exception:
                     logger.error(line_dict)
         new_row = {
@@ -1250,34 +1175,16 @@ class FinTableExtractor:
             "股票简称": short_name,
             "年份": year,
             "类型": "年度报告",
-            "审计意见": cut1,
-            "关键审计事项": cut2,
-            "主要会计数据和财务指标": cut3,
-            "主要销售客户": cut4,
-            "主要供应商": cut5,
-            "研发投入": cut6,
-            "现金流": cut7,
-            "资产及负债状况": cut8,
-            "重大资产和股权出售": cut9,
-            "主要控股参股公司分析": cut10,
-            "公司未来发展的展望": cut11,
-            "合并报表范围发生变化的情况说明": cut12,
-            "聘任、解聘会计师事务所情况": cut13,
-            "面临退市情况": cut14,
-            "破产重整相关事项": cut15,
-            "重大诉讼、仲裁事项": cut16,
-            "处罚及整改情况": cut17,
-            "公司及其控股股东、实际控制人的诚信状况": cut18,
-            "重大关联交易": cut19,
-            "重大合同及其履行情况": cut20,
-            "重大环保问题": cut21,
-            "社会责任情况": cut22,
-            "公司董事、监事、高级管理人员变动情况": cut23,
-            "公司员工情况": cut24,
-            "非标准审计报告的说明": cut25,
-            "公司控股股东情况": cut26,
-            "审计报告": cut27,
-            "全文": str(lines),
         }
+        new_row.update(scanner.sections())
         print("finished " + self.file_name)
         return new_row
+
+
+def extract_table_columns(file_name, method):
+    """Run a FinTableExtractor extract method, e.g. in a worker process.
+
+    The worker maps the rows file of the report, so the rows are not copied to
+    the worker.
+    """
+    return getattr(FinTableExtractor(file_name), method)()
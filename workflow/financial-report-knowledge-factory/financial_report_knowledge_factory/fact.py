@@ -0,0 +1,83 @@
+"""The ``fin_report_fact`` table, the numeric values of the reports in long format.
+
+``fin_report`` has a wide row of hundreds of columns per report, a comparison of
+an item across companies and years reads a single narrow row per report in the
+fact table instead, through its ``(项目, 年份, 数值)`` index.
+"""
+
+import logging
+import os
+import sqlite3
+from typing import List
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+FACT_TABLE = "fin_report_fact"
+
+
+def save_facts(path: str, df: pd.DataFrame, columns: List[str]):
+    """Save the numeric values of the reports, replacing their former values.
+
+    The ``fin_report_fact`` table has one ``(股票代码, 公司名称, 年份, 项目, 数值)``
+    row per report and numeric column which is not NULL, keyed by
+    ``(股票代码, 年份, 项目)``. The reports without a stock code or a year are
+    skipped, they would replace the facts of each other.
+
+    Args:
+        path(str): the SQLite database of the ``fin_report`` table
+        df(pd.DataFrame): the reports, with the REAL numeric columns
+        columns(List[str]): the numeric columns, the missing ones are skipped
+    """
+    columns = [column for column in dict.fromkeys(columns) if column in df.columns]
+    keys = []
+    records = []
+    skipped = 0
+    for i in range(len(df)):
+        row = df.iloc[i]
+        stock_code = row.get("股票代码_x")
+        year = row.get("年份_x")
+        if any(pd.isna(value) or value == "" for value in (stock_code, year)):
+            skipped += 1
+            continue
+        keys.append((stock_code, year))
+        records.extend(
+            (stock_code, row.get("公司名称_x"), year, column, float(row[column]))
+            for column in columns
+            if pd.notna(row[column])
+        )
+    if skipped:
+        logger.warning(
+            f"skip the facts of {skipped} reports without stock code or year"
+        )
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path)
+    try:
+        with conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {FACT_TABLE} ("
+                "股票代码 TEXT NOT NULL, 公司名称 TEXT, 年份 TEXT NOT NULL, "
+                "项目 TEXT NOT NULL, 数值 REAL NOT NULL, "
+                "PRIMARY KEY (股票代码, 年份, 项目)) WITHOUT ROWID"
+            )
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{FACT_TABLE}_item "
+                f"ON {FACT_TABLE} (项目, 年份, 数值)"
+            )
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{FACT_TABLE}_company "
+                f"ON {FACT_TABLE} (公司名称, 年份, 项目)"
+            )
+            conn.executemany(
+                f"DELETE FROM {FACT_TABLE} WHERE 股票代码 = ? AND 年份 = ?",
+                list(dict.fromkeys(keys)),
+            )
+            conn.executemany(
+                f"INSERT OR REPLACE INTO {FACT_TABLE} VALUES (?, ?, ?, ?, ?)", records
+            )
+    finally:
+        conn.close()
+    logger.info(f"save {len(records)} facts of {len(keys)} reports to {path}")
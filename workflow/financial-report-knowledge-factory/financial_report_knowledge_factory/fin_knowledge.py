@@ -1,11 +1,13 @@
 """FinReport Knowledge."""
 
-import json
+import bisect
 import logging
 import os
 import re
-from collections import defaultdict
-from typing import Any, Dict, List, Optional, Union
+from collections import Counter, deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from contextlib import nullcontext
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 
 from dbgpt.core import Document
 from dbgpt.rag.knowledge.base import (
@@ -15,6 +17,10 @@ from dbgpt.rag.knowledge.base import (
     KnowledgeType,
 )
 
+from .cache import ExtractionCache
+from .row_file import write_row_file
+from .row_store import RowStore
+
 logger = logging.getLogger(__name__)
 
 
@@ -29,6 +35,12 @@ class FinReportKnowledge(Knowledge):
         language: Optional[str] = "zh",
         metadata: Optional[Dict[str, Union[str, List[str]]]] = None,
         tmp_dir_path: str = "./tmp",
+        parallel: bool = False,
+        max_workers: Optional[int] = None,
+        max_in_flight_pages: Optional[int] = None,
+        executor: Optional[Executor] = None,
+        cache: Optional[ExtractionCache] = None,
+        min_table_edges: int = 2,
         **kwargs: Any,
     ) -> None:
         """Create FinReport Knowledge with Knowledge arguments.
@@ -38,6 +50,17 @@ class FinReportKnowledge(Knowledge):
             knowledge_type(KnowledgeType, optional): knowledge type
             loader(Any, optional): loader
             language(str, optional): language
+            parallel(bool, optional): extract pdf pages in a process pool
+            max_workers(int, optional): process pool size for parallel extraction
+            max_in_flight_pages(int, optional): max pages extracted ahead of the
+                consumer in parallel extraction
+            executor(Executor, optional): process pool of the parallel extraction,
+                shared with other tasks, a pool of ``max_workers`` is created for
+                the pdf by default
+            cache(ExtractionCache, optional): cache of the parsed rows, keyed by
+                the pdf content and ``min_table_edges``
+            min_table_edges(int, optional): min horizontal and vertical edges of a
+                page to run the table detection on it, 0 to always run it
         """
         super().__init__(
             path=file_path,
@@ -47,7 +70,9 @@ class FinReportKnowledge(Knowledge):
             **kwargs,
         )
         self.filepath = file_path
-        self._report_processor = PDFProcessor(self.filepath)
+        self._report_processor = PDFProcessor(
+            self.filepath, min_table_edges=min_table_edges
+        )
         self._tmp_dir_path = tmp_dir_path
         self._tmp_txt_path = os.path.join(
             tmp_dir_path + "/txt",
@@ -57,25 +82,119 @@ class FinReportKnowledge(Knowledge):
         self.allrow = 0
         self.last_num = 0
         self._language = language
+        self._parallel = parallel
+        self._max_workers = max_workers
+        self._max_in_flight_pages = max_in_flight_pages
+        self._executor = executor
+        self._cache = cache
+        self._min_table_edges = min_table_edges
+        self.cache_key: Optional[str] = None
+        self._file_title = os.path.basename(file_path).replace(  # type: ignore
+            ".pdf", ""
+        )
 
     def _load(self) -> List[Document]:
         """Load pdf document from loader."""
         if self._loader:
             documents = self._loader.load()
         else:
-            self._report_processor.process_pdf()
-            documents = [
-                Document(content=item[1]["inside"], metadata=item[1])
-                for item in list(self._report_processor.all_text.items())
-            ]
+            documents = []
+            for _, rows in self._iter_pages():
+                documents.extend(
+                    Document(content=row["inside"], metadata=_row_metadata(row))
+                    for row in rows
+                )
             return documents
         return [Document.langchain2doc(lc_document) for lc_document in documents]
 
+    def parse(self):
+        """Parse the pdf into ``all_text``, without building the Documents.
+
+        The pages are extracted one by one as in ``iter_page_documents``, or the
+        rows are loaded from the extraction cache.
+        """
+        for _ in self._iter_pages():
+            pass
+
+    def iter_page_documents(self) -> Iterator[Document]:
+        """Yield one Document per pdf page.
+
+        The pdf is parsed lazily, each page Document is yielded as soon as the
+        page is extracted. If the knowledge is already loaded, the parsed rows
+        are reused.
+        """
+        if self.all_text:
+            for page, start, end in self.all_text.page_ranges():
+                yield self._page_document(page, self.all_text.texts(start, end))
+            return
+        for page, rows in self._iter_pages():
+            yield self._page_document(page, [row["inside"] for row in rows])
+
+    def _page_document(self, page: int, texts: List[str]) -> Document:
+        return Document(
+            content=" ".join(texts),
+            metadata={"page": page, "title": self._file_title},
+        )
+
+    def load_cached_rows(self) -> bool:
+        """Load the rows of the pdf from the extraction cache.
+
+        Returns:
+            bool: False if there is no cache or the pdf is not in it
+        """
+        if not self._cache:
+            return False
+        self.cache_key = self._content_key()
+        rows = self._cache.get(self.cache_key, "all_text")
+        if rows is None:
+            return False
+        logger.info(f"{self.filepath} hit extraction cache {self.cache_key}")
+        self._report_processor.load_rows(rows)
+        return True
+
+    def load_rows(self, rows: List[Dict]):
+        """Load the rows parsed in another process, see ``parse_report_rows``.
+
+        The rows are put in the extraction cache, as if the pdf was parsed here.
+        """
+        self._report_processor.load_rows(rows)
+        if self._cache:
+            self.cache_key = self._content_key()
+            self._cache.put(self.cache_key, "all_text", rows)
+
+    def _content_key(self) -> str:
+        # The rows depend on the table prefilter too, see PDFProcessor.
+        content_key = self._cache.content_key(self.filepath)  # type: ignore
+        return f"{content_key}-e{self._min_table_edges}"
+
+    def _iter_pages(self) -> Iterator[Tuple[int, List[Dict]]]:
+        if self.load_cached_rows():
+            for page, start, end in self.all_text.page_ranges():
+                yield page, self.all_text.rows(start, end)
+            return
+        yield from self._report_processor.iter_pages(
+            parallel=self._parallel,
+            max_workers=self._max_workers,
+            max_in_flight_pages=self._max_in_flight_pages,
+            executor=self._executor,
+        )
+        if self._cache:
+            self._cache.put(
+                self.cache_key,
+                "all_text",
+                [dict(row) for row in self.all_text.values()],
+            )
+
     @property
     def all_text(self):
         """Get all text from pdf."""
         return self._report_processor.all_text
 
+    @property
+    def table_stats(self) -> Counter:
+        """Get the table detection counters of the pages, see PDFProcessor."""
+        return self._report_processor.table_stats
+
     @classmethod
     def support_chunk_strategy(cls) -> List[ChunkStrategy]:
         """Return support chunk strategy."""
@@ -99,69 +218,125 @@ class FinReportKnowledge(Knowledge):
         return DocumentType.PDF
 
 
+_LINE_END_RE = re.compile(
+    r"(?:。|；|单位：人民币元|金额单位：人民币元|单位：万元|币种：人民币|\d|" r"报告(?:全文)?(?:（修订版）|（修订稿）|（更正后）)?)$"
+)
+# Longer than the longest match of _LINE_END_RE plus a trailing newline.
+_LINE_END_TAIL_SIZE = 32
+# Default cap of pages extracted ahead of the merge in parallel mode.
+_IN_FLIGHT_PAGES_PER_WORKER = 8
+# A (type, content) row of a page, the content of an "excel" row is its cells.
+_PageRow = Tuple[str, Union[str, List[str]]]
+
+
+class _PageWords:
+    """Words of a page, extracted once and indexed by ``top``."""
+
+    __slots__ = ("page", "words", "_sorted_tops", "_sorted_indexes")
+
+    def __init__(self, page):
+        self.page = page
+        self.words = page.extract_words()
+        self._sorted_indexes = sorted(
+            range(len(self.words)), key=lambda i: self.words[i]["top"]
+        )
+        self._sorted_tops = [self.words[i]["top"] for i in self._sorted_indexes]
+
+    def between(self, buttom, top=None) -> List[int]:
+        """Return the indexes of the words whose top is between buttom and top.
+
+        Both bounds are exclusive, the indexes are returned in extraction order.
+        """
+        start = bisect.bisect_right(self._sorted_tops, buttom)
+        if top is None:
+            end = len(self._sorted_tops)
+        else:
+            end = bisect.bisect_left(self._sorted_tops, top, lo=start)
+        return sorted(self._sorted_indexes[start:end])
+
+
 class PDFProcessor:
     """PDFProcessor class.
 
     Reference: https://github.com/MetaGLM/FinGLM
     """
 
-    def __init__(self, filepath):
-        """Initialize PDFProcessor class."""
+    def __init__(self, filepath, min_table_edges: int = 2):
+        """Initialize PDFProcessor class.
+
+        Args:
+            filepath(str): pdf file path
+            min_table_edges(int): min horizontal and vertical edges of a page to
+                run the table detection on it. A table cell needs two of both, so
+                the default 2 never skips a table, a larger value skips more pages
+                with only a few ruling lines. 0 always runs the table detection.
+        """
         self.filepath = filepath
+        self.min_table_edges = min_table_edges
+        # Pages whose table detection is skipped by the prefilter, pages with
+        # tables detected, and pages checked but without any table.
+        self.table_stats: Counter = Counter(skipped=0, detected=0, no_table=0)
         try:
             import pdfplumber  # type: ignore
         except ImportError:
             raise ImportError("Please install pdfplumber first.")
         self.pdf = pdfplumber.open(filepath)
-        self.all_text = defaultdict(dict)
+        self.all_text = RowStore()
         self.allrow = 0
         self.last_num = 0
+        self._page_words: Optional[_PageWords] = None
 
     def check_lines(self, page, top, buttom):
-        """Check lines."""
-        lines = page.extract_words()[::]
-        text = ""
-        last_top = 0
-        last_check = 0
-        for line in range(len(lines)):
-            each_line = lines[line]
-            check_re = (
-                "(?:。|；|单位：人民币元|金额单位：人民币元|单位：万元|币种：人民币|\d|"
-                "报告(?:全文)?(?:（修订版）|（修订稿）|（更正后）)?)$"
-            )
-            if top == "" and buttom == "":
-                if abs(last_top - each_line["top"]) <= 2 or (
-                    last_check > 0
-                    and (page.height * 0.9 - each_line["top"]) > 0
-                    and not re.search(check_re, text)
-                ):
-                    text = text + each_line["text"]
-                else:
-                    text = text + "\n" + each_line["text"]
-            elif top == "":
-                if each_line["top"] > buttom:
-                    if abs(last_top - each_line["top"]) <= 2 or (
-                        last_check > 0
-                        and (page.height * 0.85 - each_line["top"]) > 0
-                        and not re.search(check_re, text)
-                    ):
-                        text = text + each_line["text"]
-                    else:
-                        text = text + "\n" + each_line["text"]
+        """Check lines.
+
+        Join the words of the page between ``buttom`` and ``top`` into lines. An
+        empty ``top`` means up to the end of the page, an empty ``top`` and
+        ``buttom`` means the whole page.
+        """
+        page_words = self._get_page_words(page)
+        words = page_words.words
+        if top == "" and buttom == "":
+            indexes = range(len(words))
+            height_ratio = 0.9
+        elif top == "":
+            indexes = page_words.between(buttom, None)
+            height_ratio = 0.85
+        else:
+            indexes = page_words.between(buttom, top)
+            height_ratio = 0.85
+
+        pieces = []
+        # The line end pattern is anchored at the end of the text, so only the
+        # tail of the text has to be searched.
+        tail = ""
+        for index in indexes:
+            each_line = words[index]
+            # The line state always comes from the previous word of the page,
+            # even when that word is outside of the range.
+            if index > 0:
+                last_top = words[index - 1]["top"]
+                last_check = words[index - 1]["x1"] - page.width * 0.85
+            else:
+                last_top = 0
+                last_check = 0
+            if abs(last_top - each_line["top"]) <= 2 or (
+                last_check > 0
+                and (page.height * height_ratio - each_line["top"]) > 0
+                and not _LINE_END_RE.search(tail)
+            ):
+                piece = each_line["text"]
             else:
-                if each_line["top"] < top and each_line["top"] > buttom:
-                    if abs(last_top - each_line["top"]) <= 2 or (
-                        last_check > 0
-                        and (page.height * 0.85 - each_line["top"]) > 0
-                        and not re.search(check_re, text)
-                    ):
-                        text = text + each_line["text"]
-                    else:
-                        text = text + "\n" + each_line["text"]
-            last_top = each_line["top"]
-            last_check = each_line["x1"] - page.width * 0.85
-
-        return text
+                piece = "\n" + each_line["text"]
+            pieces.append(piece)
+            tail = (tail + piece)[-_LINE_END_TAIL_SIZE:]
+
+        return "".join(pieces)
+
+    def _get_page_words(self, page) -> "_PageWords":
+        """Get the words of the page, extracted only once per page."""
+        if self._page_words is None or self._page_words.page is not page:
+            self._page_words = _PageWords(page)
+        return self._page_words
 
     def drop_empty_cols(self, data):
         """Delete empty column."""
@@ -174,8 +349,18 @@ class PDFProcessor:
 
     def extract_text_and_tables(self, page):
         """Extract text and tables."""
+        self._append_page_rows(page.page_number, self._extract_page_rows(page))
+
+    def _extract_page_rows(self, page) -> List[_PageRow]:
+        """Extract the (type, content) rows of a single page.
+
+        The content of a text row is its text, the content of an "excel" row is
+        the list of its cells. This does not touch ``all_text``, so it can run in
+        a worker process.
+        """
+        rows = []
         buttom = 0
-        tables = page.find_tables()
+        tables = self._find_tables(page)
         if len(tables) >= 1:
             count = len(tables)
             for table in tables:
@@ -189,13 +374,7 @@ class PDFProcessor:
                     text = self.check_lines(page, top, buttom)
                     text_list = text.split("\n")
                     for _t in range(len(text_list)):
-                        self.all_text[self.allrow] = {
-                            "page": page.page_number,
-                            "allrow": self.allrow,
-                            "type": "text",
-                            "inside": text_list[_t],
-                        }
-                        self.allrow += 1
+                        rows.append(("text", text_list[_t]))
 
                     # process table
                     buttom = table.bbox[3]
@@ -262,37 +441,57 @@ class PDFProcessor:
                                 end_table[i][j] = end_table[i][j - 1]
 
                     for row in end_table:
-                        self.all_text[self.allrow] = {
-                            "page": page.page_number,
-                            "allrow": self.allrow,
-                            "type": "excel",
-                            "inside": str(row),
-                        }
-                        self.allrow += 1
+                        rows.append(("excel", row))
 
                     if count == 0:
                         text = self.check_lines(page, "", buttom)
                         text_list = text.split("\n")
                         for _t in range(len(text_list)):
-                            self.all_text[self.allrow] = {
-                                "page": page.page_number,
-                                "allrow": self.allrow,
-                                "type": "text",
-                                "inside": text_list[_t],
-                            }
-                            self.allrow += 1
+                            rows.append(("text", text_list[_t]))
 
         else:
             text = self.check_lines(page, "", "")
             text_list = text.split("\n")
             for _t in range(len(text_list)):
-                self.all_text[self.allrow] = {
-                    "page": page.page_number,
-                    "allrow": self.allrow,
-                    "type": "text",
-                    "inside": text_list[_t],
-                }
-                self.allrow += 1
+                rows.append(("text", text_list[_t]))
+        self._page_words = None
+        return rows
+
+    def _find_tables(self, page) -> List[Any]:
+        """Find the tables of the page, unless the page can't have any.
+
+        ``find_tables`` builds the table cells from the ruling lines of the page,
+        so a page without enough horizontal and vertical edges goes straight to
+        the text only path.
+        """
+        if self.min_table_edges > 0:
+            horizontal = vertical = 0
+            for edge in page.edges:
+                if edge["orientation"] == "h":
+                    horizontal += 1
+                else:
+                    vertical += 1
+            if min(horizontal, vertical) < self.min_table_edges:
+                self.table_stats["skipped"] += 1
+                return []
+        tables = page.find_tables()
+        self.table_stats["detected" if tables else "no_table"] += 1
+        return tables
+
+    def _append_page_rows(self, page_number: int, rows: List[_PageRow]):
+        """Append the rows of a page to all_text and mark its header/footer.
+
+        Pages must be appended in page order, the header/footer detection relies
+        on ``last_num`` carried over from the previous page.
+        """
+        for row_type, content in rows:
+            if row_type == "excel":
+                # The text of a table row stays its list repr, the extractors
+                # search it, the cells are kept to not parse it back.
+                self.all_text.append(page_number, row_type, str(content), content)
+            else:
+                self.all_text.append(page_number, row_type, content)
+            self.allrow += 1
 
         first_re = "[^计](?:报告(?:全文)?(?:（修订版）|（修订稿）|（更正后）)?)$"
         end_re = "^(?:\d|\\|\/|第|共|页|-|_| ){1,}"
@@ -305,7 +504,9 @@ class PDFProcessor:
                     if re.search(end_re, end_text) and "[" not in end_text:
                         self.all_text[len(self.all_text) - 1]["type"] = "页脚"
             except Exception:
-                print(page.page_number)
+                logger.exception(
+                    f"{self.filepath} page {page_number} header/footer marking failed"
+                )
         else:
             try:
                 first_text = str(self.all_text[self.last_num + 2]["inside"])
@@ -315,21 +516,191 @@ class PDFProcessor:
                 if re.search(end_re, end_text) and "[" not in end_text:
                     self.all_text[len(self.all_text) - 1]["type"] = "页脚"
             except Exception:
-                print(page.page_number)
+                logger.exception(
+                    f"{self.filepath} page {page_number} header/footer marking failed"
+                )
 
         self.last_num = len(self.all_text) - 1
 
-    def process_pdf(self):
-        """Process pdf."""
-        for i in range(len(self.pdf.pages)):
-            self.extract_text_and_tables(self.pdf.pages[i])
-            logger.info(f"{self.filepath} page {i} extract text success")
+    def process_pdf(
+        self,
+        parallel: bool = False,
+        max_workers: Optional[int] = None,
+        max_in_flight_pages: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ):
+        """Process pdf.
+
+        Args:
+            parallel(bool): extract page ranges in a process pool, the rows are
+                merged back in page order so the result is the same as the
+                sequential path.
+            max_workers(int, optional): process pool size, default cpu count
+            max_in_flight_pages(int, optional): max pages extracted but not merged
+                yet in parallel mode
+            executor(Executor, optional): shared process pool, instead of a pool
+                of ``max_workers`` for the pdf
+        """
+        for _ in self.iter_pages(
+            parallel=parallel,
+            max_workers=max_workers,
+            max_in_flight_pages=max_in_flight_pages,
+            executor=executor,
+        ):
+            pass
+
+    def iter_pages(
+        self,
+        parallel: bool = False,
+        max_workers: Optional[int] = None,
+        max_in_flight_pages: Optional[int] = None,
+        executor: Optional[Executor] = None,
+    ) -> Iterator[Tuple[int, List[Dict]]]:
+        """Extract the pdf page by page and yield the rows of each page.
+
+        The pdfplumber caches of a page are released right after its extraction,
+        and at most ``max_in_flight_pages`` pages are extracted ahead of the
+        consumer, so the memory does not grow with the page count. The pages are
+        extracted in ``executor`` if given, e.g. a process pool shared by the
+        ingests, else in a pool of ``max_workers`` created for the pdf.
+
+        Yields:
+            Tuple[int, List[Dict]]: page number and the rows of the page
+        """
+        if not parallel:
+            for i in range(len(self.pdf.pages)):
+                page = self.pdf.pages[i]
+                rows = self._extract_page_rows(page)
+                page.close()
+                yield self._merge_page_rows(page.page_number, rows)
+                logger.info(f"{self.filepath} page {i} extract text success")
+            logger.info(f"{self.filepath} table detection: {dict(self.table_stats)}")
+            return
+
+        max_workers = max_workers or os.cpu_count() or 1
+        max_in_flight_pages = max(
+            max_in_flight_pages or max_workers * _IN_FLIGHT_PAGES_PER_WORKER, 1
+        )
+        page_ranges = _split_page_ranges(
+            len(self.pdf.pages),
+            max_workers,
+            max_shard_size=max(max_in_flight_pages // max_workers, 1),
+        )
+        in_flight = deque()
+        in_flight_pages = 0
+        pool = (
+            nullcontext(executor)
+            if executor is not None
+            else ProcessPoolExecutor(max_workers=max_workers)
+        )
+        with pool as executor:
+            for start, end in page_ranges:
+                while in_flight and in_flight_pages + end - start > max_in_flight_pages:
+                    future, page_count = in_flight.popleft()
+                    in_flight_pages -= page_count
+                    yield from self._merge_page_range(future.result())
+                future = executor.submit(
+                    _extract_page_range,
+                    self.filepath,
+                    start,
+                    end,
+                    self.min_table_edges,
+                )
+                in_flight.append((future, end - start))
+                in_flight_pages += end - start
+            # Header/footer marking depends on the previous page, so merge the
+            # shards strictly in page order.
+            while in_flight:
+                future, _ = in_flight.popleft()
+                yield from self._merge_page_range(future.result())
+        logger.info(f"{self.filepath} table detection: {dict(self.table_stats)}")
+
+    def _merge_page_range(
+        self,
+        page_range_result: Tuple[List[Tuple[int, List[_PageRow]]], Dict],
+    ) -> Iterator[Tuple[int, List[Dict]]]:
+        page_range_rows, table_stats = page_range_result
+        self.table_stats.update(table_stats)
+        for page_number, rows in page_range_rows:
+            yield self._merge_page_rows(page_number, rows)
+            logger.info(f"{self.filepath} page {page_number - 1} extract text success")
+
+    def _merge_page_rows(
+        self, page_number: int, rows: List[_PageRow]
+    ) -> Tuple[int, List[Dict]]:
+        start = self.allrow
+        self._append_page_rows(page_number, rows)
+        return page_number, self.all_text.rows(start, self.allrow)
+
+    def load_rows(self, rows: List[Dict]):
+        """Load rows extracted before, e.g. from the extraction cache."""
+        self.all_text.clear()
+        for row in rows:
+            self.all_text.append_row(row)
+        self.allrow = len(rows)
+        self.last_num = len(rows) - 1
 
     def save_all_text(self, path):
-        """Save all text."""
-        directory = os.path.dirname(path)
-        if not os.path.exists(directory):
-            os.makedirs(directory)
-        for key in self.all_text.keys():
-            with open(path, "a+", encoding="utf-8") as file:
-                file.write(json.dumps(self.all_text[key], ensure_ascii=False) + "\n")
+        """Save all text to a row file, see RowFile."""
+        write_row_file(path, self.all_text.values())
+
+
+def _row_metadata(row) -> Dict[str, Any]:
+    """Return the row as Document metadata, without the table cells."""
+    metadata = row.to_dict()
+    metadata.pop("cells", None)
+    return metadata
+
+
+def _split_page_ranges(
+    page_count: int,
+    max_workers: int,
+    shards_per_worker: int = 4,
+    max_shard_size: Optional[int] = None,
+) -> List[Tuple[int, int]]:
+    """Split pages into contiguous [start, end) ranges for the process pool.
+
+    A few shards per worker keeps the pool busy when some pages are much slower
+    than others (e.g. financial statement pages with many tables).
+    """
+    shard_count = max(1, min(page_count, max_workers * shards_per_worker))
+    if max_shard_size:
+        shard_count = max(shard_count, -(-page_count // max_shard_size))
+    shard_size, remainder = divmod(page_count, shard_count)
+    page_ranges = []
+    start = 0
+    for i in range(shard_count):
+        end = start + shard_size + (1 if i < remainder else 0)
+        if end > start:
+            page_ranges.append((start, end))
+        start = end
+    return page_ranges
+
+
+def parse_report_rows(filepath: str, min_table_edges: int = 2) -> List[Dict]:
+    """Parse all the pages of a pdf in a worker process, see ``load_rows``."""
+    processor = PDFProcessor(filepath, min_table_edges=min_table_edges)
+    try:
+        processor.process_pdf()
+        return [dict(row) for row in processor.all_text.values()]
+    finally:
+        processor.pdf.close()
+
+
+def _extract_page_range(
+    filepath: str, start: int, end: int, min_table_edges: int = 2
+) -> Tuple[List[Tuple[int, List[_PageRow]]], Dict]:
+    """Extract rows of pages [start, end) in a worker process.
+
+    Return the rows of each page and the table detection counters of the range.
+    """
+    processor = PDFProcessor(filepath, min_table_edges=min_table_edges)
+    try:
+        results = []
+        for i in range(start, end):
+            page = processor.pdf.pages[i]
+            results.append((page.page_number, processor._extract_page_rows(page)))
+            page.close()
+        return results, dict(processor.table_stats)
+    finally:
+        processor.pdf.close()
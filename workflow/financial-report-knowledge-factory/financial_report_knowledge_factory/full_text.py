@@ -0,0 +1,82 @@
+"""SQLite FTS5 full text index of the financial reports."""
+
+import logging
+import os
+import sqlite3
+from typing import Dict, List
+
+logger = logging.getLogger(__name__)
+
+# The table and the database path are read by the full text search of the
+# financial robot app, keep them in line with its full_text module.
+FULL_TEXT_TABLE = "fin_report_full_text"
+# The trigram tokenizer matches any substring of 3 characters or more, the search
+# relies on it: the other tokenizers take a run of chinese characters as a single
+# token, so a keyword inside a sentence is never found.
+_TOKENIZER = "trigram"
+
+
+def full_text_db_path(tmp_dir_path: str, space: str, db_name: str) -> str:
+    """Return the full text database of a space, next to its report database."""
+    return os.path.join(tmp_dir_path or "./tmp", space, f"{db_name}_full_text.db")
+
+
+def save_full_text(path: str, records: List[Dict]):
+    """Index the full text of the reports, replacing their former text.
+
+    The ``fin_report_full_text`` table has one row per report page, the report is
+    referenced by its ``文件名`` in ``fin_report`` and its ``标题``, the title of
+    its vector store chunks.
+
+    The index is not written if the SQLite fts5 trigram tokenizer is not
+    available, the search then falls back to the vector store.
+
+    Args:
+        path(str): the SQLite database file, created if it does not exist
+        records(List[Dict]): the ``{"文件名", "标题", "页码", "全文"}`` of each page
+    """
+    if not _trigram_available():
+        logger.error(
+            f"SQLite {sqlite3.sqlite_version} has no fts5 trigram tokenizer, "
+            f"the full text of {len(records)} pages is not indexed"
+        )
+        return
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path)
+    try:
+        with conn:
+            conn.execute(
+                f"CREATE VIRTUAL TABLE IF NOT EXISTS {FULL_TEXT_TABLE} USING fts5("
+                f"文件名 UNINDEXED, 标题 UNINDEXED, 页码 UNINDEXED, 全文, "
+                f"tokenize='{_TOKENIZER}')"
+            )
+            conn.executemany(
+                f"DELETE FROM {FULL_TEXT_TABLE} WHERE 文件名 = ?",
+                [(name,) for name in {record["文件名"] for record in records}],
+            )
+            conn.executemany(
+                f"INSERT INTO {FULL_TEXT_TABLE} (文件名, 标题, 页码, 全文) "
+                "VALUES (?, ?, ?, ?)",
+                [
+                    (record["文件名"], record["标题"], record["页码"], record["全文"])
+                    for record in records
+                ],
+            )
+    finally:
+        conn.close()
+    logger.info(f"save {len(records)} full text pages to {path}")
+
+
+def _trigram_available() -> bool:
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.execute(
+            f"CREATE VIRTUAL TABLE probe USING fts5(text, tokenize='{_TOKENIZER}')"
+        )
+        return True
+    except sqlite3.OperationalError:
+        return False
+    finally:
+        conn.close()
@@ -0,0 +1,90 @@
+"""The ``fin_indicator`` table, the financial indicators of each report.
+
+The indicators are computed once per report at ingest, from the REAL columns of
+its ``fin_report`` row, so an indicator question is a lookup of a single row.
+"""
+
+import logging
+import os
+import sqlite3
+from typing import List
+
+logger = logging.getLogger(__name__)
+
+INDICATOR_TABLE = "fin_indicator"
+
+# The SQL expressions of the indicators on the ``fin_report`` columns, the same
+# formulas as the ``fin_indicator_map`` of the financial robot app.
+FIN_INDICATORS = {
+    "营业成本率": "营业成本/营业收入",
+    "投资收益占营业收入比率": "投资收益/营业收入",
+    "管理费用率": "管理费用/营业收入",
+    "财务费用率": "财务费用/营业收入",
+    "三费比重": "(销售费用+管理费用+财务费用)/营业收入",
+    "企业研发经费占费用比例": "研发费用/(销售费用+财务费用+管理费用+研发费用)",
+    "企业研发经费与利润比值": "研发费用/净利润",
+    "企业研发经费与营业收入比值": "研发费用/营业收入",
+    "销售人员占比": "销售人员/职工总数",
+    "行政人员占比": "行政人员/职工总数",
+    "财务人员占比": "财务人员/职工总数",
+    "生产人员占比": "生产人员/职工总数",
+    "技术人员占比": "技术人员/职工总数",
+    "研发人员占职工人数比例": "研发人数/职工总数",
+    "企业硕士及以上人员占职工人数比例": "(硕士人员+博士及以上人员)/职工总数",
+    "毛利率": "(营业收入-营业成本)/营业收入",
+    "营业利润率": "营业利润/营业收入",
+    "流动比率": "流动资产合计/流动负债合计",
+    "速动比率": "(流动资产合计-存货)/流动负债合计",
+    "资产负债比率": "负债合计/资产总计",
+    "现金比率": "货币资金/流动负债合计",
+    "非流动负债合计比率": "非流动负债合计/负债合计",
+    "流动负债合计比率": "流动负债合计/负债合计",
+    "净利润率": "净利润/营业收入",
+}
+
+
+def save_indicators(path: str, file_names: List[str]):
+    """Compute the indicators of the reports, replacing their former values.
+
+    The ``fin_indicator`` table has one row per ``(股票代码, 年份)``, with the
+    ``文件名`` and ``公司名称`` of the report and a REAL column per indicator,
+    NULL if a value of its formula is missing or a divisor is zero. The reports
+    without a stock code or a year are skipped, they would replace the row of
+    each other.
+
+    Args:
+        path(str): the SQLite database of the ``fin_report`` table
+        file_names(List[str]): the ``文件名`` of the reports in ``fin_report``
+    """
+    file_names = list(dict.fromkeys(file_names))
+    if not file_names:
+        return
+    columns = ", ".join(f'"{name}" REAL' for name in FIN_INDICATORS)
+    values = ", ".join(f"({formula})" for formula in FIN_INDICATORS.values())
+    placeholders = ", ".join("?" for _ in file_names)
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    conn = sqlite3.connect(path)
+    try:
+        with conn:
+            conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {INDICATOR_TABLE} ("
+                "文件名 TEXT, 公司名称 TEXT, 股票代码 TEXT NOT NULL, "
+                f"年份 TEXT NOT NULL, {columns}, PRIMARY KEY (股票代码, 年份))"
+            )
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS idx_{INDICATOR_TABLE}_company "
+                f"ON {INDICATOR_TABLE} (公司名称, 年份)"
+            )
+            # A report ingested again replaces the row of its company and year.
+            cursor = conn.execute(
+                f"INSERT OR REPLACE INTO {INDICATOR_TABLE} "
+                f"SELECT 文件名, 公司名称_x, 股票代码_x, 年份_x, {values} "
+                f"FROM fin_report WHERE 文件名 IN ({placeholders}) "
+                "AND COALESCE(股票代码_x, '') != '' AND COALESCE(年份_x, '') != ''",
+                file_names,
+            )
+    finally:
+        conn.close()
+    logger.info(f"save {cursor.rowcount} indicator rows to {path}")
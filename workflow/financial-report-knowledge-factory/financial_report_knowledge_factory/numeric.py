@@ -0,0 +1,114 @@
+"""Typed numeric columns of the ``fin_report`` table."""
+
+import json
+import math
+import re
+from typing import Dict, List, Optional
+
+import pandas as pd
+
+# The unit of the statement items of a row, ``{item: unit}`` in json.
+UNIT_COLUMN = "数值单位"
+# The extracted strings of the numeric columns of a row, ``{column: raw}`` in json.
+RAW_VALUE_COLUMN = "原始数值"
+
+UNIT_FACTORS = {"元": 1, "千元": 1e3, "万元": 1e4, "百万元": 1e6, "亿元": 1e8}
+
+# The per share items are in 元/股 whatever the unit of their statement, they are
+# never scaled.
+PER_SHARE_UNIT = "元/股"
+PER_SHARE_COLUMNS = ["基本每股收益", "稀释每股收益"]
+
+# The staff counts of ``FinTableExtractor.extract_base_col``.
+COUNT_COLUMNS = [
+    "职工总数",
+    "生产人员",
+    "销售人员",
+    "技术人员",
+    "财务人员",
+    "行政人员",
+    "本科及以上人员",
+    "本科人员",
+    "硕士及以上人员",
+    "硕士人员",
+    "博士及以上人员",
+    "博士人员",
+    "研发人数",
+]
+
+_NUMBER_RE = re.compile(r"[-+]?(?:\d+(?:\.\d*)?|\.\d+)")
+
+
+def parse_number(value) -> Optional[float]:
+    """Parse an extracted value, e.g. ``"1,234.50"`` or ``"(12.00)"``.
+
+    Returns:
+        Optional[float]: the number, None if the value is not a number, e.g.
+            ``""``, ``"无"`` or ``"-"``
+    """
+    if value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return None if math.isnan(value) else float(value)
+    text = str(value).strip().replace(",", "").replace("，", "")
+    negative = False
+    if len(text) > 2 and text[0] in "(（" and text[-1] in ")）":
+        negative = True
+        text = text[1:-1].strip()
+    if not _NUMBER_RE.fullmatch(text):
+        return None
+    number = float(text)
+    return -number if negative else number
+
+
+def normalize_numeric_columns(df: pd.DataFrame, columns: List[str]) -> pd.DataFrame:
+    """Convert the numeric columns of the reports to REAL values in 元.
+
+    The statement items are scaled by their unit in the ``数值单位`` column. The
+    per share items stay in 元/股, they are never scaled. The values which are not
+    numbers become NULL, the extracted strings are kept in the ``原始数值`` column.
+
+    Args:
+        df(pd.DataFrame): the rows of the reports
+        columns(List[str]): the numeric columns, the missing ones are skipped
+    """
+    if UNIT_COLUMN in df.columns:
+        units = [_load_json(unit) for unit in df[UNIT_COLUMN]]
+    else:
+        units = [{} for _ in range(len(df))]
+    raw_values: List[Dict[str, str]] = [{} for _ in range(len(df))]
+    numbers = {}
+    for column in dict.fromkeys(columns):
+        if column not in df.columns:
+            continue
+        values = []
+        for i, raw in enumerate(df[column]):
+            number = parse_number(raw)
+            if number is not None and column not in PER_SHARE_COLUMNS:
+                number *= UNIT_FACTORS.get(units[i].get(column, "元"), 1)
+            if isinstance(raw, str) and raw != "":
+                raw_values[i][column] = raw
+            values.append(number)
+        numbers[column] = pd.Series(
+            values, index=df.index, dtype="float64", name=column
+        )
+    raw_column = pd.Series(
+        [json.dumps(raw, ensure_ascii=False) for raw in raw_values],
+        index=df.index,
+        name=RAW_VALUE_COLUMN,
+    )
+    # Build the frame at once, the reports have hundreds of columns.
+    return pd.concat(
+        [numbers.get(column, df.iloc[:, i]) for i, column in enumerate(df.columns)]
+        + [raw_column],
+        axis=1,
+    )
+
+
+def _load_json(value) -> Dict[str, str]:
+    if not isinstance(value, str) or value == "":
+        return {}
+    try:
+        return json.loads(value)
+    except ValueError:
+        return {}
@@ -0,0 +1,136 @@
+"""Bulk loading of the ``fin_report`` table of a space."""
+
+import logging
+import os
+import sqlite3
+from typing import List
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+REPORT_TABLE = "fin_report"
+DEFAULT_CHUNK_SIZE = 500
+
+# The keys of a report, a report replaces the rows of the same file or of the
+# same company and year.
+_FILE_COLUMN = "文件名"
+_STOCK_CODE_COLUMN = "股票代码_x"
+_YEAR_COLUMN = "年份_x"
+_COMPANY_COLUMN = "公司名称_x"
+
+_INDEXES = {
+    f"idx_{REPORT_TABLE}_file": (_FILE_COLUMN,),
+    f"idx_{REPORT_TABLE}_stock_year": (_STOCK_CODE_COLUMN, _YEAR_COLUMN),
+    f"idx_{REPORT_TABLE}_company_year": (_COMPANY_COLUMN, _YEAR_COLUMN),
+}
+
+# The loading is a single writer, WAL lets the chats read meanwhile and a
+# commit only syncs the WAL at checkpoints.
+_PRAGMAS = (
+    "PRAGMA journal_mode=WAL",
+    "PRAGMA synchronous=NORMAL",
+    "PRAGMA temp_store=MEMORY",
+    "PRAGMA cache_size=-65536",
+)
+
+
+def save_reports(path: str, df: pd.DataFrame, chunk_size: int = DEFAULT_CHUNK_SIZE):
+    """Save the rows of the reports, replacing their former rows.
+
+    The rows are inserted by chunks of ``chunk_size``, each chunk in its own
+    transaction with the deletion of the former rows of its reports, by
+    ``文件名`` or by ``(股票代码, 年份)``. The table is created from the columns of
+    ``df`` and the new columns are added to an existing table.
+
+    Args:
+        path(str): the SQLite database file, created if it does not exist
+        df(pd.DataFrame): the reports, a row per report
+        chunk_size(int): the number of rows per transaction
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    columns = [str(column) for column in df.columns]
+    rows = df.astype(object).where(df.notna(), None).values.tolist()
+    insert_sql = "INSERT INTO {} ({}) VALUES ({})".format(
+        REPORT_TABLE,
+        ", ".join(_quote(column) for column in columns),
+        ", ".join("?" for _ in columns),
+    )
+    conn = sqlite3.connect(path, timeout=30)
+    try:
+        for pragma in _PRAGMAS:
+            conn.execute(pragma)
+        with conn:
+            _create_table(conn, df)
+        chunk_size = max(chunk_size, 1)
+        for start in range(0, len(rows), chunk_size):
+            chunk = rows[start : start + chunk_size]
+            with conn:
+                if _FILE_COLUMN in columns:
+                    conn.executemany(
+                        f"DELETE FROM {REPORT_TABLE} WHERE {_quote(_FILE_COLUMN)} = ?",
+                        [(row[columns.index(_FILE_COLUMN)],) for row in chunk],
+                    )
+                if _STOCK_CODE_COLUMN in columns and _YEAR_COLUMN in columns:
+                    conn.executemany(
+                        f"DELETE FROM {REPORT_TABLE} "
+                        f"WHERE {_quote(_STOCK_CODE_COLUMN)} = ? "
+                        f"AND {_quote(_YEAR_COLUMN)} = ?",
+                        _company_years(chunk, columns),
+                    )
+                conn.executemany(insert_sql, chunk)
+    finally:
+        conn.close()
+    logger.info(f"save {len(rows)} reports to {path}")
+
+
+def _create_table(conn: sqlite3.Connection, df: pd.DataFrame):
+    """Create the table and its indexes, or add the new columns of ``df`` to it."""
+    types = {str(column): _column_type(df[column]) for column in df.columns}
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS {} ({})".format(
+            REPORT_TABLE,
+            ", ".join(f"{_quote(column)} {type_}" for column, type_ in types.items()),
+        )
+    )
+    table_columns = [
+        row[1] for row in conn.execute(f"PRAGMA table_info({REPORT_TABLE})")
+    ]
+    for column, type_ in types.items():
+        if column not in table_columns:
+            conn.execute(
+                f"ALTER TABLE {REPORT_TABLE} ADD COLUMN {_quote(column)} {type_}"
+            )
+            table_columns.append(column)
+    for name, index_columns in _INDEXES.items():
+        if all(column in table_columns for column in index_columns):
+            conn.execute(
+                "CREATE INDEX IF NOT EXISTS {} ON {} ({})".format(
+                    name, REPORT_TABLE, ", ".join(map(_quote, index_columns))
+                )
+            )
+
+
+def _company_years(rows: List[list], columns: List[str]) -> List[tuple]:
+    """Return the ``(股票代码, 年份)`` of the rows, skipping the empty ones."""
+    stock_code_idx = columns.index(_STOCK_CODE_COLUMN)
+    year_idx = columns.index(_YEAR_COLUMN)
+    return [
+        (row[stock_code_idx], row[year_idx])
+        for row in rows
+        if row[stock_code_idx] and row[year_idx]
+    ]
+
+
+def _column_type(column: pd.Series) -> str:
+    if pd.api.types.is_bool_dtype(column) or pd.api.types.is_integer_dtype(column):
+        return "INTEGER"
+    if pd.api.types.is_float_dtype(column):
+        return "REAL"
+    return "TEXT"
+
+
+def _quote(name: str) -> str:
+    return '"{}"'.format(name.replace('"', '""'))
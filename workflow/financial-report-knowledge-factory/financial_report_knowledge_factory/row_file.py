@@ -0,0 +1,239 @@
+"""Memory mapped columnar file of the rows extracted from a financial report.
+
+The file is written once and read back through mmap, the columns are viewed in
+place and a row text is only decoded when it is accessed. The cells of a table
+row are stored as a json array, decoded at once. Layout, all sections aligned to
+8 bytes::
+
+    magic | row count, type names size, text size, cells size
+    type names (json) | allrow (uint32) | page (uint32) | type code (uint8)
+    text offsets (uint64, row count + 1) | cells offsets (uint64, row count + 1)
+    texts (utf-8) | cells (json arrays, empty for the text rows)
+"""
+
+import bisect
+import json
+import mmap
+import os
+import struct
+from array import array
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional
+
+ROW_FILE_SUFFIX = ".rows"
+
+_MAGIC = b"FINROWS\x02"
+_HEADER = struct.Struct("<8sQQQQ")
+_ALIGNMENT = 8
+# Type code 0 is an empty row, see RowStore.
+_EMPTY_ROW = 0
+
+
+def write_row_file(path: str, rows: Iterable[Mapping[str, Any]]):
+    """Write the rows to a row file at once.
+
+    Args:
+        path(str): the row file path, the file is replaced atomically
+        rows(Iterable[Mapping]): the row dicts, e.g. ``PDFProcessor.all_text``
+            values
+    """
+    type_names = [""]
+    type_codes = {"": _EMPTY_ROW}
+    allrows = array("I")
+    pages = array("I")
+    types = array("B")
+    offsets = array("Q", [0])
+    texts = []
+    text_size = 0
+    cells_offsets = array("Q", [0])
+    cells_list = []
+    cells_size = 0
+    for row in rows:
+        if row:
+            row_type = row["type"]
+            type_code = type_codes.get(row_type)
+            if type_code is None:
+                type_code = type_codes[row_type] = len(type_names)
+                type_names.append(row_type)
+            text = row["inside"].encode("utf-8")
+            cells = row.get("cells")
+            if cells is not None:
+                cells = json.dumps(cells, ensure_ascii=False).encode("utf-8")
+            allrows.append(row["allrow"])
+            pages.append(row["page"])
+        else:
+            type_code = _EMPTY_ROW
+            text = b""
+            cells = None
+            allrows.append(0)
+            # Keep the pages sorted, the empty row goes with the previous page.
+            pages.append(pages[-1] if pages else 0)
+        types.append(type_code)
+        texts.append(text)
+        text_size += len(text)
+        offsets.append(text_size)
+        if cells:
+            cells_list.append(cells)
+            cells_size += len(cells)
+        cells_offsets.append(cells_size)
+
+    type_names_data = json.dumps(type_names, ensure_ascii=False).encode("utf-8")
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(
+            _HEADER.pack(
+                _MAGIC, len(types), len(type_names_data), text_size, cells_size
+            )
+        )
+        for section in (
+            type_names_data,
+            allrows,
+            pages,
+            types,
+            offsets,
+            cells_offsets,
+        ):
+            data = section if isinstance(section, bytes) else section.tobytes()
+            f.write(data)
+            f.write(b"\0" * _padding(len(data)))
+        f.writelines(texts)
+        f.writelines(cells_list)
+    os.replace(tmp_path, path)
+
+
+class RowFile:
+    """Read only, memory mapped view of a row file.
+
+    It is a sequence of row dicts ``{"page", "allrow", "type", "inside"}``, plus
+    the ``cells`` of a table row, indexed by row position, an empty row is an
+    empty dict. The rows of a page can be located directly with
+    :meth:`page_range`.
+    """
+
+    def __init__(self, path: str):
+        """Open a row file.
+
+        Args:
+            path(str): the row file path
+        """
+        self.path = path
+        with open(path, "rb") as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < _HEADER.size:
+                raise ValueError(f"{path} is not a row file")
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, count, type_names_size, text_size, cells_size = _HEADER.unpack_from(
+            self._mmap
+        )
+        if magic != _MAGIC:
+            self._mmap.close()
+            raise ValueError(f"{path} is not a row file")
+        self._count = count
+        buffer = memoryview(self._mmap)
+        offset = _HEADER.size
+        self._type_names: List[str] = json.loads(
+            bytes(buffer[offset : offset + type_names_size]).decode("utf-8")
+        )
+        offset += _aligned(type_names_size)
+        self._allrows = buffer[offset : offset + 4 * count].cast("I")
+        offset += _aligned(4 * count)
+        self._pages = buffer[offset : offset + 4 * count].cast("I")
+        offset += _aligned(4 * count)
+        self._types = buffer[offset : offset + count]
+        offset += _aligned(count)
+        self._offsets = buffer[offset : offset + 8 * (count + 1)].cast("Q")
+        offset += _aligned(8 * (count + 1))
+        self._cells_offsets = buffer[offset : offset + 8 * (count + 1)].cast("Q")
+        offset += _aligned(8 * (count + 1))
+        self._texts = buffer[offset : offset + text_size]
+        offset += text_size
+        self._cells = buffer[offset : offset + cells_size]
+        self._buffer = buffer
+
+    def text(self, index: int) -> str:
+        """Return the text of the row at ``index``."""
+        return str(
+            self._texts[self._offsets[index] : self._offsets[index + 1]], "utf-8"
+        )
+
+    def cells(self, index: int) -> Optional[List[str]]:
+        """Return the cells of the row at ``index``, None for a text row."""
+        start, end = self._cells_offsets[index], self._cells_offsets[index + 1]
+        if start == end:
+            return None
+        return json.loads(str(self._cells[start:end], "utf-8"))
+
+    def row_type(self, index: int) -> Optional[str]:
+        """Return the type of the row at ``index``, None for an empty row."""
+        type_code = self._types[index]
+        return None if type_code == _EMPTY_ROW else self._type_names[type_code]
+
+    def page_range(self, page: int) -> range:
+        """Return the row positions of a page, empty if the page has no row."""
+        start = bisect.bisect_left(self._pages, page)
+        end = bisect.bisect_right(self._pages, page, lo=start)
+        return range(start, end)
+
+    def close(self):
+        """Release the mapping."""
+        if self._mmap.closed:
+            return
+        for view in (
+            self._allrows,
+            self._pages,
+            self._types,
+            self._offsets,
+            self._cells_offsets,
+            self._texts,
+            self._cells,
+            self._buffer,
+        ):
+            view.release()
+        self._mmap.close()
+
+    def __getitem__(self, index: int) -> Dict[str, Any]:
+        """Return the row dict at ``index``."""
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError("row index out of range")
+        type_code = self._types[index]
+        if type_code == _EMPTY_ROW:
+            return {}
+        row = {
+            "page": self._pages[index],
+            "allrow": self._allrows[index],
+            "type": self._type_names[type_code],
+            "inside": self.text(index),
+        }
+        cells = self.cells(index)
+        if cells is not None:
+            row["cells"] = cells
+        return row
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Iterate the row dicts."""
+        for index in range(self._count):
+            yield self[index]
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return self._count
+
+    def __enter__(self) -> "RowFile":
+        """Enter the context, the mapping is released on exit."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Release the mapping."""
+        self.close()
+
+
+def _aligned(size: int) -> int:
+    return size + _padding(size)
+
+
+def _padding(size: int) -> int:
+    return -size % _ALIGNMENT
@@ -0,0 +1,221 @@
+"""Columnar store of the rows extracted from a financial report."""
+
+import bisect
+from array import array
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+# Row type 0 is an empty row, e.g. an empty row loaded from the cache.
+_EMPTY_ROW = 0
+_ROW_TYPES = ("", "text", "excel", "页眉", "页脚")
+_ROW_KEYS = ("page", "allrow", "type", "inside")
+_TABLE_ROW_KEYS = _ROW_KEYS + ("cells",)
+
+
+class Row(Mapping):
+    """Lightweight view of a row in a :class:`RowStore`.
+
+    It behaves like the row dict ``{"page", "allrow", "type", "inside"}``, plus
+    the ``cells`` list of a table row, writes go to the store.
+    """
+
+    __slots__ = ("_store", "_index")
+
+    def __init__(self, store: "RowStore", index: int):
+        """Create a view of the row ``index`` of the store."""
+        self._store = store
+        self._index = index
+
+    def __getitem__(self, key: str) -> Any:
+        """Get a column of the row."""
+        store = self._store
+        index = self._index
+        if store._types[index] != _EMPTY_ROW:
+            if key == "inside":
+                return store._texts[index]
+            if key == "type":
+                return store._type_names[store._types[index]]
+            if key == "page":
+                return store._pages[index]
+            if key == "allrow":
+                return index
+            if key == "cells" and index in store._cells:
+                return store._cells[index]
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, value: Any):
+        """Set a column of the row."""
+        store = self._store
+        index = self._index
+        if store._types[index] == _EMPTY_ROW:
+            raise KeyError(key)
+        if key == "inside":
+            store._texts[index] = value
+        elif key == "type":
+            store._types[index] = store._type_code(value)
+        elif key == "page":
+            store._pages[index] = value
+        else:
+            raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        """Iterate the keys of the row."""
+        return iter(self._keys())
+
+    def __len__(self) -> int:
+        """Return the number of keys of the row."""
+        return len(self._keys())
+
+    def _keys(self):
+        if self._store._types[self._index] == _EMPTY_ROW:
+            return ()
+        if self._index in self._store._cells:
+            return _TABLE_ROW_KEYS
+        return _ROW_KEYS
+
+    def __repr__(self) -> str:
+        """Return the row as a dict repr."""
+        return repr(self.to_dict())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return a copy of the row as a dict."""
+        store = self._store
+        index = self._index
+        type_code = store._types[index]
+        if type_code == _EMPTY_ROW:
+            return {}
+        row = {
+            "page": store._pages[index],
+            "allrow": index,
+            "type": store._type_names[type_code],
+            "inside": store._texts[index],
+        }
+        if index in store._cells:
+            row["cells"] = store._cells[index]
+        return row
+
+
+class RowStore:
+    """Columnar store of the pdf rows, keyed by ``allrow``.
+
+    The pages are kept in an int array, the row types in a byte array of type
+    codes, the texts in a list and the cells of the table rows by ``allrow``,
+    instead of one dict per row. It keeps the
+    dict-like API of the former ``defaultdict(dict)``: ``store[allrow]`` returns a
+    :class:`Row` view, and reading a missing ``allrow`` returns an empty dict that
+    is counted by ``len``, until a row is appended at that ``allrow``.
+    """
+
+    def __init__(self):
+        """Create an empty row store."""
+        self._pages = array("I")
+        self._types = array("B")
+        self._texts: List[str] = []
+        self._cells: Dict[int, List[str]] = {}
+        self._type_names = list(_ROW_TYPES)
+        self._type_codes = {name: code for code, name in enumerate(_ROW_TYPES)}
+        # The empty dicts returned for missing allrow, like a defaultdict does.
+        self._missing: Dict[int, Dict] = {}
+
+    def append(
+        self,
+        page: int,
+        row_type: str,
+        inside: str,
+        cells: Optional[List[str]] = None,
+    ) -> int:
+        """Append a row, return its ``allrow``."""
+        allrow = len(self._texts)
+        self._pages.append(page)
+        self._types.append(self._type_code(row_type))
+        self._texts.append(inside)
+        if cells is not None:
+            self._cells[allrow] = cells
+        if self._missing:
+            self._missing.pop(allrow, None)
+        return allrow
+
+    def append_row(self, row: Dict[str, Any]) -> int:
+        """Append a row dict, e.g. a row loaded from the cache."""
+        if not row:
+            # Keep the pages sorted, the empty row goes with the previous page.
+            page = self._pages[-1] if self._pages else 0
+            allrow = self.append(page, "text", "")
+            self._types[allrow] = _EMPTY_ROW
+            return allrow
+        return self.append(row["page"], row["type"], row["inside"], row.get("cells"))
+
+    def rows(self, start: int = 0, end: Optional[int] = None) -> List[Row]:
+        """Return the views of the rows [start, end)."""
+        if end is None:
+            end = len(self._texts)
+        return [Row(self, i) for i in range(start, end)]
+
+    def texts(self, start: int = 0, end: Optional[int] = None) -> List[str]:
+        """Return the texts of the rows [start, end), without row views."""
+        return self._texts[start:end]
+
+    def page_ranges(self) -> Iterator[Tuple[int, int, int]]:
+        """Iterate the ``(page, start, end)`` row ranges of each page.
+
+        The rows are appended page by page, so the pages are sorted and the rows
+        of a page are contiguous.
+        """
+        pages = self._pages
+        start = 0
+        while start < len(pages):
+            end = bisect.bisect_right(pages, pages[start], lo=start)
+            yield pages[start], start, end
+            start = end
+
+    def clear(self):
+        """Remove all rows."""
+        self.__init__()
+
+    def keys(self) -> Iterator[int]:
+        """Iterate the ``allrow`` of the rows."""
+        yield from range(len(self._texts))
+        yield from sorted(self._missing)
+
+    def values(self) -> Iterator[Any]:
+        """Iterate the rows."""
+        for i in range(len(self._texts)):
+            yield Row(self, i)
+        for allrow in sorted(self._missing):
+            yield self._missing[allrow]
+
+    def items(self) -> Iterator[Any]:
+        """Iterate the ``(allrow, row)`` pairs."""
+        return zip(self.keys(), self.values())
+
+    def __getitem__(self, allrow: int) -> Any:
+        """Get the row view of ``allrow``."""
+        if 0 <= allrow < len(self._texts):
+            return Row(self, allrow)
+        return self._missing.setdefault(allrow, {})
+
+    def __contains__(self, allrow: object) -> bool:
+        """Whether ``allrow`` is in the store."""
+        if isinstance(allrow, int) and 0 <= allrow < len(self._texts):
+            return True
+        return allrow in self._missing
+
+    def __iter__(self) -> Iterator[int]:
+        """Iterate the ``allrow`` of the rows."""
+        return self.keys()
+
+    def __len__(self) -> int:
+        """Return the number of rows."""
+        return len(self._texts) + len(self._missing)
+
+    def __bool__(self) -> bool:
+        """Whether the store has any row."""
+        return len(self) > 0
+
+    def _type_code(self, row_type: str) -> int:
+        code = self._type_codes.get(row_type)
+        if code is None:
+            code = len(self._type_names)
+            self._type_names.append(row_type)
+            self._type_codes[row_type] = code
+        return code
@@ -0,0 +1,185 @@
+"""Output backends of the tables extracted from the financial reports."""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+from abc import ABC, abstractmethod
+from typing import List, Optional, Sequence
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+TABLE_STORE_SQLITE = "sqlite"
+TABLE_STORE_EXCEL = "excel"
+TABLE_STORE_TYPES = (TABLE_STORE_SQLITE, TABLE_STORE_EXCEL)
+
+_TABLE_NAME = "fin_report_table"
+
+
+class TableStore(ABC):
+    """Output backend of the report tables, see ``FinTableProcessor.save_tables``.
+
+    A table is added with the report it comes from, its section, the titles of
+    the report it is under, and its rows, the first row being the header.
+    """
+
+    @abstractmethod
+    def add_table(
+        self,
+        report: str,
+        section: Sequence[str],
+        table_name: str,
+        rows: List[List[str]],
+    ):
+        """Add a table, it may raise if the rows can not be stored as a table."""
+
+    def close(self):
+        """Flush the added tables."""
+
+    def __enter__(self) -> "TableStore":
+        """Enter the context, the tables are flushed on exit."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Flush the added tables."""
+        self.close()
+
+
+class SQLiteTableStore(TableStore):
+    """Store all the tables of an ingest in a single SQLite table.
+
+    Each table row is a record ``(report, section, table_name, row_idx, cells)``,
+    the cells being a json array and the section the titles joined by ``/``. The
+    records are inserted at once in a single transaction on close, replacing the
+    former records of their reports, and indexed by report and table name.
+    """
+
+    def __init__(self, path: str):
+        """Create a SQLite table store.
+
+        Args:
+            path(str): the SQLite database file, created if it does not exist
+        """
+        self.path = path
+        self._records: List[tuple] = []
+
+    def add_table(
+        self,
+        report: str,
+        section: Sequence[str],
+        table_name: str,
+        rows: List[List[str]],
+    ):
+        """Add a table, its records are inserted on close."""
+        section_path = "/".join(section)
+        self._records.extend(
+            (
+                report,
+                section_path,
+                table_name,
+                row_idx,
+                json.dumps(cells, ensure_ascii=False),
+            )
+            for row_idx, cells in enumerate(rows)
+        )
+
+    def close(self):
+        """Insert the added tables in a single transaction."""
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # the store of a space may be written by concurrent ingests
+        conn = sqlite3.connect(self.path, timeout=30)
+        try:
+            with conn:
+                conn.execute(
+                    f"CREATE TABLE IF NOT EXISTS {_TABLE_NAME} ("
+                    "report TEXT NOT NULL, section TEXT NOT NULL, "
+                    "table_name TEXT NOT NULL, row_idx INTEGER NOT NULL, "
+                    "cells TEXT NOT NULL)"
+                )
+                conn.execute(
+                    f"CREATE INDEX IF NOT EXISTS idx_{_TABLE_NAME}_report_table "
+                    f"ON {_TABLE_NAME} (report, table_name)"
+                )
+                conn.executemany(
+                    f"DELETE FROM {_TABLE_NAME} WHERE report = ?",
+                    [(report,) for report in {record[0] for record in self._records}],
+                )
+                conn.executemany(
+                    f"INSERT INTO {_TABLE_NAME} VALUES (?, ?, ?, ?, ?)",
+                    self._records,
+                )
+        finally:
+            conn.close()
+        logger.info(f"save {len(self._records)} table rows to {self.path}")
+        self._records = []
+
+
+class ExcelTableStore(TableStore):
+    """Write each table to an excel file, in a folder per report and title."""
+
+    def __init__(self, output_folder: str):
+        """Create an excel table store.
+
+        Args:
+            output_folder(str): the root folder of the excel files
+        """
+        self.output_folder = output_folder
+
+    def add_table(
+        self,
+        report: str,
+        section: Sequence[str],
+        table_name: str,
+        rows: List[List[str]],
+    ):
+        """Write the table to ``<report>/<titles>/<table_name>.xlsx``.
+
+        A header which does not fit the rows is written again with its date
+        columns merged into their neighbours.
+        """
+        folder_path = os.path.join(self.output_folder, report, *section)
+        os.makedirs(folder_path, exist_ok=True)
+        path = os.path.join(folder_path, f"{table_name}.xlsx")
+        try:
+            pd.DataFrame(rows[1:], columns=rows[0]).to_excel(path, index=False)
+        except ValueError:
+            logger.warning(f"Merge the date columns of the table {path}")
+            header = _merge_date_columns(rows[0])
+            pd.DataFrame(rows[1:], columns=header).to_excel(path, index=False)
+
+
+def _merge_date_columns(header: List[str]) -> List[str]:
+    """Merge each date column name into the column names on its left and right."""
+    header = list(header)
+    pattern = r"\d{4}年\d{1,2}月\d{1,2}日"
+    for i, column_name in enumerate(header):
+        if re.search(pattern, column_name):
+            header[i - 1] = " ".join([column_name, header[i - 1]])
+            header[i + 1] = " ".join([column_name, header[i + 1]])
+            del header[i]
+    return header
+
+
+def create_table_store(
+    store_type: Optional[str], sqlite_path: str, excel_folder: str
+) -> TableStore:
+    """Create the table store of an ingest.
+
+    Args:
+        store_type(str, optional): ``sqlite`` (default) or ``excel``
+        sqlite_path(str): the database file of the SQLite store
+        excel_folder(str): the root folder of the excel store
+    """
+    store_type = (store_type or TABLE_STORE_SQLITE).lower()
+    if store_type == TABLE_STORE_SQLITE:
+        return SQLiteTableStore(sqlite_path)
+    if store_type == TABLE_STORE_EXCEL:
+        return ExcelTableStore(excel_folder)
+    raise ValueError(
+        f"Unknown table store {store_type}, expected one of {TABLE_STORE_TYPES}"
+    )
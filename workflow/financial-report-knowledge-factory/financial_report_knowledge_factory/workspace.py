@@ -0,0 +1,73 @@
+"""Request scoped temp directories of the ingests."""
+
+import logging
+import os
+import shutil
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+WORKSPACES_DIR = "workspaces"
+
+
+class Workspace:
+    """The temp directory of an ingest request, ``<root>/<space>/workspaces/<id>``.
+
+    Each request gets its own workspace, so the concurrent ingests of an operator
+    never see the files of each other. The workspace is removed on exit, unless
+    it is kept for debugging by the retention.
+    """
+
+    def __init__(self, root: str, space: str, retention: int = 0):
+        """Create the workspace of a request.
+
+        Args:
+            root(str): the output directory
+            space(str): the knowledge space of the request
+            retention(int): 0 to remove the workspace on exit, a number of seconds
+                to keep it, the expired workspaces of the space are removed on
+                exit, or a negative number to never remove it
+        """
+        self.workspaces_path = os.path.join(root, space, WORKSPACES_DIR)
+        self.path = os.path.join(self.workspaces_path, uuid.uuid4().hex)
+        self.retention = retention
+        os.makedirs(self.path)
+
+    @property
+    def rows_path(self) -> str:
+        """The directory of the rows files."""
+        return os.path.join(self.path, "rows")
+
+    @property
+    def output_path(self) -> str:
+        """The directory of the intermediate outputs, e.g. the report titles."""
+        return os.path.join(self.path, "output")
+
+    def close(self):
+        """Remove the workspace, or the expired workspaces of the space."""
+        if self.retention == 0:
+            shutil.rmtree(self.path, ignore_errors=True)
+        elif self.retention > 0:
+            remove_expired_workspaces(self.workspaces_path, self.retention)
+
+    def __enter__(self) -> "Workspace":
+        """Enter the context, the workspace is closed on exit."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Close the workspace."""
+        self.close()
+
+
+def remove_expired_workspaces(workspaces_path: str, retention: int):
+    """Remove the workspaces not modified for more than ``retention`` seconds."""
+    expired = time.time() - retention
+    try:
+        entries = list(os.scandir(workspaces_path))
+    except FileNotFoundError:
+        return
+    for entry in entries:
+        if entry.is_dir() and entry.stat().st_mtime < expired:
+            shutil.rmtree(entry.path, ignore_errors=True)
+            logger.info(f"remove expired workspace {entry.path}")
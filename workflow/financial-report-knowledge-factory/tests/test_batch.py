@@ -0,0 +1,119 @@
+import asyncio
+import os
+
+from financial_report_knowledge_factory import (
+    BatchKnowledgeProcessOperator,
+    BatchTriggerReqBody,
+    _batch_file_paths,
+)
+
+
+def _touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb"):
+        pass
+    return str(path)
+
+
+def test_batch_file_paths(tmp_path):
+    directory = tmp_path / "reports"
+    a = _touch(directory / "a.pdf")
+    b = _touch(directory / "2019" / "b.pdf")
+    _touch(directory / "notes.txt")
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("# the reports of 2020\n\nreports/a.pdf\nc.pdf\n")
+    body = BatchTriggerReqBody(
+        space="test",
+        file_paths=["/data/d.pdf", a],
+        manifest=str(manifest),
+        directory=str(directory),
+    )
+    c = os.path.join(str(tmp_path), "c.pdf")
+    assert _batch_file_paths(body) == ["/data/d.pdf", a, c, b]
+
+
+def test_batch_file_paths_empty():
+    assert _batch_file_paths(BatchTriggerReqBody(space="test")) == []
+
+
+class _Loader:
+    async def load_in_process(self, file_path, executor):
+        if file_path.endswith("broken.pdf"):
+            raise ValueError(f"can not parse {file_path}")
+        return file_path
+
+
+class _TextExtractor:
+    async def map(self, request):
+        return {"chunks": [request["knowledge"]]}
+
+
+class _TableExtractor:
+    def __init__(self):
+        self.waited = False
+
+    async def map(self, request):
+        if request["datasource"].endswith("no_tables.pdf"):
+            raise KeyError("营业收入")
+        return {"full_text": ["page 1", "page 2"]}
+
+    async def wait_excel_writes(self):
+        self.waited = True
+
+
+class _VectorStorage:
+    async def map(self, request):
+        return request["chunks"]
+
+
+class _DatabaseStorage:
+    def __init__(self):
+        self.stored = []
+
+    async def map(self, request):
+        self.stored.append(request)
+
+
+class _Batch(BatchKnowledgeProcessOperator):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.table_extractor = _TableExtractor()
+        self.database_storage = _DatabaseStorage()
+
+    def _create_stages(self):
+        return (
+            _Loader(),
+            _TextExtractor(),
+            _VectorStorage(),
+            self.table_extractor,
+            self.database_storage,
+        )
+
+
+def test_batch_isolates_the_failed_reports(tmp_path):
+    manifest = tmp_path / "manifest.txt"
+    manifest.write_text("a.pdf\nbroken.pdf\nno_tables.pdf\nb.pdf\n")
+    batch = _Batch(max_pending_reports=2)
+
+    result = asyncio.run(batch.map({"space": "test", "manifest": str(manifest)}))
+
+    reports = result["reports"]
+    assert [os.path.basename(report["file_path"]) for report in reports] == [
+        "a.pdf",
+        "broken.pdf",
+        "no_tables.pdf",
+        "b.pdf",
+    ]
+    assert [report["status"] for report in reports] == [
+        "success",
+        "failed",
+        "failed",
+        "success",
+    ]
+    assert reports[1]["error"].startswith("can not parse")
+    assert reports[2]["error"] == "'营业收入'"
+    assert reports[0]["pages"] == 2 and reports[0]["chunks"] == 1
+    assert (result["total"], result["succeeded"], result["failed"]) == (4, 2, 2)
+    assert result["pages"] == 4
+    assert len(batch.database_storage.stored) == 2
+    assert batch.table_extractor.waited
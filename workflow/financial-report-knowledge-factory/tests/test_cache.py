@@ -0,0 +1,80 @@
+import os
+
+from financial_report_knowledge_factory import _table_rows_namespace
+from financial_report_knowledge_factory.cache import EXTRACTOR_VERSION, ExtractionCache
+
+
+def _write(path, content):
+    with open(path, "wb") as f:
+        f.write(content)
+    return str(path)
+
+
+def test_content_key_by_content_and_version(tmp_path):
+    a = _write(tmp_path / "a.pdf", b"report")
+    b = _write(tmp_path / "b.pdf", b"report")
+    c = _write(tmp_path / "c.pdf", b"other report")
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    assert cache.content_key(a) == cache.content_key(b)
+    assert cache.content_key(a) != cache.content_key(c)
+    assert cache.content_key(a).endswith(f"-v{EXTRACTOR_VERSION}")
+    other_version = ExtractionCache(str(tmp_path / "cache"), version="old")
+    assert other_version.content_key(a) != cache.content_key(a)
+
+
+def test_get_put_and_stats(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    assert cache.get("key", "all_text") is None
+    cache.put("key", "all_text", [{"inside": "营业收入"}])
+    assert cache.get("key", "all_text") == [{"inside": "营业收入"}]
+    assert cache.get("key", "table_rows") is None
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 2, 1)
+    assert stats["hit_rate"] == 1 / 3
+
+
+def test_evicts_least_recently_used(tmp_path):
+    cache = ExtractionCache(str(tmp_path / "cache"), max_size=250)
+    value = "x" * 100
+    for i, key in enumerate(["a", "b"]):
+        cache.put(key, "all_text", value)
+        path = cache._entry_path(key, "all_text")
+        os.utime(path, (1000 + i, 1000 + i))
+    # a is read, so b is the least recently used entry
+    assert cache.get("a", "all_text") == value
+    cache.put("c", "all_text", value)
+    assert cache.get("b", "all_text") is None
+    assert cache.get("a", "all_text") == value
+    assert cache.get("c", "all_text") == value
+    assert cache.stats()["evictions"] == 1
+
+
+def test_table_rows_namespace_by_report_name():
+    name = "2020-04-15__测试股份有限公司__000001__测试__2019年__年度报告"
+    renamed = "2020-04-15__新名称有限公司__000002__新名__2019年__年度报告"
+    assert _table_rows_namespace(f"/a/{name}.rows") == _table_rows_namespace(
+        f"/b/{name}.rows"
+    )
+    assert _table_rows_namespace(f"/a/{name}.rows") != _table_rows_namespace(
+        f"/a/{renamed}.rows"
+    )
+
+
+def test_walks_the_cache_only_to_evict(tmp_path, monkeypatch):
+    cache = ExtractionCache(str(tmp_path / "cache"), max_size=1000)
+    walks = []
+    list_entries = cache._list_entries
+    monkeypatch.setattr(
+        cache, "_list_entries", lambda: walks.append(1) or list_entries()
+    )
+    value = "x" * 100
+    for key in "abcdefghi":
+        cache.put(key, "all_text", value)
+    # the first put reads the size, the others are estimated
+    assert len(walks) == 1
+    cache.put("j", "all_text", value)
+    cache.put("k", "all_text", value)
+    # j goes over the max size, 2 entries are evicted to go below 90% of it
+    assert len(walks) == 2
+    stats = cache.stats()
+    assert (stats["entries"], stats["size"], stats["evictions"]) == (9, 918, 2)
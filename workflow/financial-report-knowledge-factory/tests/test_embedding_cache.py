@@ -0,0 +1,113 @@
+import sys
+from typing import List
+
+import pytest
+from dbgpt.rag.embedding import Embeddings
+from financial_report_knowledge_factory.embedding_cache import (
+    CachedEmbeddings,
+    EmbeddingCache,
+)
+
+
+class _Embeddings(Embeddings):
+    def __init__(self):
+        self.calls: List[List[str]] = []
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        self.calls.append(list(texts))
+        return [[float(len(text)), 0.5] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return [float(len(text)), 1.0]
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        self.now += 1
+        return self.now
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return EmbeddingCache(str(tmp_path / "cache" / "embedding_cache.db"))
+
+
+def test_hit_and_miss(cache):
+    assert cache.get_many("bge", ["a", "b"]) == [None, None]
+    cache.put_many("bge", ["a"], [[1.0, 2.0]])
+
+    assert cache.get_many("bge", ["b", "a"]) == [None, [1.0, 2.0]]
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 3, 1)
+    assert stats["size"] == 8
+    assert stats["models"] == ["bge"]
+
+
+def test_float32_round_trip(cache):
+    vector = [0.1, -2.5, 1e-3, 3.0]
+    cache.put_many("bge", ["a"], [vector])
+
+    cached = cache.get_many("bge", ["a"])[0]
+    assert cached[1] == -2.5 and cached[3] == 3.0
+    assert cached == pytest.approx(vector, rel=1e-6)
+    assert cached[0] != 0.1
+
+
+def test_keyed_by_model(cache):
+    cache.put_many("bge", ["a"], [[1.0]])
+    cache.put_many("text2vec", ["a"], [[2.0]])
+
+    assert cache.get_many("bge", ["a"]) == [[1.0]]
+    assert cache.get_many("text2vec", ["a"]) == [[2.0]]
+    assert cache.get_many("m3e", ["a"]) == [None]
+
+
+def test_evicts_the_least_recently_used(tmp_path, monkeypatch):
+    # the package has an embedding_cache attribute too, the DAG cache
+    module = sys.modules[EmbeddingCache.__module__]
+    monkeypatch.setattr(module, "time", _Clock())
+    # 4 vectors of 4 float32, evicted down to 57 bytes
+    cache = EmbeddingCache(str(tmp_path / "embedding_cache.db"), max_size=64)
+    for text in ["a", "b", "c", "d"]:
+        cache.put_many("bge", [text], [[1.0] * 4])
+    cache.get_many("bge", ["a"])
+    cache.put_many("bge", ["e"], [[1.0] * 4])
+
+    vectors = cache.get_many("bge", ["a", "b", "c", "d", "e"])
+    assert [vector is not None for vector in vectors] == [
+        True,
+        False,
+        False,
+        True,
+        True,
+    ]
+    stats = cache.stats()
+    assert (stats["evictions"], stats["entries"], stats["size"]) == (2, 3, 48)
+
+
+def test_cached_embeddings(cache):
+    wrapped = _Embeddings()
+    embeddings = CachedEmbeddings(wrapped, cache, "bge")
+
+    assert embeddings.embed_documents(["aa", "b", "aa"]) == [
+        [2.0, 0.5],
+        [1.0, 0.5],
+        [2.0, 0.5],
+    ]
+    # the duplicated texts of a batch are embedded once
+    assert wrapped.calls == [["aa", "b"]]
+
+    assert embeddings.embed_documents(["b", "ccc", "aa"]) == [
+        [1.0, 0.5],
+        [3.0, 0.5],
+        [2.0, 0.5],
+    ]
+    assert wrapped.calls == [["aa", "b"], ["ccc"]]
+
+    other_model = CachedEmbeddings(wrapped, cache, "text2vec")
+    other_model.embed_documents(["aa"])
+    assert wrapped.calls[-1] == ["aa"]
+    assert embeddings.embed_query("dddd") == [4.0, 1.0]
@@ -0,0 +1,176 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+
+import pytest
+from dbgpt.core import Chunk
+from dbgpt.rag.embedding import Embeddings
+from financial_report_knowledge_factory import VectorStorageOperator
+from financial_report_knowledge_factory.embedding_pipeline import (
+    PrecomputedEmbeddings,
+    load_chunks,
+)
+
+
+class _Embeddings(Embeddings):
+    def __init__(self, fail_on=None):
+        self.embedded: List[str] = []
+        self._fail_on = fail_on
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        if self._fail_on in texts:
+            raise RuntimeError(f"can not embed {self._fail_on}")
+        self.embedded.extend(texts)
+        return [[float(len(text))] for text in texts]
+
+    def embed_query(self, text: str) -> List[float]:
+        return [float(len(text))]
+
+
+class _VectorStore:
+    def __init__(self, embeddings, block=False):
+        self.embeddings = embeddings
+        self.batches: List[List[str]] = []
+        self.vectors: List[List[float]] = []
+        self.writing = threading.Event()
+        self.released = threading.Event()
+        if not block:
+            self.released.set()
+
+    def load_document(self, chunks):
+        self.writing.set()
+        self.released.wait(10)
+        texts = [chunk.content for chunk in chunks]
+        self.vectors.extend(self.embeddings.embed_documents(texts))
+        self.batches.append(texts)
+        return [str(i) for i in range(len(chunks))]
+
+
+class _Pages:
+    def __init__(self, pages: int, chunks_per_page: int = 1):
+        self.pulled = 0
+        self._pages = pages
+        self._chunks_per_page = chunks_per_page
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.pulled == self._pages:
+            raise StopIteration
+        self.pulled += 1
+        return [
+            Chunk(content=f"page {self.pulled} chunk {i}")
+            for i in range(self._chunks_per_page)
+        ]
+
+
+@pytest.fixture(scope="module")
+def executors():
+    io_executor, inference_executor = ThreadPoolExecutor(4), ThreadPoolExecutor(1)
+    yield io_executor, inference_executor
+    io_executor.shutdown()
+    inference_executor.shutdown()
+
+
+def test_precomputed_embeddings():
+    wrapped = _Embeddings()
+    embeddings = PrecomputedEmbeddings(wrapped)
+    embeddings.precompute(["a", "bb"])
+
+    assert embeddings.embed_documents(["bb", "ccc", "a"]) == [[2.0], [3.0], [1.0]]
+    assert wrapped.embedded == ["a", "bb", "ccc"]
+
+    embeddings.release(["a"])
+    assert embeddings.embed_documents(["a", "bb"]) == [[1.0], [2.0]]
+    assert wrapped.embedded == ["a", "bb", "ccc", "a"]
+    assert embeddings.embed_query("dddd") == [4.0]
+
+
+def test_load_chunks_in_order(executors):
+    wrapped = _Embeddings()
+    embeddings = PrecomputedEmbeddings(wrapped)
+    vector_store = _VectorStore(embeddings)
+    pages = _Pages(5, chunks_per_page=3)
+
+    chunks, stats = asyncio.run(
+        load_chunks(pages, vector_store, embeddings, *executors, batch_size=4)
+    )
+
+    texts = [f"page {page} chunk {i}" for page in range(1, 6) for i in range(3)]
+    assert [chunk.content for chunk in chunks] == texts
+    assert [len(batch) for batch in vector_store.batches] == [4, 4, 4, 3]
+    assert sum(vector_store.batches, []) == texts
+    # the vector store got the vectors of the embedding stage
+    assert wrapped.embedded == texts
+    assert vector_store.vectors == [[float(len(text))] for text in texts]
+    assert stats["chunks"] == 15
+    assert stats["embedding"]["chunks"] == stats["writing"]["chunks"] == 15
+
+
+def test_load_chunks_backpressure(executors):
+    embeddings = PrecomputedEmbeddings(_Embeddings())
+    vector_store = _VectorStore(embeddings, block=True)
+    pages = _Pages(100)
+
+    async def run():
+        loading = asyncio.ensure_future(
+            load_chunks(
+                pages,
+                vector_store,
+                embeddings,
+                *executors,
+                batch_size=2,
+                max_pending_batches=1,
+            )
+        )
+        while not vector_store.writing.is_set():
+            await asyncio.sleep(0.01)
+        await asyncio.sleep(0.3)
+        # the batch being written, a batch in each queue, the batch being
+        # embedded and the page being queued
+        pulled = pages.pulled
+        vector_store.released.set()
+        chunks, _ = await loading
+        return pulled, chunks
+
+    pulled, chunks = asyncio.run(run())
+
+    assert pulled <= 9
+    assert len(chunks) == 100
+
+
+def test_load_chunks_stage_error(executors):
+    embeddings = PrecomputedEmbeddings(_Embeddings(fail_on="page 3 chunk 0"))
+    vector_store = _VectorStore(embeddings)
+    pages = _Pages(100)
+
+    async def run():
+        await asyncio.wait_for(
+            load_chunks(pages, vector_store, embeddings, *executors, batch_size=2),
+            timeout=10,
+        )
+
+    start = time.perf_counter()
+    with pytest.raises(RuntimeError, match="can not embed page 3 chunk 0"):
+        asyncio.run(run())
+
+    assert time.perf_counter() - start < 10
+    # the other stages stopped with the failed one
+    assert pages.pulled < 100
+    assert sum(vector_store.batches, []) == ["page 1 chunk 0", "page 2 chunk 0"]
+
+
+def test_batch_size_defaults(monkeypatch):
+    monkeypatch.delenv("FIN_REPORT_EMBEDDING_BATCH_SIZE", raising=False)
+    monkeypatch.delenv("KNOWLEDGE_MAX_CHUNKS_ONCE_LOAD", raising=False)
+    assert VectorStorageOperator()._embedding_batch_size == 32
+    monkeypatch.setenv("KNOWLEDGE_MAX_CHUNKS_ONCE_LOAD", "10")
+    assert VectorStorageOperator()._embedding_batch_size == 10
+    assert VectorStorageOperator(max_chunks_once_load=20)._embedding_batch_size == 20
+    monkeypatch.setenv("FIN_REPORT_EMBEDDING_BATCH_SIZE", "16")
+    assert VectorStorageOperator()._embedding_batch_size == 16
+    operator = VectorStorageOperator(max_chunks_once_load=20, embedding_batch_size=8)
+    assert operator._embedding_batch_size == 8
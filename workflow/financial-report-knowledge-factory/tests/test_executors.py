@@ -0,0 +1,58 @@
+import threading
+from concurrent.futures import BrokenExecutor, Executor, ThreadPoolExecutor
+
+from financial_report_knowledge_factory import (
+    DatabaseStorageOperator,
+    FinTableExtractorOperator,
+    KnowledgeLoaderOperator,
+)
+from financial_report_knowledge_factory.executors import (
+    EXECUTOR_IO,
+    MeteredExecutor,
+    get_executor,
+)
+
+
+class _BrokenExecutor(Executor):
+    def submit(self, fn, *args, **kwargs):
+        raise BrokenExecutor("a worker was killed")
+
+
+def test_broken_executor_is_replaced_once():
+    created = []
+
+    def create_executor():
+        executor = _BrokenExecutor() if not created else ThreadPoolExecutor(2)
+        created.append(executor)
+        return executor
+
+    executor = MeteredExecutor("test", create_executor, 2)
+    barrier = threading.Barrier(8)
+    futures = []
+
+    def submit(i):
+        barrier.wait()
+        futures.append(executor.submit(pow, i, 2))
+
+    threads = [threading.Thread(target=submit, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(created) == 2
+    assert sorted(future.result() for future in futures) == [i * i for i in range(8)]
+    assert executor.stats()["completed"] == 8
+    executor.shutdown()
+
+
+def test_operators_default_to_the_shared_io_executor():
+    executor = ThreadPoolExecutor(1)
+    for operator_cls in [
+        KnowledgeLoaderOperator,
+        FinTableExtractorOperator,
+        DatabaseStorageOperator,
+    ]:
+        assert operator_cls()._executor is get_executor(EXECUTOR_IO)
+        assert operator_cls(executor=executor)._executor is executor
+    executor.shutdown()
@@ -0,0 +1,72 @@
+import re
+import sqlite3
+
+import pandas as pd
+from financial_report_knowledge_factory.fact import FACT_TABLE, save_facts
+from financial_report_knowledge_factory.indicator import (
+    FIN_INDICATORS,
+    INDICATOR_TABLE,
+    save_indicators,
+)
+
+
+def _reports(codes):
+    return pd.DataFrame(
+        {
+            "文件名": [f"{i}.txt" for i in range(len(codes))],
+            "公司名称_x": [f"公司{i}" for i in range(len(codes))],
+            "股票代码_x": codes,
+            "年份_x": ["2019年"] * len(codes),
+            "营业收入": [100.0 * (i + 1) for i in range(len(codes))],
+            "营业成本": [50.0] * len(codes),
+        }
+    )
+
+
+def _select(path, sql):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+def test_save_facts_replaces_the_report_facts(tmp_path):
+    path = str(tmp_path / "fin_report.db")
+    save_facts(path, _reports(["000001", "000002"]), ["营业收入", "营业成本"])
+    df = _reports(["000001"])
+    df["营业收入"] = [300.0]
+    df["营业成本"] = [None]
+    save_facts(path, df, ["营业收入", "营业成本", "净利润"])
+    assert _select(
+        path, f"SELECT 股票代码, 项目, 数值 FROM {FACT_TABLE} ORDER BY 股票代码, 项目"
+    ) == [
+        ("000001", "营业收入", 300.0),
+        ("000002", "营业成本", 50.0),
+        ("000002", "营业收入", 200.0),
+    ]
+
+
+def test_save_facts_skips_reports_without_stock_code(tmp_path):
+    path = str(tmp_path / "fin_report.db")
+    save_facts(path, _reports(["000001"]), ["营业收入"])
+    save_facts(path, _reports(["", None]), ["营业收入"])
+    assert _select(path, f"SELECT 股票代码, 数值 FROM {FACT_TABLE}") == [("000001", 100.0)]
+
+
+def test_save_indicators_skips_reports_without_stock_code(tmp_path):
+    path = str(tmp_path / "fin_report.db")
+    columns = sorted(set(re.findall(r"[^()+\-*/]+", "+".join(FIN_INDICATORS.values()))))
+    df = _reports(["000001", "", None])
+    for column in columns:
+        if column not in df.columns:
+            df[column] = None
+    conn = sqlite3.connect(path)
+    try:
+        df.to_sql("fin_report", conn, index=False)
+    finally:
+        conn.close()
+    save_indicators(path, df["文件名"].tolist())
+    assert _select(path, f"SELECT 股票代码, 年份, 营业成本率 FROM {INDICATOR_TABLE}") == [
+        ("000001", "2019年", 0.5)
+    ]
@@ -0,0 +1,100 @@
+import glob
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from financial_report_knowledge_factory.cache import ExtractionCache
+from financial_report_knowledge_factory.fin_knowledge import (
+    FinReportKnowledge,
+    PDFProcessor,
+)
+
+_PDF_DIR = os.path.join(
+    os.path.dirname(__file__), *[os.pardir] * 3, "assets", "pdf", "financial-reports"
+)
+_PAGE_COUNT = 12
+
+
+@pytest.fixture(scope="module")
+def report_pdf(tmp_path_factory):
+    """The first pages of a bundled report, with tables and headers."""
+    pdfium = pytest.importorskip("pypdfium2")
+    reports = sorted(glob.glob(os.path.join(_PDF_DIR, "*.pdf")))
+    if not reports:
+        pytest.skip("the bundled reports are missing")
+    source = pdfium.PdfDocument(reports[-1])
+    pdf = pdfium.PdfDocument.new()
+    pdf.import_pages(source, list(range(_PAGE_COUNT)))
+    path = str(tmp_path_factory.mktemp("pdf") / os.path.basename(reports[-1]))
+    pdf.save(path)
+    pdf.close()
+    source.close()
+    return path
+
+
+class _RecordingExecutor(ThreadPoolExecutor):
+    """Thread pool counting the pages submitted for extraction."""
+
+    def __init__(self):
+        super().__init__(max_workers=2)
+        self.submitted_pages = 0
+
+    def submit(self, fn, filepath, start, end, *args):
+        self.submitted_pages += end - start
+        return super().submit(fn, filepath, start, end, *args)
+
+
+def _rows(processor):
+    return [dict(row) for row in processor.all_text.values()]
+
+
+@pytest.fixture(scope="module")
+def sequential_rows(report_pdf):
+    processor = PDFProcessor(report_pdf)
+    pages = [page for page, _ in processor.iter_pages()]
+    assert pages == list(range(1, _PAGE_COUNT + 1))
+    rows = _rows(processor)
+    processor.pdf.close()
+    return rows
+
+
+# page ranges of 1 page, of 2 then 1 page and of 3 pages, the last unbounded
+@pytest.mark.parametrize(
+    "max_workers, max_in_flight_pages", [(2, 1), (2, 5), (1, 4), (1, 100)]
+)
+def test_parallel_pages_same_as_sequential(
+    report_pdf, sequential_rows, max_workers, max_in_flight_pages
+):
+    assert any(row.get("type") == "excel" for row in sequential_rows)
+    processor = PDFProcessor(report_pdf)
+    executor = _RecordingExecutor()
+    pages = []
+    with executor:
+        for page, rows in processor.iter_pages(
+            parallel=True,
+            max_workers=max_workers,
+            max_in_flight_pages=max_in_flight_pages,
+            executor=executor,
+        ):
+            pages.append(page)
+            assert executor.submitted_pages - len(pages) <= max_in_flight_pages
+            assert all(row["page"] == page for row in rows)
+    processor.pdf.close()
+    assert pages == list(range(1, _PAGE_COUNT + 1))
+    assert _rows(processor) == sequential_rows
+
+
+def test_cache_key_by_min_table_edges(tmp_path):
+    pdfium = pytest.importorskip("pypdfium2")
+    path = str(tmp_path / "report.pdf")
+    pdf = pdfium.PdfDocument.new()
+    pdf.new_page(595, 842)
+    pdf.save(path)
+    pdf.close()
+    cache = ExtractionCache(str(tmp_path / "cache"))
+    rows = [{"page": 1, "allrow": 0, "type": "text", "inside": "一、重要提示"}]
+    FinReportKnowledge(path, cache=cache, min_table_edges=0).load_rows(rows)
+    assert not FinReportKnowledge(path, cache=cache).load_cached_rows()
+    knowledge = FinReportKnowledge(path, cache=cache, min_table_edges=0)
+    assert knowledge.load_cached_rows()
+    assert [dict(row) for row in knowledge.all_text.values()] == rows
@@ -0,0 +1,103 @@
+import importlib.util
+import logging
+import os
+import sqlite3
+
+import pytest
+from financial_report_knowledge_factory import full_text
+from financial_report_knowledge_factory.full_text import (
+    FULL_TEXT_TABLE,
+    full_text_db_path,
+    save_full_text,
+)
+
+_ROBOT_FULL_TEXT = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "..",
+    "financial-robot-app",
+    "financial_robot_app",
+    "full_text.py",
+)
+
+
+def _page(name, page, text):
+    return {"文件名": name, "标题": f"{name}年度报告", "页码": page, "全文": text}
+
+
+def _pages(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(
+            f"SELECT 文件名, 页码, 全文 FROM {FULL_TEXT_TABLE} ORDER BY 文件名, 页码"
+        ).fetchall()
+    finally:
+        conn.close()
+
+
+@pytest.fixture(scope="module")
+def robot_full_text():
+    # The robot app reads the index, it is loaded from its file as importing its
+    # package needs the app dependencies.
+    if not os.path.exists(_ROBOT_FULL_TEXT):
+        pytest.skip("the financial robot app is not checked out")
+    spec = importlib.util.spec_from_file_location("robot_full_text", _ROBOT_FULL_TEXT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def test_save_full_text_replaces_the_report_pages(tmp_path):
+    path = str(tmp_path / "space" / "fin_report_full_text.db")
+    save_full_text(path, [_page("a", 1, "营业收入"), _page("a", 2, "净利润")])
+    save_full_text(path, [_page("b", 1, "综合收益总额")])
+    save_full_text(path, [_page("a", 1, "归属于母公司所有者的净利润")])
+
+    assert _pages(path) == [
+        ("a", 1, "归属于母公司所有者的净利润"),
+        ("b", 1, "综合收益总额"),
+    ]
+
+
+def test_no_index_without_trigram(tmp_path, monkeypatch, caplog):
+    monkeypatch.setattr(full_text, "_TOKENIZER", "no_such_tokenizer")
+    path = str(tmp_path / "fin_report_full_text.db")
+    with caplog.at_level(logging.ERROR):
+        save_full_text(path, [_page("a", 1, "营业收入")])
+
+    assert not os.path.exists(path)
+    assert "trigram" in caplog.text
+
+
+def test_robot_app_resolves_the_same_path(robot_full_text):
+    assert robot_full_text.FULL_TEXT_TABLE == FULL_TEXT_TABLE
+    for tmp_dir_path in ["/data/tmp", "", None]:
+        assert robot_full_text.full_text_db_path(
+            tmp_dir_path, "space", "fin_report"
+        ) == full_text_db_path(tmp_dir_path, "space", "fin_report")
+    assert full_text_db_path(None, "space", "fin_report") == os.path.join(
+        "./tmp", "space", "fin_report_full_text.db"
+    )
+
+
+def test_robot_app_searches_the_index(tmp_path, robot_full_text):
+    path = full_text_db_path(str(tmp_path), "space", "fin_report")
+    save_full_text(
+        path,
+        [
+            _page("a", 1, "本期营业收入增长"),
+            _page("a", 2, "归属于母公司的综合收益总额为100元"),
+            _page("b", 1, "综合收益总额为200元"),
+        ],
+    )
+    search = robot_full_text.search_full_text
+
+    # A keyword inside a sentence is found, as a substring of the page text.
+    assert search(path, "综合收益总额") == [
+        "b年度报告 第1页: 综合收益总额为200元",
+        "a年度报告 第2页: 归属于母公司的综合收益总额为100元",
+    ]
+    assert search(path, "综合收益", title="a年度报告") == ["a年度报告 第2页: 归属于母公司的综合收益总额为100元"]
+    assert search(path, '营业"收入') == []
+    assert search(path, "收入") == []
+    assert search(str(tmp_path / "missing.db"), "营业收入") == []
@@ -0,0 +1,137 @@
+import json
+import math
+
+import pandas as pd
+import pytest
+from financial_report_knowledge_factory.extract import FinTableExtractor
+from financial_report_knowledge_factory.numeric import (
+    RAW_VALUE_COLUMN,
+    UNIT_COLUMN,
+    normalize_numeric_columns,
+    parse_number,
+)
+
+_FILE_NAME = "2020-04-15__测试股份有限公司__000001__测试__2019年__年度报告.rows"
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [
+        ("1,234.50", 1234.5),
+        ("1，234", 1234.0),
+        ("(12.00)", -12.0),
+        ("（12.00）", -12.0),
+        ("-3.5", -3.5),
+        (" 7 ", 7.0),
+        (".5", 0.5),
+        (42, 42.0),
+        (1.5, 1.5),
+        ("", None),
+        ("无", None),
+        ("-", None),
+        ("－", None),
+        ("()", None),
+        ("12%", None),
+        (None, None),
+        (float("nan"), None),
+    ],
+)
+def test_parse_number(value, expected):
+    assert parse_number(value) == expected
+
+
+def test_normalize_numeric_columns_scales_by_unit():
+    df = pd.DataFrame(
+        {
+            "文件名": ["a.txt", "b.txt"],
+            "营业收入": ["1,234.50", "(2.00)"],
+            "基本每股收益": ["0.52", "0.10"],
+            "职工总数": ["1,000", "无"],
+            UNIT_COLUMN: [
+                json.dumps({"营业收入": "万元", "基本每股收益": "元/股"}),
+                json.dumps({"营业收入": "亿元"}),
+            ],
+        }
+    )
+    result = normalize_numeric_columns(df, ["营业收入", "基本每股收益", "职工总数"])
+    assert list(result.columns) == list(df.columns) + [RAW_VALUE_COLUMN]
+    assert result["营业收入"].tolist() == [12345000.0, -200000000.0]
+    assert result["基本每股收益"].tolist() == [0.52, 0.10]
+    assert result["职工总数"].iloc[0] == 1000.0
+    assert math.isnan(result["职工总数"].iloc[1])
+    assert result["营业收入"].dtype == "float64"
+    assert json.loads(result[RAW_VALUE_COLUMN].iloc[1]) == {
+        "营业收入": "(2.00)",
+        "基本每股收益": "0.10",
+        "职工总数": "无",
+    }
+
+
+def test_normalize_numeric_columns_never_scales_per_share_items():
+    # the rows extracted before the per share unit have the statement unit
+    df = pd.DataFrame(
+        {
+            "基本每股收益": ["0.52"],
+            "稀释每股收益": ["0.51"],
+            UNIT_COLUMN: [json.dumps({"基本每股收益": "万元", "稀释每股收益": "亿元"})],
+        }
+    )
+    result = normalize_numeric_columns(df, ["基本每股收益", "稀释每股收益"])
+    assert result["基本每股收益"].tolist() == [0.52]
+    assert result["稀释每股收益"].tolist() == [0.51]
+
+
+def test_normalize_numeric_columns_without_units_or_values():
+    df = pd.DataFrame({"营业收入": [None, float("nan"), "12"]})
+    result = normalize_numeric_columns(df, ["营业收入", "营业成本"])
+    assert result["营业收入"].iloc[2] == 12.0
+    assert result["营业收入"].iloc[:2].isna().all()
+    assert "营业成本" not in result.columns
+
+
+def _text(inside):
+    return {"page": 1, "type": "text", "inside": inside}
+
+
+def _table(*cells):
+    return {"page": 1, "type": "excel", "inside": str(list(cells)), "cells": cells}
+
+
+def _statement_rows():
+    return [
+        _text("财务报表"),
+        _text("1、合并资产负债表"),
+        _text("单位：元"),
+        _table("项目", "2019年12月31日", "2018年12月31日"),
+        _table("货币资金", "1,000.00", "900.00"),
+        _text("母公司资产负债表"),
+        _text("3、合并利润表"),
+        _text("单位：万元"),
+        _table("项目", "2019年度", "2018年度"),
+        _table("一、营业总收入", "1,234.50", "1,000.00"),
+        _table("（一）基本每股收益（元/股）", "0.52", "0.40"),
+        _table("（二）稀释每股收益（元/股）", "0.51", "0.40"),
+        _text("母公司利润表"),
+        _text("5、合并现金流量表"),
+        _text("单位：元"),
+        _table("项目", "2019年度", "2018年度"),
+        _table("经营活动现金流入小计", "300.00", "200.00"),
+        _text("6、母公司现金流量表"),
+    ]
+
+
+def test_wan_yuan_income_statement():
+    row = FinTableExtractor(_FILE_NAME, rows=_statement_rows()).extract_fin_data()
+    assert json.loads(row[UNIT_COLUMN]) == {
+        "货币资金": "元",
+        "营业总收入": "万元",
+        "基本每股收益": "元/股",
+        "稀释每股收益": "元/股",
+        "经营活动现金流入小计": "元",
+    }
+    columns = ["货币资金", "营业总收入", "基本每股收益", "稀释每股收益"]
+    result = normalize_numeric_columns(pd.DataFrame([row]), columns)
+    assert result["货币资金"].tolist() == [1000.0]
+    assert result["营业总收入"].tolist() == [12345000.0]
+    assert result["基本每股收益"].tolist() == [0.52]
+    assert result["稀释每股收益"].tolist() == [0.51]
@@ -0,0 +1,75 @@
+import sqlite3
+
+import pandas as pd
+from financial_report_knowledge_factory.report_db import REPORT_TABLE, save_reports
+
+
+def _reports(rows):
+    return pd.DataFrame(rows, columns=["文件名", "公司名称_x", "股票代码_x", "年份_x", "营业收入"])
+
+
+def _select(path, sql):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(sql).fetchall()
+    finally:
+        conn.close()
+
+
+def test_save_reports_replaces_by_file_and_company_year(tmp_path):
+    path = str(tmp_path / "space" / "fin_report.db")
+    save_reports(
+        path,
+        _reports(
+            [
+                ("a.txt", "甲", "000001", "2019年", 100.0),
+                ("b.txt", "乙", "000002", "2019年", 200.0),
+                ("c.txt", "丙", None, None, 300.0),
+            ]
+        ),
+        chunk_size=2,
+    )
+    # the same file, and another file of the same company and year
+    save_reports(
+        path,
+        _reports(
+            [
+                ("a.txt", "甲", "000001", "2019年", 110.0),
+                ("b2.txt", "乙", "000002", "2019年", 220.0),
+            ]
+        ),
+    )
+    assert _select(path, f"SELECT 文件名, 营业收入 FROM {REPORT_TABLE} ORDER BY 文件名") == [
+        ("a.txt", 110.0),
+        ("b2.txt", 220.0),
+        ("c.txt", 300.0),
+    ]
+
+
+def test_save_reports_keeps_reports_without_company_year(tmp_path):
+    path = str(tmp_path / "fin_report.db")
+    save_reports(path, _reports([("a.txt", "甲", None, None, 1.0)]))
+    save_reports(path, _reports([("b.txt", "乙", "", "", 2.0)]))
+    assert _select(path, f"SELECT 文件名 FROM {REPORT_TABLE} ORDER BY 文件名") == [
+        ("a.txt",),
+        ("b.txt",),
+    ]
+
+
+def test_save_reports_adds_the_new_columns(tmp_path):
+    path = str(tmp_path / "fin_report.db")
+    save_reports(path, _reports([("a.txt", "甲", "000001", "2019年", 1.0)]))
+    df = _reports([("b.txt", "乙", "000002", "2019年", 2.0)])
+    df["职工总数"] = [10]
+    save_reports(path, df)
+    columns = {
+        row[1]: row[2] for row in _select(path, f"PRAGMA table_info({REPORT_TABLE})")
+    }
+    assert columns["营业收入"] == "REAL"
+    assert columns["职工总数"] == "INTEGER"
+    assert _select(path, f"SELECT 文件名, 职工总数 FROM {REPORT_TABLE} ORDER BY 文件名") == [
+        ("a.txt", None),
+        ("b.txt", 10),
+    ]
+    indexes = {row[1] for row in _select(path, f"PRAGMA index_list({REPORT_TABLE})")}
+    assert f"idx_{REPORT_TABLE}_stock_year" in indexes
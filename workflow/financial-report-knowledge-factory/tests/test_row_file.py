@@ -0,0 +1,37 @@
+import pytest
+from financial_report_knowledge_factory.row_file import RowFile, write_row_file
+
+from .test_row_store import _ROWS
+
+
+def test_row_file_round_trip(tmp_path):
+    path = str(tmp_path / "report" / "a.rows")
+    write_row_file(path, _ROWS)
+    with RowFile(path) as rows:
+        assert len(rows) == len(_ROWS)
+        assert list(rows) == _ROWS
+        assert rows[-1] == _ROWS[-1]
+        assert rows.text(1) == "一、重要提示"
+        assert rows.cells(3) == ["项目", "2019年"]
+        assert rows.cells(1) is None
+        assert rows.row_type(2) is None
+        assert rows.page_range(1) == range(0, 3)
+        assert rows.page_range(2) == range(3, 5)
+        assert len(rows.page_range(3)) == 0
+        with pytest.raises(IndexError):
+            rows[len(_ROWS)]
+
+
+def test_empty_row_file(tmp_path):
+    path = str(tmp_path / "a.rows")
+    write_row_file(path, [])
+    with RowFile(path) as rows:
+        assert len(rows) == 0
+        assert list(rows) == []
+
+
+def test_not_a_row_file(tmp_path):
+    path = tmp_path / "a.rows"
+    path.write_bytes(b"{}" * 40)
+    with pytest.raises(ValueError):
+        RowFile(str(path))
@@ -0,0 +1,58 @@
+from financial_report_knowledge_factory.row_store import RowStore
+
+_ROWS = [
+    {"page": 1, "allrow": 0, "type": "页眉", "inside": "2019年年度报告"},
+    {"page": 1, "allrow": 1, "type": "text", "inside": "一、重要提示"},
+    {},
+    {
+        "page": 2,
+        "allrow": 3,
+        "type": "excel",
+        "inside": "['项目', '2019年']",
+        "cells": ["项目", "2019年"],
+    },
+    {"page": 2, "allrow": 4, "type": "页脚", "inside": "1 / 200"},
+]
+
+
+def _store(rows):
+    store = RowStore()
+    for row in rows:
+        store.append_row(row)
+    return store
+
+
+def test_rows_round_trip():
+    store = _store(_ROWS)
+    assert len(store) == len(_ROWS)
+    assert [dict(row) for row in store.values()] == _ROWS
+    assert [row.to_dict() for row in store.rows()] == _ROWS
+    assert store.texts(0, 2) == ["2019年年度报告", "一、重要提示"]
+    assert list(store.page_ranges()) == [(1, 0, 3), (2, 3, 5)]
+
+
+def test_row_view_writes_go_to_the_store():
+    store = _store(_ROWS)
+    row = store[1]
+    row["inside"] = "二、公司简介"
+    row["type"] = "标题"
+    assert store[1].to_dict() == {
+        "page": 1,
+        "allrow": 1,
+        "type": "标题",
+        "inside": "二、公司简介",
+    }
+    assert "cells" not in store[1]
+    assert store[3]["cells"] == ["项目", "2019年"]
+
+
+def test_missing_allrow_like_a_defaultdict():
+    store = _store(_ROWS[:2])
+    assert 5 not in store
+    assert store[5] == {}
+    assert 5 in store and len(store) == 3
+    assert list(store.keys()) == [0, 1, 5]
+    store.append(1, "text", "三、")
+    assert list(store.keys()) == [0, 1, 2, 5]
+    store.clear()
+    assert not store
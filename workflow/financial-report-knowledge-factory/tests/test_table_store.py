@@ -0,0 +1,73 @@
+import json
+import sqlite3
+
+from financial_report_knowledge_factory.extract import FinTableProcessor
+from financial_report_knowledge_factory.row_file import write_row_file
+from financial_report_knowledge_factory.table_store import SQLiteTableStore
+
+
+def _text(inside):
+    return {"page": 1, "allrow": 0, "type": "text", "inside": inside}
+
+
+def _table(*cells):
+    return {
+        "page": 1,
+        "allrow": 0,
+        "type": "excel",
+        "inside": str(list(cells)),
+        "cells": list(cells),
+    }
+
+
+def _save_report(tmp_path, db_path, report, revenue):
+    rows_path = str(tmp_path / f"{report}.rows")
+    write_row_file(
+        rows_path,
+        [
+            _text("§1重要提示"),
+            _text("1.1基本情况"),
+            _table("项目", "2019年"),
+            _table("营业收入", revenue),
+            _text("§2公司简介"),
+        ],
+    )
+    processor = FinTableProcessor(rows_path)
+    processor.read_file()
+    processor.process_text_data()
+    processor.process_excel_data()
+    processor.process_tables()
+    with SQLiteTableStore(db_path) as store:
+        processor.save_tables(store, report)
+
+
+def _records(db_path):
+    conn = sqlite3.connect(db_path)
+    try:
+        return [
+            (report, section, table_name, row_idx, json.loads(cells))
+            for report, section, table_name, row_idx, cells in conn.execute(
+                "SELECT * FROM fin_report_table ORDER BY report, row_idx"
+            )
+        ]
+    finally:
+        conn.close()
+
+
+def test_save_tables_round_trip(tmp_path):
+    db_path = str(tmp_path / "output" / "fin_report_tables.db")
+    _save_report(tmp_path, db_path, "a", "100")
+    section = "1重要提示/1.1基本情况"
+    assert _records(db_path) == [
+        ("a", section, "基本情况", 0, ["项目", "2019年"]),
+        ("a", section, "基本情况", 1, ["营业收入", "100"]),
+    ]
+    _save_report(tmp_path, db_path, "b", "300")
+    # the report saved again replaces its rows only
+    _save_report(tmp_path, db_path, "a", "200")
+    assert _records(db_path) == [
+        ("a", section, "基本情况", 0, ["项目", "2019年"]),
+        ("a", section, "基本情况", 1, ["营业收入", "200"]),
+        ("b", section, "基本情况", 0, ["项目", "2019年"]),
+        ("b", section, "基本情况", 1, ["营业收入", "300"]),
+    ]
@@ -0,0 +1,65 @@
+import os
+import time
+
+import pytest
+from financial_report_knowledge_factory.workspace import (
+    Workspace,
+    remove_expired_workspaces,
+)
+
+
+def _age(path, seconds):
+    mtime = time.time() - seconds
+    os.utime(path, (mtime, mtime))
+
+
+def test_removed_on_exit_after_an_error(tmp_path):
+    with pytest.raises(RuntimeError):
+        with Workspace(str(tmp_path), "space") as workspace:
+            os.makedirs(workspace.rows_path)
+            with open(os.path.join(workspace.rows_path, "a.rows"), "w") as f:
+                f.write("rows")
+            raise RuntimeError("parse failed")
+
+    assert not os.path.exists(workspace.path)
+    assert os.listdir(workspace.workspaces_path) == []
+
+
+def test_concurrent_workspaces_are_separated(tmp_path):
+    with Workspace(str(tmp_path), "space") as a, Workspace(str(tmp_path), "space") as b:
+        assert a.path != b.path
+        assert os.path.dirname(a.path) == os.path.join(
+            str(tmp_path), "space", "workspaces"
+        )
+
+
+def test_retention_removes_only_the_expired_workspaces(tmp_path):
+    old = Workspace(str(tmp_path), "space", retention=60)
+    _age(old.path, 120)
+    recent = Workspace(str(tmp_path), "space", retention=60)
+    _age(recent.path, 30)
+    other_space = Workspace(str(tmp_path), "other", retention=60)
+    _age(other_space.path, 120)
+
+    with Workspace(str(tmp_path), "space", retention=60) as workspace:
+        pass
+
+    assert not os.path.exists(old.path)
+    assert os.path.isdir(recent.path)
+    assert os.path.isdir(workspace.path)
+    assert os.path.isdir(other_space.path)
+
+
+def test_negative_retention_keeps_the_workspace(tmp_path):
+    with Workspace(str(tmp_path), "space", retention=-1) as workspace:
+        pass
+    assert os.path.isdir(workspace.path)
+
+    # it is still removed by the retention of the other requests once expired
+    _age(workspace.path, 3600)
+    remove_expired_workspaces(workspace.workspaces_path, 60)
+    assert not os.path.exists(workspace.path)
+
+
+def test_remove_expired_workspaces_without_workspaces(tmp_path):
+    remove_expired_workspaces(str(tmp_path / "missing"), 60)
@@ -1,7 +1,7 @@
 """The ChatDatabaseOperator."""
 
 import json
-from typing import Dict, Tuple
+from typing import Dict, Optional, Tuple
 
 from dbgpt.core import (
     ChatPromptTemplate,
@@ -80,107 +80,120 @@ _DEFAULT_TEMPLATE_ZH = """你是一个数据库专家.
 
 """
 
+# The report values are REAL in 元, the formulas are plain arithmetic.
 fin_indicator_map = {
     "营业成本率": {
-        "公式": "营业成本率=CAST(REPLACE(营业成本, ',', '')  AS FLOAT)/CAST(REPLACE(营业收入, ',', '')  AS FLOAT)",
+        "公式": "营业成本率=营业成本/营业收入",
         "数值": ["营业成本", "营业收入"],
     },
     "投资收益占营业收入比率": {
-        "公式": "投资收益占营业收入比率=CAST(REPLACE(投资收益, ',', '')  AS FLOAT)/CAST(REPLACE(营业收入, ',', '')  AS FLOAT)",
+        "公式": "投资收益占营业收入比率=投资收益/营业收入",
         "数值": ["投资收益", "营业收入"],
     },
     "管理费用率": {
-        "公式": "管理费用率=CAST(管理费用REPLACE(营业收入, ',', '')  AS FLOAT)/CAST(REPLACE(营业收入, ',', '')  AS FLOAT)",
+        "公式": "管理费用率=管理费用/营业收入",
         "数值": ["管理费用", "营业收入"],
     },
     "财务费用率": {
-        "公式": "财务费用率=CAST(REPLACE(财务费用, ',', '')  AS FLOAT)/CAST(REPLACE(营业收入, ',', '')  AS FLOAT)",
+        "公式": "财务费用率=财务费用/营业收入",
         "数值": ["财务费用", "营业收入"],
     },
     "三费比重": {
-        "公式": "三费比重=(CAST(销售费用+管理费用+财务费用))/REPLACE(营业收入, ',', '')  AS FLOAT",
+        "公式": "三费比重=(销售费用+管理费用+财务费用)/营业收入",
         "数值": ["销售费用", "管理费用", "财务费用", "营业收入"],
     },
     "企业研发经费占费用比例": {
-        "公式": "企业研发经费占费用比例=CAST(CAST(REPLACE(研发费用, ',', '')  AS FLOAT)/CAST((销售费用+财务费用+管理费用+研发费用))",
+        "公式": "企业研发经费占费用比例=研发费用/(销售费用+财务费用+管理费用+研发费用)",
         "数值": ["研发费用", "销售费用", "财务费用", "管理费用"],
     },
     "企业研发经费与利润比值": {
-        "公式": "企业研发经费与利润比值=CAST(CAST(REPLACE(研发费用, ',', '')  AS FLOAT)/CAST(REPLACE(净利润, ',', '')  AS FLOAT)",
+        "公式": "企业研发经费与利润比值=研发费用/净利润",
         "数值": ["研发费用", "净利润"],
     },
     "企业研发经费与营业收入比值": {
-        "公式": "企业研发经费与营业收入比值=CAST(CAST(REPLACE(研发费用, ',', '')  AS FLOAT)/CAST(REPLACE(营业收入, ',', '')  AS FLOAT)",
+        "公式": "企业研发经费与营业收入比值=研发费用/营业收入",
         "数值": ["研发费用", "营业收入"],
     },
     "销售人员占比": {
-        "公式": "销售人员占比=CAST(销售人员)/CAST(职工总数)",
+        "公式": "销售人员占比=销售人员/职工总数",
         "数值": ["销售人员", "职工总数"],
     },
     "行政人员占比": {
-        "公式": "行政人员占比=CAST(行政人员)/CAST(职工总数)",
+        "公式": "行政人员占比=行政人员/职工总数",
         "数值": ["行政人员", "职工总数"],
     },
     "财务人员占比": {
-        "公式": "财务人员占比=CAST(财务人员)/CAST(职工总数)",
+        "公式": "财务人员占比=财务人员/职工总数",
         "数值": ["财务人员", "职工总数"],
     },
     "生产人员占比": {
-        "公式": "生产人员占比=CAST(生产人员)/CAST(职工总数)",
+        "公式": "生产人员占比=生产人员/职工总数",
         "数值": ["生产人员", "职工总数"],
     },
     "技术人员占比": {
-        "公式": "技术人员占比=CAST(技术人员)/CAST(职工总数)",
+        "公式": "技术人员占比=技术人员/职工总数",
         "数值": ["技术人员", "职工总数"],
     },
     "研发人员占职工人数比例": {
-        "公式": "研发人员占职工人数比例=研发人数/CAST(职工总数)",
+        "公式": "研发人员占职工人数比例=研发人数/职工总数",
         "数值": ["研发人数", "职工总数"],
     },
     "企业硕士及以上人员占职工人数比例": {
-        "公式": "企业硕士及以上人员占职工人数比例=(硕士人员 + 博士及以上人员)/CAST(职工总数)",
+        "公式": "企业硕士及以上人员占职工人数比例=(硕士人员+博士及以上人员)/职工总数",
         "数值": ["硕士人员", "博士及以上人员", "职工总数"],
     },
     "毛利率": {
-        "公式": "毛利率=(CAST(REPLACE(营业收入, ',', '')  AS FLOAT)-CAST(REPLACE(营业成本, ',', '')  AS FLOAT))/CAST(REPLACE(营业收入, ',', '')  AS FLOAT)",
+        "公式": "毛利率=(营业收入-营业成本)/营业收入",
         "数值": ["营业收入", "营业成本"],
     },
     "营业利润率": {
-        "公式": "营业利润率=CAST(REPLACE(营业利润, ',', '')  AS FLOAT)/CAST(REPLACE(营业收入, ',', '')  AS FLOAT)",
+        "公式": "营业利润率=营业利润/营业收入",
         "数值": ["营业利润", "营业收入"],
     },
     "流动比率": {
-        "公式": "流动比率=CAST(REPLACE(流动资产合计, ',', '')  AS FLOAT)/CAST(REPLACE(流动负债合计, ',', '')  AS FLOAT)",
+        "公式": "流动比率=流动资产合计/流动负债合计",
         "数值": ["流动资产合计", "流动负债合计"],
     },
     "速动比率": {
-        "公式": "速动比率=(CAST(REPLACE(流动资产合计, ',', '')  AS FLOAT)-CAST(REPLACE(存货, ',', '')  AS FLOAT))/CAST(REPLACE(流动负债合计, ',', '')  AS FLOAT)",
+        "公式": "速动比率=(流动资产合计-存货)/流动负债合计",
         "数值": ["流动资产合计", "存货", "流动负债合计"],
     },
     "资产负债比率": {
-        "公式": "资产负债比率=CAST(REPLACE(负债合计, ',', '')  AS FLOAT)/CAST(REPLACE(资产总计, ',', '')  AS FLOAT)",
+        "公式": "资产负债比率=负债合计/资产总计",
         "数值": ["负债合计", "资产总计"],
     },
     "现金比率": {
-        "公式": "现金比率=CAST(货币资金REPLACE(货币资金, ',', '')  AS FLOAT)/CAST(REPLACE(流动负债合计, ',', '')  AS FLOAT)",
+        "公式": "现金比率=货币资金/流动负债合计",
         "数值": ["货币资金", "流动负债合计"],
     },
     "非流动负债合计比率": {
-        "公式": "非流动负债合计比率=CAST(REPLACE(非流动负债合计, ',', '')  AS FLOAT)/CAST(REPLACE(负债合计, ',', '')  AS FLOAT)",
+        "公式": "非流动负债合计比率=非流动负债合计/负债合计",
         "数值": ["非流动负债合计", "负债合计"],
     },
     "流动负债合计比率": {
-        "公式": "流动负债合计比率=CAST(REPLACE(流动负债合计, ',', '')  AS FLOAT)/CAST(REPLACE(负债合计, ',', '')  AS FLOAT)",
+        "公式": "流动负债合计比率=流动负债合计/负债合计",
         "数值": ["流动负债合计", "负债合计"],
     },
     "净利润率": {
-        "公式": "净利润率=CAST(REPLACE(净利润, ',', '')  AS FLOAT)/CAST(REPLACE(营业收入, ',', '')  AS FLOAT)",
+        "公式": "净利润率=净利润/营业收入",
         "数值": ["净利润", "营业收入"],
     },
 }
 
 _SHARE_DATA_DATABASE_NAME_KEY = "__database_name__"
 
+# The indicators are computed at ingest by the knowledge factory, one row per
+# company and year, with a column per indicator of fin_indicator_map.
+_INDICATOR_TABLE = "fin_indicator"
+_INDICATOR_TABLE_RULE_EN = (
+    "{name} is precomputed in the {name} column of the {table} table, query it "
+    "by 公司名称 and 年份 instead of computing the formula."
+)
+_INDICATOR_TABLE_RULE_ZH = (
+    "{name} 已在入库时预先计算, 存储在 {table} 表的 {name} 列中, "
+    "请按 公司名称 和 年份 直接查询该列的值即可, 无需再按上述的公式计算."
+)
+
 
 class ChatIndicatorOperator(FinConfigMixin, MapOperator[ModelRequest, ModelRequest]):
     """The ChatDataOperator."""
@@ -257,13 +270,14 @@ class ChatIndicatorOperator(FinConfigMixin, MapOperator[ModelRequest, ModelReque
             embedding_model=embedding_model,
         )
 
+        user_language = self.system_app.config.get_current_lang(default="en")
         input_values = {
             "db_name": db_name,
             "user_input": user_input,
             "top_k": 5,
             "dialect": db_conn.dialect,
             "table_info": table_infos,
-            "indicator": indicator.get("公式"),
+            "indicator": _indicator_rule(indicator, user_language),
             "display_type": default_chart_type_prompt(),
         }
 
@@ -273,7 +287,6 @@ class ChatIndicatorOperator(FinConfigMixin, MapOperator[ModelRequest, ModelReque
             "display_type": "Data display method",
         }
 
-        user_language = self.system_app.config.get_current_lang(default="en")
         prompt_template = (
             _DEFAULT_TEMPLATE_EN if user_language == "en" else _DEFAULT_TEMPLATE_ZH
         )
@@ -319,3 +332,15 @@ class ChatIndicatorOperator(FinConfigMixin, MapOperator[ModelRequest, ModelReque
             hit_indicator = best_match or intent.intent
             indicator = fin_indicator_map.get(hit_indicator)
         return indicator, user_input
+
+
+def _indicator_rule(indicator: Dict, user_language: str) -> Optional[str]:
+    """Return the indicator rule of the prompt, its formula and its column."""
+    formula = indicator.get("公式")
+    if not formula:
+        return formula
+    rule = (
+        _INDICATOR_TABLE_RULE_EN if user_language == "en" else _INDICATOR_TABLE_RULE_ZH
+    )
+    name = formula.split("=", 1)[0]
+    return f"{formula}\n    {rule.format(name=name, table=_INDICATOR_TABLE)}"
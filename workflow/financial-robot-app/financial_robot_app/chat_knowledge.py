@@ -1,7 +1,7 @@
 """ChatKnowledgeOperator."""
 
 import os
-from typing import Optional
+from typing import List, Optional
 
 from dbgpt._private.config import Config
 from dbgpt.core import (
@@ -17,6 +17,7 @@ from dbgpt.rag.retriever.rerank import RerankEmbeddingsRanker
 from dbgpt.storage.vector_store.filters import MetadataFilter, MetadataFilters
 
 from .common import FinConfigMixin
+from .full_text import MIN_KEYWORD_LENGTH, full_text_db_path, search_full_text
 from .intent import FinReportIntent
 
 _DEFAULT_TEMPLATE_ZH = """你是专业的金融财报分析专家，基于以下给出的已知信息, 准守规范约束，专业、简要回答用户的金融问题.
@@ -59,17 +60,28 @@ class ChatKnowledgeOperator(FinConfigMixin, MapOperator[ModelRequest, ModelReque
         self,
         task_name="chat_knowledge",
         intent: Optional[FinReportIntent] = None,
+        full_text_search: Optional[bool] = None,
         **kwargs,
     ):
-        """ChatKnowledgeOperator."""
+        """ChatKnowledgeOperator.
+
+        Args:
+            intent: (Optional[FinReportIntent]) The intent of the user input.
+            full_text_search: (Optional[bool]) Look up the intent keyword in the
+                full text index of the reports first, the vector search only runs
+                if the keyword is not found.
+        """
         self._intent = intent
         self._cfg = Config()
+        if full_text_search is None:
+            full_text_search = (
+                os.getenv("FIN_REPORT_FULL_TEXT_SEARCH", "true").lower() == "true"
+            )
+        self._full_text_search = full_text_search
         MapOperator.__init__(self, task_name=task_name, **kwargs)
 
     async def map(self, input_value: ModelRequest) -> ModelRequest:
         """Map function for ChatKnowledgeOperator."""
-        from dbgpt.rag.retriever.embedding import EmbeddingRetriever
-
         (
             db_name,
             space_name,
@@ -99,6 +111,48 @@ class ChatKnowledgeOperator(FinConfigMixin, MapOperator[ModelRequest, ModelReque
         if not space_name:
             raise ValueError("Knowledge name is required.")
 
+        contents = []
+        keyword = intent.intent.strip() if intent and intent.intent else ""
+        if self._full_text_search and len(keyword) >= MIN_KEYWORD_LENGTH:
+            # a keyword lookup in the full text index is cheaper than embedding
+            # the query and searching the vector store
+            contents = await self.blocking_func_to_async(
+                search_full_text,
+                full_text_db_path(tmp_dir_path, space_name, db_name),
+                keyword,
+                hit_document_title,
+                self._cfg.KNOWLEDGE_SEARCH_TOP_SIZE,
+            )
+        if not contents:
+            contents = await self._vector_search(
+                space_name, tmp_dir_path, embedding_model, user_inputs, metadata_filter
+            )
+        context = "\n".join(set(contents))
+
+        input_values = {"context": context, "question": user_input}
+
+        user_language = self.system_app.config.get_current_lang(default="en")
+        prompt_template = (
+            _DEFAULT_TEMPLATE_EN if user_language == "en" else _DEFAULT_TEMPLATE_ZH
+        )
+        prompt = ChatPromptTemplate(
+            messages=[
+                HumanPromptTemplate.from_template(prompt_template),
+                HumanPromptTemplate.from_template("{question}"),
+            ]
+        )
+        messages = prompt.format_messages(**input_values)
+        model_messages = ModelMessage.from_base_messages(messages)
+        request = input_value.copy()
+        request.messages = model_messages
+        return request
+
+    async def _vector_search(
+        self, space_name, tmp_dir_path, embedding_model, user_inputs, metadata_filter
+    ) -> List[str]:
+        """Search the user inputs in the vector store of the space."""
+        from dbgpt.rag.retriever.embedding import EmbeddingRetriever
+
         index_store = await self.get_vector_store(
             space_name, tmp_dir_path, embedding_model
         )
@@ -140,26 +194,7 @@ class ChatKnowledgeOperator(FinConfigMixin, MapOperator[ModelRequest, ModelReque
                         0.3,
                     )
                 )
-        contents = [doc.content for doc in chunks]
-        context = "\n".join(set(contents))
-
-        input_values = {"context": context, "question": user_input}
-
-        user_language = self.system_app.config.get_current_lang(default="en")
-        prompt_template = (
-            _DEFAULT_TEMPLATE_EN if user_language == "en" else _DEFAULT_TEMPLATE_ZH
-        )
-        prompt = ChatPromptTemplate(
-            messages=[
-                HumanPromptTemplate.from_template(prompt_template),
-                HumanPromptTemplate.from_template("{question}"),
-            ]
-        )
-        messages = prompt.format_messages(**input_values)
-        model_messages = ModelMessage.from_base_messages(messages)
-        request = input_value.copy()
-        request.messages = model_messages
-        return request
+        return [doc.content for doc in chunks]
 
     def get_fuzzy_match(self, user_input, intent, space, db_conn: RDBMSConnector):
         """fuzzy match for user input and get label filter"""
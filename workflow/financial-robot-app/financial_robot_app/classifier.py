@@ -1,15 +1,25 @@
 """The Question Classifier Operator."""
 
 import os
-from concurrent.futures import Executor, ThreadPoolExecutor
+from concurrent.futures import Executor
 from enum import Enum
 from typing import Dict, List, Optional
 
 from dbgpt.core import ModelRequest
-from dbgpt.core.awel import BranchFunc, BranchOperator, BranchTaskType, MapOperator
+from dbgpt.core.awel import (
+    BranchFunc,
+    BranchOperator,
+    BranchTaskType,
+    DAGVar,
+    MapOperator,
+)
 from dbgpt.core.awel.flow import IOField, OperatorCategory, Parameter, ViewMetadata
 from dbgpt.util.executor_utils import blocking_func_to_async
 from dbgpt.util.i18n_utils import _
+from financial_report_knowledge_factory.executors import (
+    EXECUTOR_INFERENCE,
+    get_executor,
+)
 from transformers import AutoModel, AutoTokenizer
 
 from .common import FinConfigMixin
@@ -79,7 +89,11 @@ class QuestionClassifierOperator(
         executor: Optional[Executor] = None,
         **kwargs,
     ):
-        """Create a new Question Classifier Operator."""
+        """Create a new Question Classifier Operator.
+
+        The models are loaded and run in the ``executor``, default the shared
+        ``inference`` executor of the knowledge factory.
+        """
         if not adapter_model_path:
             current_dir = os.path.dirname(os.path.abspath(__file__))
             adapter_model_path = os.path.join(
@@ -97,8 +111,12 @@ class QuestionClassifierOperator(
         self._adapter_model_path = adapter_model_path
         self._device = device
         self._batch_size = 4
-        self._executor = executor or ThreadPoolExecutor()
         MapOperator.__init__(self, **kwargs)
+        # The operator metaclass passes the default executor of the DAGs when none
+        # is given.
+        if executor is None or executor is DAGVar.get_executor():
+            executor = get_executor(EXECUTOR_INFERENCE)
+        self._executor = executor
 
     async def map(self, request: ModelRequest) -> ModelRequest:
         """Map the user question to a financial."""
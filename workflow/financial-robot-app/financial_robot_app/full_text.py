@@ -0,0 +1,68 @@
+"""Keyword search in the full text index of the financial reports.
+
+The index is the ``fin_report_full_text`` FTS5 table written by the financial
+report knowledge factory, one row per report page.
+"""
+
+import logging
+import os
+import sqlite3
+from typing import List, Optional
+
+logger = logging.getLogger(__name__)
+
+# The table and the database path of the index written by the knowledge factory,
+# keep them in line with its full_text module.
+FULL_TEXT_TABLE = "fin_report_full_text"
+# The trigram index only matches the keywords of 3 characters or more.
+MIN_KEYWORD_LENGTH = 3
+_SNIPPET_RADIUS = 200
+
+
+def full_text_db_path(tmp_dir_path: str, space: str, db_name: str) -> str:
+    """Return the full text database of a space, next to its report database."""
+    return os.path.join(tmp_dir_path or "./tmp", space, f"{db_name}_full_text.db")
+
+
+def search_full_text(
+    path: str, keyword: str, title: Optional[str] = None, top_k: int = 5
+) -> List[str]:
+    """Search a keyword in the report pages, best matches first.
+
+    Args:
+        path(str): the full text database
+        keyword(str): the keyword, at least 3 characters
+        title(str, optional): only search the report of this title
+        top_k(int): the max number of pages
+
+    Returns:
+        List[str]: the text around the keyword in each matched page, empty if the
+            keyword is too short or the index does not exist
+    """
+    keyword = keyword.strip()
+    if len(keyword) < MIN_KEYWORD_LENGTH or not os.path.exists(path):
+        return []
+    sql = f"SELECT 标题, 页码, 全文 FROM {FULL_TEXT_TABLE} WHERE 全文 MATCH ?"
+    # Search the keyword as a phrase, it may contain the fts5 query syntax.
+    params: list = ['"{}"'.format(keyword.replace('"', '""'))]
+    if title:
+        sql += " AND 标题 = ?"
+        params.append(title)
+    sql += " ORDER BY rank LIMIT ?"
+    params.append(top_k)
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        rows = conn.execute(sql, params).fetchall()
+    except sqlite3.Error as e:
+        logger.warning(f"full text search {keyword} in {path} failed: {e}")
+        return []
+    finally:
+        conn.close()
+    return [_snippet(title, page, text, keyword) for title, page, text in rows]
+
+
+def _snippet(title: str, page: int, text: str, keyword: str) -> str:
+    position = max(text.find(keyword), 0)
+    start = max(position - _SNIPPET_RADIUS, 0)
+    end = position + len(keyword) + _SNIPPET_RADIUS
+    return f"{title} 第{page}页: {text[start:end]}"